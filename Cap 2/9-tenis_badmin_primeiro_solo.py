@@ -1,5 +1,11 @@
+import os
+import sys
 import numpy as np
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.events import event, rk4_events
+
 # Parâmetros
 m = 0.058  # Massa (kg)
 g = 9.81  # Gravidade (m/s^2)
@@ -11,17 +17,19 @@ vT_badminton = 6.80  # Velocidade terminal do volante (m/s)
 k_tenis = m * g / vT_tenis
 k_badminton = m * g / vT_badminton
 
-# Método de Euler
-def queda_tempo(k, dt=0.001):  # Reduzindo dt para maior precisão
-    t = 0
-    y = h
-    v = 0
-    while y > 0:
+# Integração (RK4) até ao evento "y = 0": o instante de chegada ao solo é localizado dentro
+# do passo, por isso não é preciso reduzir dt para ter precisão
+def queda_tempo(k, dt=0.01, t_max=100.0):
+    def derivadas(t, estado):
+        y, v = estado  # v positivo para baixo
         a = g - (k/m) * v  # Aceleração
-        v += a * dt  # Atualiza velocidade
-        y -= v * dt  # Atualiza posição
-        t += dt
-    return t
+        return np.array([-v, a])
+
+    chega_ao_solo = event(lambda t, estado: estado[0], terminal=True, direction=-1)
+    _, _, t_eventos, _ = rk4_events(derivadas, [h, 0.0], 0.0, t_max, dt, [chega_ao_solo])
+    if len(t_eventos[0]) == 0:
+        raise RuntimeError(f"O objeto não chegou ao solo em {t_max} s")
+    return t_eventos[0][0]
 
 # Cálculo do tempo de queda
 t_tenis = queda_tempo(k_tenis)
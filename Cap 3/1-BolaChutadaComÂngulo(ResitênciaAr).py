@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.events import event, rk4_events
+
 v0_kmh = 100                # Velocidade inicial (km/h)
 v0 = v0_kmh / 3.6           # Conversão para m/s
 theta_deg = 10              # Ângulo de lançamento (graus)
@@ -17,55 +23,35 @@ v0y = v0 * np.sin(theta)
 # --- Parâmetros da simulação ---
 dt = 0.01
 t_max = 20
-N = int(t_max / dt)
-t = np.linspace(0, t_max, N)
 
-# Arrays para sem resistência
-x_no_air = np.zeros(N)
-y_no_air = np.zeros(N)
-vx_no_air = np.full(N, v0x)
-vy_no_air = np.zeros(N)
-vy_no_air[0] = v0y
+# Eventos: altura máxima (vy passa de + para -) e chegada ao solo (y passa de + para -, termina a
+# integração). Os dois instantes são localizados dentro do passo, em vez de parar no primeiro y < 0
+altura_maxima = event(lambda t, estado: estado[3], direction=-1)
+chega_ao_solo = event(lambda t, estado: estado[1], terminal=True, direction=-1)
 
-# Arrays para com resistência
-x_air = np.zeros(N)
-y_air = np.zeros(N)
-vx_air = np.zeros(N)
-vy_air = np.zeros(N)
-vx_air[0] = v0x
-vy_air[0] = v0y
+def derivadas_no_air(t, estado):
+    x, y, vx, vy = estado
+    return np.array([vx, vy, 0.0, -g])
 
-# --- Simulação sem resistência do ar ---
-for i in range(N - 1):
-    vy_no_air[i+1] = vy_no_air[i] - g * dt
-    x_no_air[i+1] = x_no_air[i] + vx_no_air[i] * dt
-    y_no_air[i+1] = y_no_air[i] + vy_no_air[i] * dt
-    if y_no_air[i+1] < 0:
-        break
+def derivadas_air(t, estado):
+    x, y, vx, vy = estado
+    v = np.sqrt(vx**2 + vy**2)
+    return np.array([vx, vy, -D * v * vx, -g - D * v * vy])
 
-# Resultados sem resistência
-t_no_air = t[i]
-alcance_no_air = x_no_air[i]
-altura_max_no_air = np.max(y_no_air)
-t_altura_max_no_air = t[np.argmax(y_no_air)]
+# Integração (RK4) até ao solo; devolve a trajetória e os eventos
+def voo(derivadas):
+    _, estado, t_eventos, estado_eventos = rk4_events(derivadas, [0.0, 0.0, v0x, v0y], 0.0, t_max, dt,
+                                                      [altura_maxima, chega_ao_solo])
+    if len(t_eventos[1]) == 0:
+        raise RuntimeError(f"A bola não chegou ao solo em {t_max} s")
+    return (estado[:, 0], estado[:, 1], t_eventos[0][0], estado_eventos[0][0, 1],
+            t_eventos[1][0], estado_eventos[1][0, 0])
 
-# --- Simulação com resistência do ar ---
-for i in range(N - 1):
-    v = np.sqrt(vx_air[i]**2 + vy_air[i]**2)
-    ax = -D * v * vx_air[i]
-    ay = -g - D * v * vy_air[i]
-    vx_air[i+1] = vx_air[i] + ax * dt
-    vy_air[i+1] = vy_air[i] + ay * dt
-    x_air[i+1] = x_air[i] + vx_air[i] * dt
-    y_air[i+1] = y_air[i] + vy_air[i] * dt
-    if y_air[i+1] < 0:
-        break
+# --- Simulação sem resistência do ar ---
+x_no_air, y_no_air, t_altura_max_no_air, altura_max_no_air, t_no_air, alcance_no_air = voo(derivadas_no_air)
 
-# Resultados com resistência
-t_air = t[i]
-alcance_air = x_air[i]
-altura_max_air = np.max(y_air)
-t_altura_max_air = t[np.argmax(y_air)]
+# --- Simulação com resistência do ar ---
+x_air, y_air, t_altura_max_air, altura_max_air, t_air, alcance_air = voo(derivadas_air)
 
 # --- Mostrar resultados ---
 print("=== SEM RESISTÊNCIA DO AR ===")
@@ -81,8 +67,8 @@ print(f"Alcance: {alcance_air:.2f} m")
 print(f"Tempo total de voo: {t_air:.2f} s")
 
 # --- Gráfico comparativo ---
-plt.plot(x_no_air[:i+1], y_no_air[:i+1], label='Sem resistência', color='orange')
-plt.plot(x_air[:i+1], y_air[:i+1], label='Com resistência', color='blue')
+plt.plot(x_no_air, y_no_air, label='Sem resistência', color='orange')
+plt.plot(x_air, y_air, label='Com resistência', color='blue')
 plt.title("Trajetória da bola (comparação)")
 plt.xlabel("Distância horizontal (m)")
 plt.ylabel("Altura (m)")
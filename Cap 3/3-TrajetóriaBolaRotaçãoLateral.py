@@ -1,6 +1,12 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.events import event, rk4_events
+
 r = 0.11
 m = 0.45
 g = 9.8
@@ -14,15 +20,11 @@ v = np.array([25, 5, -50], dtype=float)  # m/s
 x = np.array([0, 0, 23.8], dtype=float)  # m
 omega = np.array([0, 400, 0], dtype=float)  # rad/s
 
-t = 0
 max_t = 5
 
-# Guardar trajetória e tempo
-traj = []
-tempos = []
-
-# Loop principal - Método de Euler
-while t < max_t and x[1] >= 0:
+# Derivadas do estado (x, y, z, vx, vy, vz)
+def derivadas(t, estado):
+    x, v = estado[:3], estado[3:]
     v_mod = np.linalg.norm(v)
     
     # Forças
@@ -31,25 +33,23 @@ while t < max_t and x[1] >= 0:
     Fg = np.array([0, -m * g, 0])
     
     F_total = Fg + F_ar + F_magnus
-    
-    # Movimento
-    a = F_total / m
-    v += a * dt
-    x += v * dt
+    return np.concatenate((v, F_total / m))
 
-    traj.append(x.copy())
-    tempos.append(t)
-    t += dt
+# Eventos: passagem pela linha de golo (x passa de + para -) e chegada ao solo (termina a
+# integração). A posição na linha de golo é localizada dentro do passo
+linha_de_golo = event(lambda t, estado: estado[0], direction=-1)
+chega_ao_solo = event(lambda t, estado: estado[1], terminal=True, direction=-1)
 
-# Transformar em arrays
-traj = np.array(traj)
-tempos = np.array(tempos)
+# Integração (RK4) com deteção de eventos
+tempos, estados, t_eventos, estados_eventos = rk4_events(derivadas, np.concatenate((x, v)), 0.0, max_t, dt,
+                                                         [linha_de_golo, chega_ao_solo])
+traj = estados[:, :3]
 
-# Verificar se foi golo em algum ponto da trajetória
+# Foi golo se a bola passou a linha de golo dentro da baliza
 golo = False
-for pos in traj:
-    x, y, z = pos
-    if x < 0 and 0 < z < 7.3 and 0 < y < 2.4:
+for pos in estados_eventos[0]:
+    x, y, z = pos[:3]
+    if 0 < z < 7.3 and 0 < y < 2.4:
         golo = True
         break
 
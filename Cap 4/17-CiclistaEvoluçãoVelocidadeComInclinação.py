@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.kernels import cyclist_euler_cromer
+
 # --- Dados do problema ---
 P_cv = 0.4                    # Potência em cavalos-vapor
 P = P_cv * 735.5              # Potência em Watts
@@ -16,21 +22,8 @@ dt = 0.001
 t_max = 1000
 n = int(t_max / dt)
 
-t = np.zeros(n)
-v = np.zeros(n)
-x = np.zeros(n)
-
-v[0] = v0
-
-for i in range(n - 1):
-    if v[i] <= 0:
-        a = 0
-    else:
-        # Força propulsora - resistência do ar - componente do peso na subida
-        a = (P / (m * v[i])) - (k / m) * v[i]**2 - g * np.sin(theta_rad)
-    v[i + 1] = v[i] + a * dt
-    x[i + 1] = x[i] + v[i + 1] * dt
-    t[i + 1] = t[i] + dt
+# a = P/(m v) - (k/m) v² - g sin(theta): força propulsora - resistência do ar - componente do peso
+t, v, x = cyclist_euler_cromer(v0, dt, n - 1, P, m, k, g, theta_rad)
 
 # --- (a) Tempo para percorrer 2 km ---
 idx_2km = np.argmax(x >= 2000)
@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do sistema ---
 m = 1.0  # kg 
 k = 1.0  # N/m 
@@ -29,7 +35,8 @@ x_values.append(x)
 vx_values.append(vx)
 
 # --- Loop de simulação (Método de Euler-Cromer) ---
-while t <= t_total:
+grid = TimeGrid(t_total, dt)
+for n in range(grid.n_steps):
     # Calcular a aceleração no instante atual
     ax = -k / m * x
 
@@ -40,7 +47,7 @@ while t <= t_total:
     x = x + vx * dt
 
     # Atualizar o tempo
-    t = t + dt
+    t = grid.time(n + 1)
 
     # Armazenar os resultados
     t_values.append(t)
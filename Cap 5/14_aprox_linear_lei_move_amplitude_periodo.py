@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do sistema ---
 g = 9.8  # m/s^2
 L = 0.5  # m
@@ -28,7 +34,8 @@ theta_values.append(theta)
 omega_values.append(omega)
 
 # --- Loop de simulação (Método de Euler-Cromer) ---
-while t <= t_total:
+grid = TimeGrid(t_total, dt)
+for n in range(grid.n_steps):
     # Calcular a aceleração angular no instante atual
     alpha = -g / L * theta
 
@@ -39,7 +46,7 @@ while t <= t_total:
     theta = theta + omega * dt
 
     # Atualizar o tempo
-    t = t + dt
+    t = grid.time(n + 1)
 
     # Armazenar os resultados
     t_values.append(t)
@@ -1,6 +1,13 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.extrema import find_extrema
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do sistema ---
 m = 1.0   # kg
 k = 1.0   # N/m
@@ -30,11 +37,12 @@ def simulate_oscillator(x0, vx0, dt, t_total, m_val, k_val, alpha_val):
     vx_values.append(vx)
     energy_values.append(0.5 * m_val * vx**2 + potential_energy(x, k_val, alpha_val))
 
-    while t <= t_total:
+    grid = TimeGrid(t_total, dt)
+    for n in range(grid.n_steps):
         ax = acceleration(x, m_val, k_val, alpha_val)
         vx = vx + ax * dt
         x = x + vx * dt
-        t = t + dt
+        t = grid.time(n + 1)
 
         t_values.append(t)
         x_values.append(x)
@@ -99,18 +107,9 @@ x_max_b = np.max(x_b)
 print(f"Limites do movimento para x0={x0_b} m: [{x_min_b:.3f} m, {x_max_b:.3f} m]")
 
 # Cálculo do período (aproximado, por picos)
-# Encontrar picos/vales para calcular o período
-peak_indices = []
-for i in range(1, len(x_b) - 1):
-    if (x_b[i] > x_b[i-1] and x_b[i] > x_b[i+1]) or (x_b[i] < x_b[i-1] and x_b[i] < x_b[i+1]):
-        peak_indices.append(i)
-
-# Filtrar para ter apenas os picos de um lado (ex: os máximos)
-# Ou mais robusto: contar as passagens por zero com velocidade num determinado sentido
-# Para este tipo de gráfico, é fácil ver os picos
-# Vamos pegar no tempo entre os primeiros picos de amplitude
-if len(peak_indices) > 2:
-    T_b_values = np.diff(t_b[peak_indices])
+# Encontrar picos/vales para calcular o período; o período é o intervalo entre dois extremos do mesmo tipo
+peak_times, _, T_b_values = find_extrema(t_b, x_b, kind="both")
+if len(peak_times) > 2:
     T_b_avg = np.mean(T_b_values)
     f_b = 1 / T_b_avg
     print(f"Período do movimento para x0={x0_b} m: {T_b_avg:.3f} s")
@@ -145,13 +144,8 @@ x_max_c = np.max(x_c)
 print(f"Limites do movimento para x0={x0_c} m: [{x_min_c:.3f} m, {x_max_c:.3f} m]")
 
 # Cálculo do período (aproximado, por picos)
-peak_indices_c = []
-for i in range(1, len(x_c) - 1):
-    if (x_c[i] > x_c[i-1] and x_c[i] > x_c[i+1]) or (x_c[i] < x_c[i-1] and x_c[i] < x_c[i+1]):
-        peak_indices_c.append(i)
-
-if len(peak_indices_c) > 2:
-    T_c_values = np.diff(t_c[peak_indices_c])
+peak_times_c, _, T_c_values = find_extrema(t_c, x_c, kind="both")
+if len(peak_times_c) > 2:
     T_c_avg = np.mean(T_c_values)
     f_c = 1 / T_c_avg
     print(f"Período do movimento para x0={x0_c} m: {T_c_avg:.3f} s")
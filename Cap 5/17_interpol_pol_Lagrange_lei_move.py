@@ -1,8 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.interpolate import lagrange
 from scipy.stats import linregress
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.extrema import find_extrema
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do sistema ---
 m = 0.25 # kg
 k = 1.0  # N/m
@@ -33,11 +39,12 @@ t_values.append(t)
 x_values.append(x)
 vx_values.append(vx)
 
-while t <= t_total:
+grid = TimeGrid(t_total, dt)
+for n in range(grid.n_steps):
     ax = acceleration_damped(x, vx)
     vx = vx + ax * dt
     x = x + vx * dt
-    t = t + dt
+    t = grid.time(n + 1)
 
     t_values.append(t)
     x_values.append(x)
@@ -56,61 +63,10 @@ plt.show()
 
 # --- ALÍNEA b) ---
 print("\n--- Alínea b) ---")
-peak_times = []
-peak_amplitudes = []
-
-# Encontrar índices dos máximos e mínimos locais
-for i in range(1, len(x_values) - 1):
-    # Condição para máximo local
-    if x_values[i] > x_values[i-1] and x_values[i] > x_values[i+1]:
-        # Interpolação de Lagrange para o máximo
-        if i > 0 and i < len(x_values) - 1: # Garantir que temos 3 pontos
-            x_interp = np.array([t_values[i-1], t_values[i], t_values[i+1]])
-            y_interp = np.array([x_values[i-1], x_values[i], x_values[i+1]])
-            
-            # Polinómio de Lagrange (grau 2)
-            poly = lagrange(x_interp, y_interp)
-            
-            # Derivada do polinómio de grau 2 é 2ax + b. Onde a derivada é zero, temos o extremo.
-            # Se poly = c2*x^2 + c1*x + c0, então derivada = 2*c2*x + c1.
-            # x_vertex = -c1 / (2*c2)
-            coeffs = poly.coeffs
-            if len(coeffs) == 3 and coeffs[0] != 0: # Para um polinómio de grau 2
-                t_peak = -coeffs[1] / (2 * coeffs[0])
-                amplitude_peak = poly(t_peak)
-                peak_times.append(t_peak)
-                peak_amplitudes.append(amplitude_peak)
-            elif len(coeffs) == 2: # Caso a interpolação retorne grau 1 (muito raro num pico)
-                 t_peak = t_values[i] # Apenas usa o ponto original
-                 amplitude_peak = x_values[i]
-                 peak_times.append(t_peak)
-                 peak_amplitudes.append(amplitude_peak)
-
-
-    # Condição para mínimo local
-    elif x_values[i] < x_values[i-1] and x_values[i] < x_values[i+1]:
-        # Interpolação de Lagrange para o mínimo
-        if i > 0 and i < len(x_values) - 1:
-            x_interp = np.array([t_values[i-1], t_values[i], t_values[i+1]])
-            y_interp = np.array([x_values[i-1], x_values[i], x_values[i+1]])
-
-            poly = lagrange(x_interp, y_interp)
-
-            coeffs = poly.coeffs
-            if len(coeffs) == 3 and coeffs[0] != 0:
-                t_min = -coeffs[1] / (2 * coeffs[0])
-                amplitude_min = poly(t_min)
-                peak_times.append(t_min)
-                peak_amplitudes.append(amplitude_min)
-            elif len(coeffs) == 2:
-                t_min = t_values[i]
-                amplitude_min = x_values[i]
-                peak_times.append(t_min)
-                peak_amplitudes.append(amplitude_min)
-
-# Ordenar os picos e vales pelo tempo
-sorted_peaks_and_vals = sorted(zip(peak_times, peak_amplitudes), key=lambda item: item[0])
-peak_times_sorted, peak_amplitudes_sorted = zip(*sorted_peaks_and_vals)
+# Máximos e mínimos locais; cada extremo é o vértice do polinómio de Lagrange de grau 2
+# que passa pelo ponto do pico e pelos seus dois vizinhos (já ordenados no tempo)
+peak_times_sorted, peak_amplitudes_sorted, _ = find_extrema(t_values, x_values, kind="both")
+sorted_peaks_and_vals = list(zip(peak_times_sorted, peak_amplitudes_sorted))
 
 print("Tempos e Amplitudes dos Máximos/Mínimos Locais:")
 for t_p, amp_p in sorted_peaks_and_vals:
@@ -1,6 +1,15 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.adaptive import simulate_oscillator_adaptive
+from msf.linear import simulate_forced_damped_exact
+from msf.steady_state import SteadyStateDetector
+from msf.streaming import EnergyTracker, PeakTimes, SteadyStateAmplitude, consume, stream_dopri54
+
 # --- Parâmetros do sistema ---
 m = 1.0  # kg
 k = 1.0  # N/m
@@ -17,53 +26,61 @@ print(f"Frequência da força externa (wf): {wf:.3f} rad/s -> Em ressonância (w
 def acceleration_forced_damped(x, vx, t):
     return -k / m * x - b / m * vx + F0 / m * np.cos(wf * t)
 
-# --- Função de Simulação (Euler-Cromer) ---
-def simulate_oscillator_forced(x0, vx0, dt, t_total):
-    t_values = []
-    x_values = []
-    vx_values = []
-    energy_values = [] # Para alínea e)
-
-    t = 0.0
-    x = x0
-    vx = vx0
-
-    t_values.append(t)
-    x_values.append(x)
-    vx_values.append(vx)
-    # Calculando a energia mecânica inicial
-    energy_values.append(0.5 * m * vx**2 + 0.5 * k * x**2)
-
-    while t <= t_total:
-        ax = acceleration_forced_damped(x, vx, t)
-        vx = vx + ax * dt
-        x = x + vx * dt
-        t = t + dt
-
-        t_values.append(t)
-        x_values.append(x)
-        vx_values.append(vx)
-        # Calculando a energia mecânica
-        energy_values.append(0.5 * m * vx**2 + 0.5 * k * x**2)
-    
-    return t_values, x_values, vx_values, energy_values
+# --- Energia mecânica (vetorizada) ---
+def mechanical_energy(x, vx):
+    return 0.5 * m * vx**2 + 0.5 * k * x**2
+
+# --- Função de Simulação (propagador exato) ---
+# O oscilador é linear: a solução é propagada exatamente de dt_out em dt_out (msf.linear), sem erro de
+# discretização, em vez de um ciclo de Euler-Cromer com dt = 1e-4
+def simulate_oscillator_forced(x0, vx0, t_total, dt_out=0.01):
+    t, x, vx = simulate_forced_damped_exact(x0, vx0, dt_out, t_total, k, m, b, F0, wf)
+    return t, x, vx, mechanical_energy(x, vx)
+
+# --- Regime estacionário por blocos (msf.streaming) ---
+# A simulação longa das alíneas b), d) e e) é integrada bloco a bloco (Dormand-Prince, saída de dt_out em
+# dt_out) e cada consumidor guarda apenas um resumo, por isso a memória não cresce com t_total_estacionario.
+# O transiente decai com exp(-(b/2m)*t), com 2m/b = 2*1/0.05 = 40 s: as medições começam em t_estacionario,
+# e o detetor (que compara períodos sucessivos da força) confirma que o regime já é estacionário.
+t_total_estacionario = 600.0 # s
+t_estacionario = 400.0 # s
+dt_estacionario = 0.01 # s
+
+def analyse_steady_state(x0, vx0, rtol=1e-8, atol=1e-10):
+    detetor = SteadyStateDetector(wf)
+    amplitude = SteadyStateAmplitude(t_estacionario)
+    picos = PeakTimes(t_estacionario)
+    energia = EnergyTracker(mechanical_energy, keep_every=10)
+    blocos = stream_dopri54(acceleration_forced_damped, x0, vx0, dt_estacionario, t_total_estacionario,
+                            rtol=rtol, atol=atol)
+    consume(blocos, detetor, amplitude, picos, energia)
+    return detetor, amplitude, picos, energia
+
+# --- Verificação (Dormand-Prince adaptativo) ---
+# Integração numérica independente da mesma equação (msf.adaptive), com o passo escolhido para o erro
+# local ficar abaixo de atol + rtol*|y|; a saída densa é avaliada nos instantes t da lei do movimento
+def simulate_oscillator_adaptive_at(x0, vx0, t, rtol=1e-8, atol=1e-10):
+    solucao = simulate_oscillator_adaptive(x0, vx0, t[-1], acceleration_forced_damped, rtol=rtol, atol=atol)
+    x, _ = solucao(t)
+    return x
 
 # --- ALÍNEA a) ---
 print("--- Alínea a) ---")
 x0_a = 4.0 # m
 vx0_a = 0.0 # m/s
-dt_a_1 = 0.0001
-dt_a_2 = 0.00001 # Para testar a confiança
+rtol_a = 1e-8 # tolerância relativa do integrador adaptativo (verificação)
+atol_a = 1e-10 # tolerância absoluta (m, m/s)
 t_total_a = 300.0 # s (tempo suficiente para atingir o regime estacionário)
 
-# Simulação com dt_a_1
-t_a1, x_a1, vx_a1, Em_a1 = simulate_oscillator_forced(x0_a, vx0_a, dt_a_1, t_total_a)
-# Simulação com dt_a_2
-t_a2, x_a2, vx_a2, Em_a2 = simulate_oscillator_forced(x0_a, vx0_a, dt_a_2, t_total_a)
+# Lei do movimento exata, amostrada de 0.01 em 0.01 s
+t_a1, x_a1, vx_a1, Em_a1 = simulate_oscillator_forced(x0_a, vx0_a, t_total_a)
+# Confiança: integração numérica independente (passo adaptativo), comparada nos mesmos instantes
+x_a_num = simulate_oscillator_adaptive_at(x0_a, vx0_a, t_a1, rtol=rtol_a, atol=atol_a)
+diferenca_a = np.max(np.abs(x_a_num - x_a1))
 
 plt.figure(figsize=(10, 6))
-plt.plot(t_a1, x_a1, label=f'dt={dt_a_1}')
-plt.plot(t_a2, x_a2, label=f'dt={dt_a_2}', linestyle='--') # Plotar com linha tracejada para sobrepor
+plt.plot(t_a1, x_a1, label='Propagador exato')
+plt.plot(t_a1, x_a_num, label=f'Dormand-Prince (rtol={rtol_a})', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Harmónico Forçado (Alínea a)')
@@ -71,56 +88,45 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-# Verificar confiança
-# Comparar o valor final da posição para os dois dt
-print(f"Posição final (dt={dt_a_1}): {x_a1[-1]:.3f} m")
-print(f"Posição final (dt={dt_a_2}): {x_a2[-1]:.3f} m")
-print(f"Diferença nas posições finais: {abs(x_a1[-1] - x_a2[-1]):.3e} m")
-
-if abs(x_a1[-1] - x_a2[-1]) < 1e-2: # Pequena tolerância para considerar igual
-    print("Temos confiança no resultado. A lei do movimento obtida por dois passos temporais diferentes é a mesma (ou muito próxima).") [cite: 113]
+print(f"Diferença máxima entre a solução exata e o Dormand-Prince (rtol={rtol_a}, atol={atol_a}): {diferenca_a:.3e} m")
+if diferenca_a < 1e-2:
+    print("Temos confiança no resultado. A lei do movimento obtida pelos dois métodos é a mesma (ou muito próxima).")
 else:
-    print("Os resultados com diferentes passos de tempo não são suficientemente próximos, o que pode indicar falta de confiança ou necessidade de 'dt' ainda menor.")
+    print("Os resultados dos dois métodos não são suficientemente próximos.")
 
 
 # --- ALÍNEA b) ---
 print("\n--- Alínea b) ---")
-# Regime estacionário: ignorar a parte inicial (transiente)
-# O tempo para atingir o regime estacionário pode ser estimado visualmente no gráfico,
-# ou sabendo que decai com exp(-(b/2m)*t).
-# Um tempo típico para atingir o regime estacionário é algumas vezes 2m/b.
-# 2m/b = 2*1/0.05 = 40 s. Vamos pegar o final da simulação (t > 150s, por exemplo).
-start_steady_state_index = np.where(np.array(t_a1) > 150)[0][0] # Começar a analisar a partir de t=150s
-
-x_steady_state_b = x_a1[start_steady_state_index:]
-t_steady_state_b = t_a1[start_steady_state_index:]
+# Regime estacionário: ignorar a parte inicial (transiente), com as condições iniciais da alínea a)
+detetor_b, amplitude_est_b, picos_b, energia_a = analyse_steady_state(x0_a, vx0_a, rtol=rtol_a, atol=atol_a)
+print(f"Regime estacionário a partir de t ≈ {detetor_b.t_settle:.1f} s (medições a partir de t = {t_estacionario:.0f} s)")
 
-# Amplitude: valor máximo na parte estacionária
-amplitude_b = np.max(np.abs(x_steady_state_b))
-print(f"Amplitude do movimento no regime estacionário (alínea b): {amplitude_b:.2f} m") [cite: 114]
+# Amplitude: valor máximo de |x| no regime estacionário
+amplitude_b = amplitude_est_b.amplitude
+print(f"Amplitude do movimento no regime estacionário (alínea b): {amplitude_b:.2f} m")
 
-# Período: como wf = 1.0 rad/s, o período deve ser 2*pi/wf
-periodo_b = 2 * np.pi / wf
-print(f"Período do movimento no regime estacionário (alínea b): {periodo_b:.3f} s") [cite: 114]
+# Período: média dos intervalos entre máximos (deve ser 2*pi/wf, com wf = 1.0 rad/s)
+periodo_b = picos_b.period
+print(f"Período do movimento no regime estacionário (alínea b): {periodo_b:.3f} s (2π/wf = {2 * np.pi / wf:.3f} s)")
 
 
 # --- ALÍNEA c) ---
 print("\n--- Alínea c) ---")
 x0_c = -2.0 # m
 vx0_c = -4.0 # m/s
-dt_c_1 = 0.0001
-dt_c_2 = 0.00001 # Para testar a confiança
+rtol_c = 1e-8 # tolerância relativa do integrador adaptativo (verificação)
+atol_c = 1e-10 # tolerância absoluta (m, m/s)
 t_total_c = 300.0 # s
 
-# Simulação com dt_c_1
-t_c1, x_c1, vx_c1, Em_c1 = simulate_oscillator_forced(x0_c, vx0_c, dt_c_1, t_total_c)
-# Simulação com dt_c_2
-t_c2, x_c2, vx_c2, Em_c2 = simulate_oscillator_forced(x0_c, vx0_c, dt_c_2, t_total_c)
-
+# Lei do movimento exata, amostrada de 0.01 em 0.01 s
+t_c1, x_c1, vx_c1, Em_c1 = simulate_oscillator_forced(x0_c, vx0_c, t_total_c)
+# Confiança: integração numérica independente (passo adaptativo), comparada nos mesmos instantes
+x_c_num = simulate_oscillator_adaptive_at(x0_c, vx0_c, t_c1, rtol=rtol_c, atol=atol_c)
+diferenca_c = np.max(np.abs(x_c_num - x_c1))
 
 plt.figure(figsize=(10, 6))
-plt.plot(t_c1, x_c1, label=f'dt={dt_c_1}')
-plt.plot(t_c2, x_c2, label=f'dt={dt_c_2}', linestyle='--')
+plt.plot(t_c1, x_c1, label='Propagador exato')
+plt.plot(t_c1, x_c_num, label=f'Dormand-Prince (rtol={rtol_c})', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Harmónico Forçado (Alínea c)')
@@ -128,31 +134,26 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-# Confiança: verificar posições finais
-print(f"Posição final (dt={dt_c_1}): {x_c1[-1]:.3f} m")
-print(f"Posição final (dt={dt_c_2}): {x_c2[-1]:.3f} m")
-print(f"Diferença nas posições finais: {abs(x_c1[-1] - x_c2[-1]):.3e} m")
-if abs(x_c1[-1] - x_c2[-1]) < 1e-2:
-    print("Temos confiança no resultado. A lei do movimento obtida por dois passos temporais diferentes é a mesma (ou muito próxima).")
+print(f"Diferença máxima entre a solução exata e o Dormand-Prince (rtol={rtol_c}, atol={atol_c}): {diferenca_c:.3e} m")
+if diferenca_c < 1e-2:
+    print("Temos confiança no resultado. A lei do movimento obtida pelos dois métodos é a mesma (ou muito próxima).")
 else:
-    print("Os resultados com diferentes passos de tempo não são suficientemente próximos.")
+    print("Os resultados dos dois métodos não são suficientemente próximos.")
 
 
 # --- ALÍNEA d) ---
 print("\n--- Alínea d) ---")
-# Regime estacionário: ignorar a parte inicial (transiente)
-start_steady_state_index_d = np.where(np.array(t_c1) > 150)[0][0] # Começar a analisar a partir de t=150s
-
-x_steady_state_d = x_c1[start_steady_state_index_d:]
-t_steady_state_d = t_c1[start_steady_state_index_d:]
+# Regime estacionário: ignorar a parte inicial (transiente), com as condições iniciais da alínea c)
+detetor_d, amplitude_est_d, picos_d, _ = analyse_steady_state(x0_c, vx0_c, rtol=rtol_c, atol=atol_c)
+print(f"Regime estacionário a partir de t ≈ {detetor_d.t_settle:.1f} s (medições a partir de t = {t_estacionario:.0f} s)")
 
-# Amplitude: valor máximo na parte estacionária
-amplitude_d = np.max(np.abs(x_steady_state_d))
-print(f"Amplitude do movimento no regime estacionário (alínea d): {amplitude_d:.2f} m") [cite: 115]
+# Amplitude: valor máximo de |x| no regime estacionário
+amplitude_d = amplitude_est_d.amplitude
+print(f"Amplitude do movimento no regime estacionário (alínea d): {amplitude_d:.2f} m")
 
-# Período: como wf = 1.0 rad/s, o período deve ser 2*pi/wf
-periodo_d = 2 * np.pi / wf
-print(f"Período do movimento no regime estacionário (alínea d): {periodo_d:.3f} s") [cite: 115]
+# Período: média dos intervalos entre máximos
+periodo_d = picos_d.period
+print(f"Período do movimento no regime estacionário (alínea d): {periodo_d:.3f} s")
 
 # Confirmar que as amplitudes e períodos são os mesmos para as alíneas b) e d)
 if abs(amplitude_b - amplitude_d) < 1e-2 and abs(periodo_b - periodo_d) < 1e-2:
@@ -161,9 +162,10 @@ if abs(amplitude_b - amplitude_d) < 1e-2 and abs(periodo_b - periodo_d) < 1e-2:
 
 # --- ALÍNEA e) ---
 print("\n--- Alínea e) ---")
-# Usar os resultados de t_a1 e Em_a1 da alínea a) para plotar a energia mecânica
+# Energia mecânica da simulação longa da alínea b) (condições iniciais da alínea a)): o EnergyTracker
+# guarda uma amostra em cada 10 (de 0.1 em 0.1 s), além do mínimo, do máximo e da média
 plt.figure(figsize=(10, 6))
-plt.plot(t_a1, Em_a1, label='Energia Mecânica') [cite: 115]
+plt.plot(energia_a.t_samples, energia_a.e_samples, label='Energia Mecânica')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Energia Mecânica (J)')
 plt.title('Energia Mecânica do Oscilador Harmónico Forçado e Amortecido')
@@ -171,7 +173,8 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-print("A energia mecânica NÃO É constante ao longo do tempo.") [cite: 115]
+print(f"Energia mecânica entre {energia_a.e_min:.1f} J e {energia_a.e_max:.1f} J (média {energia_a.mean:.1f} J em {t_total_estacionario:.0f} s)")
+print("A energia mecânica NÃO É constante ao longo do tempo.")
 print("No início, a energia mecânica aumenta à medida que o sistema absorve energia da força externa e a amplitude cresce.")
 print("No regime estacionário, a energia mecânica flutua mas a sua média é constante, pois a energia fornecida pela força externa é equilibrada pela energia dissipada pelo amortecimento.")
-print("O sistema recebe energia realizada pela força externa e dissipa energia devido à resistência do meio.") [cite: 120]
\ No newline at end of file
+print("O sistema recebe energia realizada pela força externa e dissipa energia devido à resistência do meio.")
\ No newline at end of file
@@ -1,6 +1,15 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.linear import simulate_forced_damped_exact
+from msf.refine import adaptive_resonance_scan
+from msf.steady_state import SteadyStateDetector
+from msf.sweep import forced_oscillator_sweep
+
 # --- Parâmetros fixos do sistema ---
 m = 1.0  # kg 
 k = 1.0  # N/m 
@@ -15,30 +24,14 @@ print(f"Frequência natural do oscilador (omega_0): {omega_0:.3f} rad/s")
 def acceleration_forced_damped(x, vx, t, wf_current):
     return -k / m * x - b / m * vx + F0 / m * np.cos(wf_current * t)
 
-# --- Função de Simulação (Euler-Cromer) ---
-def simulate_oscillator_forced(x0, vx0, dt, t_total, wf_current):
-    t_values = []
-    x_values = []
-    vx_values = []
-
-    t = 0.0
-    x = x0
-    vx = vx0
-
-    t_values.append(t)
-    x_values.append(x)
-    vx_values.append(vx)
-
-    while t <= t_total:
-        ax = acceleration_forced_damped(x, vx, t, wf_current)
-        vx = vx + ax * dt
-        x = x + vx * dt
-        t = t + dt
-
-        t_values.append(t)
-        x_values.append(x)
-        vx_values.append(vx)
-    
+# --- Função de Simulação (propagador exato) ---
+# O oscilador é linear: a solução é propagada exatamente de dt em dt (msf.linear), sem erro de
+# discretização, pelo que dt é só o intervalo entre amostras da lei do movimento
+# detector (opcional): SteadyStateDetector que recebe as amostras (pára de as analisar no regime estacionário)
+def simulate_oscillator_forced(x0, vx0, dt, t_total, wf_current, detector=None):
+    t_values, x_values, vx_values = simulate_forced_damped_exact(x0, vx0, dt, t_total, k, m, b, F0, wf_current)
+    if detector is not None:
+        detector.update(t_values, np.column_stack((x_values, vx_values)))
     return t_values, x_values, vx_values
 
 # --- ALÍNEA a) ---
@@ -46,7 +39,7 @@ print("--- Alínea a) ---")
 wf_alinea_a = 2.0 # rad/s 
 x0_a = 4.0 # m 
 vx0_a = 0.0 # m/s 
-dt_a = 0.001
+dt_a = 0.01 # s (intervalo entre amostras; a solução é exata)
 t_total_a = 100.0 # s (Tempo para atingir regime estacionário)
 
 t_a, x_a, vx_a = simulate_oscillator_forced(x0_a, vx0_a, dt_a, t_total_a, wf_alinea_a)
@@ -62,14 +55,15 @@ plt.show()
 
 # --- ALÍNEA b) ---
 print("\n--- Alínea b) ---")
-# Para o regime estacionário, vamos analisar os últimos N segundos da simulação
-steady_state_start_time = 60.0 # s (após 60s o transiente deve ter decaído bem)
-steady_state_index = np.where(np.array(t_a) >= steady_state_start_time)[0][0]
-
-x_steady_b = x_a[steady_state_index:]
-
-# Amplitude no regime estacionário: valor máximo absoluto na parte estacionária
-amplitude_b = np.max(np.abs(x_steady_b))
+# Regime estacionário detetado automaticamente: o detetor compara períodos sucessivos da força
+# e pára quando a amplitude e o estado em t = n*T deixam de mudar (t_max_b é só o limite máximo)
+t_max_b = 1000.0 # s
+detetor_b = SteadyStateDetector(wf_alinea_a)
+simulate_oscillator_forced(x0_a, vx0_a, dt_a, t_max_b, wf_alinea_a, detector=detetor_b)
+print(f"Regime estacionário a partir de t ≈ {detetor_b.t_settle:.1f} s (confirmado em t = {detetor_b.t_end:.1f} s)")
+
+# Amplitude no regime estacionário: meia amplitude pico-a-pico do último período
+amplitude_b = detetor_b.amplitude[0]
 print(f"Amplitude no regime estacionário: {amplitude_b:.4f} m") # Solução: 0.6648 m
 
 # Período no regime estacionário:
@@ -80,26 +74,32 @@ print(f"Período no regime estacionário: {periodo_b:.3f} s")
 # --- ALÍNEA c) ---
 print("\n--- Alínea c) ---")
 
-# Define a gama de frequências para o gráfico
-wf_values_c = np.linspace(0.2, 2.0, 50) # 50 pontos de 0.2 a 2.0 rad/s
-amplitudes_c = []
-
-# Parâmetros de simulação para o cálculo da amplitude vs wf (pode ser mais curto)
-t_total_c_sim = 150.0 # Tempo de simulação para cada wf para atingir o regime estacionário
-dt_c_sim = 0.001
-
-for current_wf in wf_values_c:
-    # Condições iniciais para cada simulação (não afetam a amplitude no regime estacionário)
-    x0_c = 0.0 # Pode-se usar 0.0 para não ter um transiente muito grande se não for preciso
-    vx0_c = 0.0
-    
-    # Simula o oscilador para a frequência atual
-    t_c, x_c, vx_c = simulate_oscillator_forced(x0_c, vx0_c, dt_c_sim, t_total_c_sim, current_wf)
-    
-    # Encontra a amplitude no regime estacionário (últimos 30% dos dados para garantir regime estável)
-    steady_state_start_index_c = int(len(x_c) * 0.7) # Começar nos últimos 30%
-    amplitude_c_current = np.max(np.abs(x_c[steady_state_start_index_c:]))
-    amplitudes_c.append(amplitude_c_current)
+# Parâmetros de simulação para o cálculo da amplitude vs wf
+# Todas as frequências são simuladas ao mesmo tempo (RK4, uma coluna do estado por frequência);
+# a amplitude é medida por lock-in num número inteiro de períodos entre t_transiente_c e t_total_c_sim
+t_total_c_sim = 150.0 # s
+t_transiente_c = 100.0 # s
+dt_c_sim = 0.01
+
+# Condições iniciais (não afetam a amplitude no regime estacionário)
+x0_c = 0.0
+vx0_c = 0.0
+
+def amplitude_vs_wf(wf_values):
+    return forced_oscillator_sweep(acceleration_forced_damped, x0_c, vx0_c, wf_values,
+                                   dt_c_sim, t_total_c_sim, t_transient=t_transiente_c).amplitude
+
+# Gama de frequências de 0.2 a 2.0 rad/s: em vez de 50 pontos igualmente espaçados, começa com uma
+# grelha grosseira e acrescenta pontos só junto ao pico e às frequências de meia potência
+# (pico localizado a menos de 1e-3 rad/s)
+varrimento_c = adaptive_resonance_scan(amplitude_vs_wf, 0.2, 2.0, xtol=1e-3)
+wf_values_c = varrimento_c.wf
+amplitudes_c = varrimento_c.amplitude
+print(f"{varrimento_c.n_evaluations} simulações em {varrimento_c.n_rounds} varrimentos")
+for pico in varrimento_c.peaks:
+    print(f"Pico: wf = {pico.wf:.4f} rad/s, amplitude = {pico.height:.4f} m, "
+          f"meia largura = {pico.half_width:.4f} rad/s, Q = {pico.Q:.2f}")
+print(f"Q teórico (m*omega_0/b): {m * omega_0 / b:.2f}")
 
 # Plotar a amplitude em função de wf
 plt.figure(figsize=(10, 6))
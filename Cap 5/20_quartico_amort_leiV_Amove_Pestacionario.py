@@ -1,6 +1,16 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.adaptive import simulate_oscillator_adaptive
+from msf.continuation import continuation_sweep
+from msf.harmonic_balance import harmonic_balance, verify_periodic
+from msf.streaming import EnergyTracker, PeakTimes, SteadyStateAmplitude, consume, stream_dopri54
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros fixos do sistema ---
 m = 1.0  # kg
 k = 1.0  # N/m
@@ -25,113 +35,109 @@ def acceleration_quartic_forced_damped(x, vx, t):
 def potential_energy_quartic(x_val):
     return 0.5 * k * x_val**2 * (1 + alpha * x_val**2) # Ep = 0.5*k*x^2 + 0.5*k*alpha*x^4
 
-# --- Função de Simulação (Euler-Cromer) ---
-def simulate_oscillator_quartic(x0, vx0, dt, t_total):
-    t_values = []
-    x_values = []
-    vx_values = []
-    energy_values = []
-
-    t = 0.0
-    x = x0
-    vx = vx0
-
-    t_values.append(t)
-    x_values.append(x)
-    vx_values.append(vx)
-    energy_values.append(0.5 * m * vx**2 + potential_energy_quartic(x))
-
-    while t <= t_total:
-        ax = acceleration_quartic_forced_damped(x, vx, t)
-        vx = vx + ax * dt
-        x = x + vx * dt
-        t = t + dt
-
-        t_values.append(t)
-        x_values.append(x)
-        vx_values.append(vx)
-        energy_values.append(0.5 * m * vx**2 + potential_energy_quartic(x))
-    
-    return t_values, x_values, vx_values, energy_values
+# --- Energia mecânica (vetorizada) ---
+def mechanical_energy(x, vx):
+    return 0.5 * m * vx**2 + potential_energy_quartic(x)
+
+# --- Função de Simulação (Dormand-Prince adaptativo) ---
+# O integrador escolhe o passo para o erro local ficar abaixo de atol + rtol*|y| (msf.adaptive), em vez
+# de um dt fixo de 1e-4; a lei do movimento é depois amostrada de dt_out em dt_out com a saída densa
+def simulate_oscillator_quartic(x0, vx0, t_total, rtol=1e-8, atol=1e-10, dt_out=0.01):
+    solucao = simulate_oscillator_adaptive(x0, vx0, t_total, acceleration_quartic_forced_damped, rtol=rtol, atol=atol)
+    t = TimeGrid(t_total, dt_out).t
+    x, vx = solucao(t)
+    return t, x, vx, mechanical_energy(x, vx)
+
+# --- Regime estacionário por blocos (msf.streaming) ---
+# A simulação longa das alíneas b), d) e e) é integrada bloco a bloco (Dormand-Prince, saída de dt_out em
+# dt_out) e cada consumidor guarda apenas um resumo, por isso a memória não cresce com t_total_estacionario.
+# O tempo de relaxamento é 2m/b = 40 s: as medições começam em t_estacionario, depois de ~7 tempos de relaxamento.
+t_total_estacionario = 600.0 # s
+t_estacionario = 300.0 # s
+dt_estacionario = 0.01 # s
+
+def analyse_steady_state(x0, vx0, rtol=1e-8, atol=1e-10):
+    amplitude = SteadyStateAmplitude(t_estacionario)
+    picos = PeakTimes(t_estacionario)
+    energia = EnergyTracker(mechanical_energy, keep_every=10)
+    blocos = stream_dopri54(acceleration_quartic_forced_damped, x0, vx0, dt_estacionario, t_total_estacionario,
+                            rtol=rtol, atol=atol)
+    consume(blocos, amplitude, picos, energia)
+    return amplitude, picos, energia
 
 # --- ALÍNEA a) ---
 print("--- Alínea a) ---")
 x0_a = 3.0 # m
 vx0_a = 0.0 # m/s
-dt_a_1 = 0.0001
-dt_a_2 = 0.00001 # Para testar a confiança
+rtol_a = 1e-8 # tolerância relativa do integrador adaptativo
+atol_a = 1e-10 # tolerância absoluta (m, m/s)
 t_total_a = 200.0 # s (tempo suficiente para atingir o regime estacionário)
 
-# Simulação com dt_a_1
-t_a1, x_a1, vx_a1, Em_a1 = simulate_oscillator_quartic(x0_a, vx0_a, dt_a_1, t_total_a)
-# Simulação com dt_a_2
-t_a2, x_a2, vx_a2, Em_a2 = simulate_oscillator_quartic(x0_a, vx0_a, dt_a_2, t_total_a)
+# Simulação com passo adaptativo
+t_a1, x_a1, vx_a1, Em_a1 = simulate_oscillator_quartic(x0_a, vx0_a, t_total_a, rtol=rtol_a, atol=atol_a)
+# Confiança: a mesma simulação com tolerâncias 100 vezes menores, comparada nos mesmos instantes
+_, x_a_fino, _, _ = simulate_oscillator_quartic(x0_a, vx0_a, t_total_a, rtol=rtol_a / 100, atol=atol_a / 100)
+diferenca_a = np.max(np.abs(x_a_fino - x_a1))
 
 plt.figure(figsize=(10, 6))
-plt.plot(t_a1, x_a1, label=f'dt={dt_a_1}')
-plt.plot(t_a2, x_a2, label=f'dt={dt_a_2}', linestyle='--') # Plotar com linha tracejada para sobrepor
+plt.plot(t_a1, x_a1, label=f'rtol={rtol_a}')
+plt.plot(t_a1, x_a_fino, label=f'rtol={rtol_a / 100}', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Quártico Forçado (Alínea a)')
 plt.grid(True)
 plt.show()
 
-# Verificar confiança
-print(f"Posição final (dt={dt_a_1}): {x_a1[-1]:.3f} m")
-print(f"Posição final (dt={dt_a_2}): {x_a2[-1]:.3f} m")
-print(f"Diferença nas posições finais: {abs(x_a1[-1] - x_a2[-1]):.3e} m")
-
-if abs(x_a1[-1] - x_a2[-1]) < 1e-2: # Pequena tolerância
-    print("Temos confiança no resultado. A lei do movimento obtida por dois passos temporais diferentes é a mesma (ou muito próxima).")
+print(f"Tolerâncias: rtol={rtol_a}, atol={atol_a}; diferença máxima para tolerâncias 100 vezes menores: {diferenca_a:.3e} m")
+if diferenca_a < 1e-2:
+    print("Temos confiança no resultado. A lei do movimento obtida com duas tolerâncias diferentes é a mesma (ou muito próxima).")
 else:
-    print("Os resultados com diferentes passos de tempo não são suficientemente próximos, o que pode indicar falta de confiança ou necessidade de 'dt' ainda menor.")
+    print("Os resultados com diferentes tolerâncias não são suficientemente próximos.")
 
 
 # --- ALÍNEA b) ---
 print("\n--- Alínea b) ---")
-# Regime estacionário: ignorar a parte inicial (transiente)
-# O tempo de relaxamento é 2m/b = 40s. Vamos pegar os últimos ~100s da simulação.
-steady_state_start_time = 100.0 # s
-steady_state_index = np.where(np.array(t_a1) >= steady_state_start_time)[0][0]
-
-x_steady_b = x_a1[steady_state_index:]
-t_steady_b = t_a1[steady_state_index:]
+# Regime estacionário: ignorar a parte inicial (transiente), com as condições iniciais da alínea a)
+amplitude_est_b, picos_b, energia_a = analyse_steady_state(x0_a, vx0_a, rtol=rtol_a, atol=atol_a)
 
 # Amplitude: valor máximo absoluto na parte estacionária
-amplitude_b = np.max(np.abs(x_steady_b))
+amplitude_b = amplitude_est_b.amplitude
 print(f"Amplitude do movimento no regime estacionário (alínea b): {amplitude_b:.3f} m") # Solução: 13.791 m
 
 # Período: como não é harmónico simples, o período numérico é mais complexo.
-# Vamos encontrar os picos e calcular a média dos períodos.
-peak_times_b = []
-for i in range(1, len(x_steady_b) - 1):
-    if x_steady_b[i] > x_steady_b[i-1] and x_steady_b[i] > x_steady_b[i+1]:
-        peak_times_b.append(t_steady_b[i])
-
-if len(peak_times_b) >= 2:
-    periods_b = np.diff(peak_times_b)
-    periodo_b = np.mean(periods_b)
+# Os picos são encontrados bloco a bloco e o período é a média dos intervalos entre eles.
+if len(picos_b.times) >= 2:
+    periodo_b = picos_b.period
     print(f"Período do movimento no regime estacionário (alínea b): {periodo_b:.3f} s") # Solução: 6.283 s
 else:
     print("Não foi possível determinar o período numericamente com precisão suficiente (poucos picos encontrados).")
 
+# Balanço harmónico: a solução periódica é calculada diretamente (série de Fourier + Newton),
+# sem integrar o transiente; começa com x = amplitude_b*cos(wf*t)
+solucao_hb = harmonic_balance(acceleration_quartic_forced_damped, wf, amplitude_b)
+print(f"Balanço harmónico: amplitude = {solucao_hb.amplitude:.3f} m, período = {solucao_hb.period:.3f} s "
+      f"({solucao_hb.iterations} iterações de Newton)")
+desvio_hb = verify_periodic(acceleration_quartic_forced_damped, solucao_hb, dt=0.01, n_periods=10)
+print(f"Verificação no tempo (RK4, 10 períodos a partir da solução): desvio máximo = {desvio_hb:.1e} m")
+
 
 # --- ALÍNEA c) ---
 print("\n--- Alínea c) ---")
 x0_c = -2.0 # m
 vx0_c = -4.0 # m/s
-dt_c_1 = 0.0001
-dt_c_2 = 0.00001 # Para testar a confiança
+rtol_c = 1e-8 # tolerância relativa do integrador adaptativo
+atol_c = 1e-10 # tolerância absoluta (m, m/s)
 t_total_c = 200.0 # s
 
-# Simulação com dt_c_1
-t_c1, x_c1, vx_c1, Em_c1 = simulate_oscillator_quartic(x0_c, vx0_c, dt_c_1, t_total_c)
-# Simulação com dt_c_2
-t_c2, x_c2, vx_c2, Em_c2 = simulate_oscillator_quartic(x0_c, vx0_c, dt_c_2, t_total_c)
+# Simulação com passo adaptativo
+t_c1, x_c1, vx_c1, Em_c1 = simulate_oscillator_quartic(x0_c, vx0_c, t_total_c, rtol=rtol_c, atol=atol_c)
+# Confiança: a mesma simulação com tolerâncias 100 vezes menores, comparada nos mesmos instantes
+_, x_c_fino, _, _ = simulate_oscillator_quartic(x0_c, vx0_c, t_total_c, rtol=rtol_c / 100, atol=atol_c / 100)
+diferenca_c = np.max(np.abs(x_c_fino - x_c1))
 
 plt.figure(figsize=(10, 6))
-plt.plot(t_c1, x_c1, label=f'dt={dt_c_1}')
-plt.plot(t_c2, x_c2, label=f'dt={dt_c_2}', linestyle='--')
+plt.plot(t_c1, x_c1, label=f'rtol={rtol_c}')
+plt.plot(t_c1, x_c_fino, label=f'rtol={rtol_c / 100}', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Quártico Forçado (Alínea c)')
@@ -139,37 +145,25 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-# Confiança: verificar posições finais
-print(f"Posição final (dt={dt_c_1}): {x_c1[-1]:.3f} m")
-print(f"Posição final (dt={dt_c_2}): {x_c2[-1]:.3f} m")
-print(f"Diferença nas posições finais: {abs(x_c1[-1] - x_c2[-1]):.3e} m")
-if abs(x_c1[-1] - x_c2[-1]) < 1e-2:
-    print("Temos confiança no resultado. A lei do movimento obtida por dois passos temporais diferentes é a mesma (ou muito próxima).")
+print(f"Tolerâncias: rtol={rtol_c}, atol={atol_c}; diferença máxima para tolerâncias 100 vezes menores: {diferenca_c:.3e} m")
+if diferenca_c < 1e-2:
+    print("Temos confiança no resultado. A lei do movimento obtida com duas tolerâncias diferentes é a mesma (ou muito próxima).")
 else:
-    print("Os resultados com diferentes passos de tempo não são suficientemente próximos.")
+    print("Os resultados com diferentes tolerâncias não são suficientemente próximos.")
 
 
 # --- ALÍNEA d) ---
 print("\n--- Alínea d) ---")
-# Regime estacionário
-steady_state_start_index_d = int(len(x_c1) * 0.5) # Começar a analisar a partir da metade
-
-x_steady_d = x_c1[steady_state_start_index_d:]
-t_steady_d = t_c1[steady_state_start_index_d:]
+# Regime estacionário, com as condições iniciais da alínea c)
+amplitude_est_d, picos_d, _ = analyse_steady_state(x0_c, vx0_c, rtol=rtol_c, atol=atol_c)
 
 # Amplitude: valor máximo absoluto na parte estacionária
-amplitude_d = np.max(np.abs(x_steady_d))
+amplitude_d = amplitude_est_d.amplitude
 print(f"Amplitude do movimento no regime estacionário (alínea d): {amplitude_d:.3f} m") # Solução: 13.791 m
 
-# Período
-peak_times_d = []
-for i in range(1, len(x_steady_d) - 1):
-    if x_steady_d[i] > x_steady_d[i-1] and x_steady_d[i] > x_steady_d[i+1]:
-        peak_times_d.append(t_steady_d[i])
-
-if len(peak_times_d) >= 2:
-    periods_d = np.diff(peak_times_d)
-    periodo_d = np.mean(periods_d)
+# Período: média dos intervalos entre picos, como na alínea b)
+if len(picos_d.times) >= 2:
+    periodo_d = picos_d.period
     print(f"Período do movimento no regime estacionário (alínea d): {periodo_d:.3f} s") # Solução: 6.283 s
 else:
     print("Não foi possível determinar o período numericamente com precisão suficiente (poucos picos encontrados).")
@@ -181,9 +175,10 @@ if abs(amplitude_b - amplitude_d) < 1e-2 and abs(periodo_b - periodo_d) < 1e-2:
 
 # --- ALÍNEA e) ---
 print("\n--- Alínea e) ---")
-# Usar os resultados de t_a1 e Em_a1 da alínea a) para plotar a energia mecânica
+# Energia mecânica da simulação longa da alínea b) (condições iniciais da alínea a)): o EnergyTracker
+# guarda uma amostra em cada 10 (de 0.1 em 0.1 s), além do mínimo, do máximo e da média
 plt.figure(figsize=(10, 6))
-plt.plot(t_a1, Em_a1, label='Energia Mecânica')
+plt.plot(energia_a.t_samples, energia_a.e_samples, label='Energia Mecânica')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Energia Mecânica (J)')
 plt.title('Energia Mecânica do Oscilador Quártico Forçado e Amortecido')
@@ -191,6 +186,37 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
+print(f"Energia mecânica entre {energia_a.e_min:.1f} J e {energia_a.e_max:.1f} J (média {energia_a.mean:.1f} J em {t_total_estacionario:.0f} s)")
 print("A energia mecânica NÃO É constante ao longo do tempo.")
 print("O sistema recebe energia realizada pela força externa e dissipa energia devido à resistência do meio.")
-print("No regime estacionário, a energia mecânica média mantém-se constante, mas oscila devido às flutuações da potência da força externa e do amortecimento.")
\ No newline at end of file
+print("No regime estacionário, a energia mecânica média mantém-se constante, mas oscila devido às flutuações da potência da força externa e do amortecimento.")
+
+
+# --- Curva de resposta por continuação (wf a subir e a descer) ---
+print("\n--- Curva de resposta A(wf) por continuação ---")
+# Cada frequência começa no regime estacionário da anterior (em vez de começar do repouso),
+# o que encurta o transiente. Com a mola endurecida (alpha > 0) o pico inclina-se para
+# frequências maiores: a subir o oscilador fica no ramo de grande amplitude, a descer fica no
+# de pequena amplitude, e entre os dois há histerese com saltos.
+def acceleration_quartic_wf(x, vx, t, wf_current):
+    return (-k * x * (1 + 2 * alpha * x**2) - b * vx + F0 * np.cos(wf_current * t)) / m
+
+wf_values_cont = np.linspace(0.6, 2.0, 29)
+continuacao = continuation_sweep(acceleration_quartic_wf, wf_values_cont, 0.0, 0.0, dt=0.01)
+
+for ramo in (continuacao.up, continuacao.down):
+    print(f"Ramo '{ramo.direction}': {ramo.n_periods.sum()} períodos da força simulados; saltos: "
+          + (", ".join(f"wf = {p0:.2f} -> {p1:.2f} rad/s" for p0, p1 in ramo.jumps()) or "nenhum"))
+histerese = continuacao.params[continuacao.hysteresis()]
+if len(histerese):
+    print(f"Histerese para wf entre {histerese.min():.2f} e {histerese.max():.2f} rad/s")
+
+plt.figure(figsize=(10, 6))
+plt.plot(continuacao.params, continuacao.up.amplitude, 'o-', label='wf a subir')
+plt.plot(continuacao.params, continuacao.down.amplitude, 's--', label='wf a descer')
+plt.xlabel('Frequência da força $\\omega_f$ (rad/s)')
+plt.ylabel('Amplitude (m)')
+plt.title('Curva de Resposta do Oscilador Quártico Forçado (Continuação)')
+plt.grid(True)
+plt.legend()
+plt.show()
\ No newline at end of file
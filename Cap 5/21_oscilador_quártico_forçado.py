@@ -1,7 +1,22 @@
+import os
+import sys
+from functools import partial
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.fft import fft, fftfreq # Para a análise de Fourier na alínea d)
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.basins import basin_map
+from msf.continuation import continuation_sweep
+from msf.convergence import dt_convergence
+from msf.ensemble import simulate_ensemble_rk4
+from msf.extrema import find_extrema
+from msf.harmonic_balance import harmonic_balance, verify_periodic
+from msf.recorder import TrajectoryRecorder
+from msf.shooting import shoot_periodic_orbits
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros fixos do sistema ---
 m = 1.0  # kg
 k = 1.0  # N/m
@@ -44,52 +59,46 @@ def rk4_step(x, vx, t, dt, accel_func):
     return x_new, vx_new
 
 # --- Função de Simulação com RK4 ---
-def simulate_oscillator_rk4(x0, vx0, dt, t_total):
-    t_values = []
-    x_values = []
-    vx_values = []
-    energy_values = []
+def simulate_oscillator_rk4(x0, vx0, dt, t_total, keep_every=1):
+    # Registo pré-alocado de (t, x, vx, energia); guarda uma amostra em cada keep_every passos
+    grid = TimeGrid(t_total, dt)
+    recorder = TrajectoryRecorder(4, capacity=len(grid) // keep_every + 2, keep_every=keep_every)
 
     t = 0.0
     x = x0
     vx = vx0
 
-    t_values.append(t)
-    x_values.append(x)
-    vx_values.append(vx)
-    energy_values.append(0.5 * m * vx**2 + potential_energy_quartic(x))
+    recorder.record(t, x, vx, 0.5 * m * vx**2 + potential_energy_quartic(x))
 
-    while t <= t_total:
+    for n in range(grid.n_steps):
         x, vx = rk4_step(x, vx, t, dt, acceleration_quartic_forced_damped)
-        t = t + dt
+        t = grid.time(n + 1)
+
+        recorder.record(t, x, vx, 0.5 * m * vx**2 + potential_energy_quartic(x))
 
-        t_values.append(t)
-        x_values.append(x)
-        vx_values.append(vx)
-        energy_values.append(0.5 * m * vx**2 + potential_energy_quartic(x))
-    
-    return t_values, x_values, vx_values, energy_values
+    return recorder.arrays()
 
 # --- ALÍNEA a) ---
 print("--- Alínea a) ---")
 x0_a = 3.0 # m
 vx0_a = 0.0 # m/s
 dt_a_1 = 0.01 # Passo de tempo maior
-dt_a_2 = 0.001 # Passo de tempo menor (para confiança)
 t_total_a = 100.0 # s (tempo suficiente para regime estacionário, como nas soluções)
 
 # Simulação com dt_a_1
 print(f"Simulando com dt={dt_a_1}...")
 t_a1, x_a1, vx_a1, Em_a1 = simulate_oscillator_rk4(x0_a, vx0_a, dt_a_1, t_total_a)
-# Simulação com dt_a_2
-print(f"Simulando com dt={dt_a_2}...")
-t_a2, x_a2, vx_a2, Em_a2 = simulate_oscillator_rk4(x0_a, vx0_a, dt_a_2, t_total_a)
+# Confiança: dt_a_1, dt_a_1/2, dt_a_1/4, ... (em simultâneo), comparados na mesma grelha temporal
+# e apenas na parte final do movimento (últimos 20% do tempo, após o transiente)
+print(f"Estudo de convergência a partir de dt={dt_a_1}...")
+t_comum_a = np.linspace(0.8 * t_total_a, t_total_a, 2001)
+conv_a = dt_convergence(partial(simulate_oscillator_rk4, x0_a, vx0_a, t_total=t_total_a), dt_a_1, t_comum_a, tol=1e-2,
+                        base=(t_a1, x_a1, vx_a1, Em_a1))
 
 plt.figure(figsize=(10, 6))
 plt.plot(t_a1, x_a1, label=f'dt={dt_a_1}')
-# Para sobrepor de forma clara, vamos plotar apenas uma parte do dt_a_2
-# e talvez com um estilo de linha diferente
-plt.plot(t_a2, x_a2, label=f'dt={dt_a_2}', linestyle='--')
+# Para sobrepor de forma clara, o dt mais pequeno só é mostrado na parte final
+plt.plot(conv_a.t, conv_a.solution, label=f'dt={conv_a.dts[-1]}', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Quártico Forçado (Alínea a)')
@@ -98,14 +107,10 @@ plt.legend()
 plt.show()
 
 # Verificar confiança (comparar apenas a parte final do movimento)
-# Ajustar para o mesmo comprimento de tempo se os t_total forem diferentes
-min_len = min(len(x_a1), len(x_a2))
-# Comparar a "parte estável" (últimos 10-20 segundos, por exemplo)
-comparison_start_index = int(0.8 * min_len) 
-diff_end = np.mean(np.abs(x_a1[comparison_start_index:min_len] - x_a2[comparison_start_index:min_len]))
-
-print(f"Diferença média na parte final (após transiente): {diff_end:.3e} m")
-if diff_end < 1e-2: # Pequena tolerância
+print(f"Passos usados: {conv_a.dts}")
+print(f"Ordem de precisão observada: {conv_a.order:.2f}")
+print(f"Erro estimado (extrapolação de Richardson) com dt={conv_a.dts[-1]}: {conv_a.error:.3e} m")
+if conv_a.converged:
     print("Temos confiança no resultado. As leis do movimento obtidas por dois passos temporais diferentes são a mesma (ou muito próximas).")
 else:
     print("Os resultados com diferentes passos de tempo não são suficientemente próximos. Considere reduzir ainda mais o 'dt'.")
@@ -127,18 +132,41 @@ amplitude_min_b = np.min(x_steady_b)
 print(f"Limites do movimento (amplitude): Max={amplitude_max_b:.4f} m, Min={amplitude_min_b:.4f} m") # Solução: 2.1066 m e -2.3606 m
 
 # Período: como o movimento é periódico, mas não sinusoidal simples, vamos identificar os picos
-peak_times_b = []
-for i in range(1, len(x_steady_b) - 1):
-    if x_steady_b[i] > x_steady_b[i-1] and x_steady_b[i] > x_steady_b[i+1]:
-        peak_times_b.append(t_steady_b[i])
-
+peak_times_b, _, periods_b_list = find_extrema(t_steady_b, x_steady_b)
 if len(peak_times_b) >= 2:
-    periods_b_list = np.diff(peak_times_b)
     periodo_b_avg = np.mean(periods_b_list)
     print(f"Período do movimento no regime estacionário (alínea b): {periodo_b_avg:.3f} s") # Solução: 12.57 s (4*pi)
 else:
     print("Não foi possível determinar o período numericamente com precisão suficiente (poucos picos encontrados).")
 
+# Balanço harmónico: solução periódica de período n*2π/wf calculada diretamente (série de Fourier + Newton).
+# A estimativa inicial são os últimos n períodos da força simulados, com n = 1, 2, 3, 4; das soluções que
+# convergem e que a verificação no tempo (RK4 a partir da solução) confirma, fica a mais próxima da simulação.
+def balanco_harmonico(t_sim, x_sim, n_max=4):
+    T_forca = 2 * np.pi / wf
+    melhor, distancia_melhor = None, np.inf
+    for n_sub in range(1, n_max + 1):
+        t0 = (np.floor(t_sim[-1] / T_forca) - n_sub) * T_forca
+        estimativa = lambda t: np.interp(t + t0, t_sim, x_sim)
+        solucao = harmonic_balance(acceleration_quartic_forced_damped, wf, estimativa, subharmonic=n_sub)
+        if not solucao.converged:
+            continue
+        if verify_periodic(acceleration_quartic_forced_damped, solucao, dt=0.01, n_periods=max(1, 6 // n_sub)) > 1e-3:
+            continue
+        distancia = np.sqrt(np.mean((solucao.x - estimativa(solucao.t))**2))
+        if distancia < distancia_melhor:
+            melhor, distancia_melhor = solucao, distancia
+    if melhor is None:
+        print(f"Balanço harmónico: nenhuma solução periódica com período até {n_max}T a partir desta estimativa")
+        return None
+    x_min, x_max = melhor.limits()
+    n_min = melhor.minimal_subharmonic
+    print(f"Balanço harmónico: período {n_min}T = {n_min * T_forca:.3f} s, Max={x_max:.4f} m, Min={x_min:.4f} m "
+          f"({melhor.iterations} iterações de Newton)")
+    return melhor
+
+solucao_hb_b = balanco_harmonico(t_a1, x_a1)
+
 # Gráfico no Espaço da Fase
 plt.figure(figsize=(8, 8))
 plt.plot(x_steady_b, vx_steady_b, label='Trajetória no Espaço da Fase')
@@ -155,17 +183,18 @@ print("\n--- Alínea c) ---")
 x0_c = -3.0 # m
 vx0_c = -3.0 # m/s
 dt_c_1 = 0.01
-dt_c_2 = 0.001
 t_total_c = 100.0 # s
 
 print(f"Simulando com dt={dt_c_1}...")
 t_c1, x_c1, vx_c1, Em_c1 = simulate_oscillator_rk4(x0_c, vx0_c, dt_c_1, t_total_c)
-print(f"Simulando com dt={dt_c_2}...")
-t_c2, x_c2, vx_c2, Em_c2 = simulate_oscillator_rk4(x0_c, vx_c2, dt_c_2, t_total_c)
+print(f"Estudo de convergência a partir de dt={dt_c_1}...")
+t_comum_c = np.linspace(0.8 * t_total_c, t_total_c, 2001)
+conv_c = dt_convergence(partial(simulate_oscillator_rk4, x0_c, vx0_c, t_total=t_total_c), dt_c_1, t_comum_c, tol=1e-2,
+                        base=(t_c1, x_c1, vx_c1, Em_c1))
 
 plt.figure(figsize=(10, 6))
 plt.plot(t_c1, x_c1, label=f'dt={dt_c_1}')
-plt.plot(t_c2, x_c2, label=f'dt={dt_c_2}', linestyle='--')
+plt.plot(conv_c.t, conv_c.solution, label=f'dt={conv_c.dts[-1]}', linestyle='--')
 plt.xlabel('Tempo (s)')
 plt.ylabel('Posição (m)')
 plt.title('Lei do Movimento do Oscilador Quártico Forçado (Alínea c)')
@@ -173,13 +202,11 @@ plt.grid(True)
 plt.legend()
 plt.show()
 
-# Confiança: verificar posições finais
-min_len_c = min(len(x_c1), len(x_c2))
-comparison_start_index_c = int(0.8 * min_len_c)
-diff_end_c = np.mean(np.abs(x_c1[comparison_start_index_c:min_len_c] - x_c2[comparison_start_index_c:min_len_c]))
-
-print(f"Diferença média na parte final (após transiente): {diff_end_c:.3e} m")
-if diff_end_c < 1e-2:
+# Confiança: comparar a parte final na mesma grelha temporal
+print(f"Passos usados: {conv_c.dts}")
+print(f"Ordem de precisão observada: {conv_c.order:.2f}")
+print(f"Erro estimado (extrapolação de Richardson) com dt={conv_c.dts[-1]}: {conv_c.error:.3e} m")
+if conv_c.converged:
     print("Temos confiança no resultado. As leis do movimento obtidas por dois passos temporais diferentes são a mesma (ou muito próximas).")
 else:
     print("Os resultados com diferentes passos de tempo não são suficientemente próximos. Considere reduzir ainda mais o 'dt'.")
@@ -200,18 +227,15 @@ amplitude_min_d = np.min(x_steady_d)
 print(f"Limites do movimento (amplitude): Max={amplitude_max_d:.4f} m, Min={amplitude_min_d:.4f} m") # Solução: 2.3800 m e -2.3800 m
 
 # Período
-peak_times_d = []
-for i in range(1, len(x_steady_d) - 1):
-    if x_steady_d[i] > x_steady_d[i-1] and x_steady_d[i] > x_steady_d[i+1]:
-        peak_times_d.append(t_steady_d[i])
-
+peak_times_d, _, periods_d_list = find_extrema(t_steady_d, x_steady_d)
 if len(peak_times_d) >= 2:
-    periods_d_list = np.diff(peak_times_d)
     periodo_d_avg = np.mean(periods_d_list)
     print(f"Período do movimento no regime estacionário (alínea d): {periodo_d_avg:.3f} s") # Solução: 18.85 s (6*pi)
 else:
     print("Não foi possível determinar o período numericamente com precisão suficiente (poucos picos encontrados).")
 
+solucao_hb_d = balanco_harmonico(t_c1, x_c1)
+
 # Gráfico no Espaço da Fase
 plt.figure(figsize=(8, 8))
 plt.plot(x_steady_d, vx_steady_d, label='Trajetória no Espaço da Fase')
@@ -290,4 +314,127 @@ print("O sistema apresenta um comportamento transiente inicial, que decai com o
 print("Após o transiente, o sistema atinge um regime estacionário que é periódico, mas não sinusoidal (devido à não-linearidade do termo quártico).")
 print("No entanto, os **limites do movimento e o período no regime estacionário DEPENDEM das condições iniciais.**")
 print("Esta dependência das condições iniciais no regime estacionário é uma característica de sistemas complexos e, em casos extremos (como o próximo problema, o problema 22), pode indicar comportamento caótico. Aqui, o sistema é periódico, mas com diferentes 'órbitas' dependendo de onde se começa.")
-print("A solução não é sinusoidal e o período é um múltiplo da frequência da força externa (ou uma combinação de harmónicas), não sendo um simples oscilador harmónico forçado.")
\ No newline at end of file
+print("A solução não é sinusoidal e o período é um múltiplo da frequência da força externa (ou uma combinação de harmónicas), não sendo um simples oscilador harmónico forçado.")
+
+
+# --- Varrimento de condições iniciais (RK4 em modo ensemble) ---
+print("\n--- Regimes estacionários em função de x0 (varrimento de condições iniciais) ---")
+# As condições iniciais (x0, 0) são avançadas todas de uma vez (estado (N, 2), uma chamada por
+# passo). O período da força é dividido num número inteiro de passos: depois de 60 períodos de
+# transiente a integração recomeça em t = 0 com a mesma fase da força, e os limites do movimento
+# são medidos nos 6 períodos seguintes (múltiplo dos períodos T, 2T e 3T).
+T_forca = 2 * np.pi / wf
+dt_varrimento = T_forca / 600
+x0_varrimento = np.linspace(-4.0, 4.0, 801)
+_, estado_varrimento = simulate_ensemble_rk4(x0_varrimento, 0.0, dt_varrimento, 60 * T_forca,
+                                             acceleration_quartic_forced_damped)
+_, estados_varrimento = simulate_ensemble_rk4(estado_varrimento[:, 0], estado_varrimento[:, 1], dt_varrimento,
+                                              6 * T_forca, acceleration_quartic_forced_damped, keep_every=2)
+x_max_varrimento = estados_varrimento[:, :, 0].max(axis=0)
+x_min_varrimento = estados_varrimento[:, :, 0].min(axis=0)
+
+# Regimes diferentes: limites diferentes (a menos de 0.1 m)
+_, regime_varrimento = np.unique(np.round(np.column_stack((x_min_varrimento, x_max_varrimento)), 1), axis=0,
+                                 return_inverse=True)
+regime_varrimento = regime_varrimento.ravel()
+for r in range(regime_varrimento.max() + 1):
+    no_regime = regime_varrimento == r
+    print(f"  Min={x_min_varrimento[no_regime].mean():.4f} m, Max={x_max_varrimento[no_regime].mean():.4f} m: "
+          f"{100 * np.mean(no_regime):.1f}% das condições iniciais")
+
+plt.figure(figsize=(10, 6))
+plt.plot(x0_varrimento, x_max_varrimento, '.', markersize=2, label='Máximo')
+plt.plot(x0_varrimento, x_min_varrimento, '.', markersize=2, label='Mínimo')
+plt.xlabel('x0 (m) (vx0 = 0)')
+plt.ylabel('Limites do movimento (m)')
+plt.title('Regimes Estacionários em Função da Condição Inicial')
+plt.grid(True)
+plt.legend()
+plt.show()
+
+
+# --- Órbitas periódicas pelo método do tiro (todos os regimes que coexistem) ---
+print("\n--- Órbitas periódicas (método do tiro) e estabilidade de Floquet ---")
+# Em vez de integrar até ao regime estacionário e contar picos, resolve-se x(nT) = x(0) pelo método de
+# Newton para uma grelha de estimativas iniciais (x0, vx0), todas de uma vez, com n = 1, 2, 3.
+# Os multiplicadores de Floquet (valores próprios da matriz de monodromia) dizem se cada órbita é estável.
+estimativas = np.array([(x0, vx0) for x0 in np.linspace(-3, 3, 5) for vx0 in np.linspace(-3, 3, 5)])
+orbitas = []
+for n_sub in (1, 2, 3):
+    tiro = shoot_periodic_orbits(acceleration_quartic_forced_damped, wf, estimativas, subharmonic=n_sub, n_transient=20)
+    for i in tiro.unique_orbits(stable_only=False):
+        # Uma órbita de período T também é solução com n = 2, 3: fica só a primeira vez que aparece
+        repetida = any(abs(tiro.x_max[i] - o[2]) < 1e-4 and abs(tiro.x_min[i] - o[1]) < 1e-4 for o in orbitas)
+        if not repetida:
+            orbitas.append((tiro.minimal_subharmonic[i], tiro.x_min[i], tiro.x_max[i],
+                            np.abs(tiro.multipliers[i]), tiro.stable[i]))
+for n_min, x_min, x_max, mult, estavel in orbitas:
+    print(f"  Período {n_min}T = {n_min * 2 * np.pi / wf:.2f} s: Min={x_min:.4f} m, Max={x_max:.4f} m, "
+          f"|multiplicadores| = {mult[0]:.3f}, {mult[1]:.3f} -> {'estável' if estavel else 'instável'}")
+
+
+# --- Varrimento de F0 por continuação (a subir e a descer) ---
+print("\n--- Regimes estacionários em função de F0 (continuação) ---")
+# Cada valor de F0 começa no regime estacionário do anterior. Como coexistem vários regimes
+# (período T, 3T, ...), o varrimento a subir e o varrimento a descer podem seguir ramos diferentes.
+def acceleration_quartic_F0(x, vx, t, F0_current):
+    return (-k * x * (1 + 2 * alpha * x**2) - b * vx + F0_current * np.cos(wf * t)) / m
+
+F0_values_cont = np.linspace(5.0, 10.0, 21)
+continuacao = continuation_sweep(acceleration_quartic_F0, F0_values_cont, x0_a, vx0_a, dt=0.01, wf=wf)
+
+for ramo in (continuacao.up, continuacao.down):
+    periodos = ", ".join(f"{F:.2f}:{n}T" for F, n in zip(ramo.params, ramo.subharmonic))
+    print(f"Ramo '{ramo.direction}' (F0: período do regime): {periodos}")
+    print(f"  Saltos: " + (", ".join(f"F0 = {p0:.2f} -> {p1:.2f} N" for p0, p1 in ramo.jumps()) or "nenhum"))
+histerese = continuacao.params[continuacao.hysteresis()]
+print(f"F0 com regimes diferentes a subir e a descer: {np.round(histerese, 2)}")
+
+plt.figure(figsize=(10, 6))
+for ramo, estilo in ((continuacao.up, 'o-'), (continuacao.down, 's--')):
+    plt.plot(ramo.params, ramo.x_max, estilo, label=f'Máximo ({ramo.direction})')
+    plt.plot(ramo.params, ramo.x_min, estilo, label=f'Mínimo ({ramo.direction})')
+plt.xlabel('F0 (N)')
+plt.ylabel('Limites do movimento (m)')
+plt.title('Regimes Estacionários do Oscilador Quártico Forçado (Continuação em F0)')
+plt.grid(True)
+plt.legend()
+plt.show()
+
+# --- Bacias de atração no plano (x0, vx0) ---
+print("\n--- Bacias de atração ---")
+# Qual dos regimes coexistentes é atingido a partir de cada condição inicial: a grelha inteira é
+# integrada de uma só vez, período a período, e cada ponto é classificado pelo período do regime e
+# pelo seu estado estroboscópico. Os blocos terminados ficam guardados em cache_bacias/ (ao lado do
+# script): se a execução for interrompida, a seguinte continua onde parou. Os parâmetros físicos são
+# passados em args (e não lidos das variáveis globais) para entrarem na assinatura da cache.
+def acceleration_quartic_params(x, vx, t, m, k, alpha, b, F0):
+    return (-k * x * (1 + 2 * alpha * x**2) - b * vx + F0 * np.cos(wf * t)) / m
+
+pasta_cache = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache_bacias')
+x0_grelha = np.linspace(-4.0, 4.0, 120)
+vx0_grelha = np.linspace(-4.0, 4.0, 120)
+bacias = basin_map(acceleration_quartic_params, wf, x0_grelha, vx0_grelha, n_transient=80,
+                   tile_size=40, cache_dir=pasta_cache, args=(m, k, alpha, b, F0))
+
+fracoes = bacias.fractions()
+for a, (n_periodo, ponto) in enumerate(bacias.attractors):
+    print(f"  Atrator {a}: período {n_periodo}T, estado estroboscópico ({ponto[0]:.4f}, {ponto[1]:.4f}), "
+          f"{100 * fracoes[a]:.1f}% da grelha")
+print(f"  Sem regime estacionário ao fim de 80 períodos: {100 * fracoes[-1]:.1f}% da grelha")
+
+def atrator_de(x0, vx0):
+    return bacias.labels[np.argmin(np.abs(vx0_grelha - vx0)), np.argmin(np.abs(x0_grelha - x0))]
+
+print(f"  (x0, vx0) = ({x0_a}, {vx0_a}) -> atrator {atrator_de(x0_a, vx0_a)}; "
+      f"({x0_c}, {vx0_c}) -> atrator {atrator_de(x0_c, vx0_c)}")
+
+plt.figure(figsize=(8, 7))
+plt.imshow(bacias.labels, extent=bacias.extent, origin='lower', aspect='auto', cmap='tab10',
+           vmin=-1, vmax=9, interpolation='nearest')
+plt.plot([x0_a, x0_c], [vx0_a, vx0_c], 'k*', markersize=12, label='Condições iniciais das alíneas a) e c)')
+plt.xlabel('x0 (m)')
+plt.ylabel('vx0 (m/s)')
+plt.title('Bacias de Atração do Oscilador Quártico Forçado')
+plt.legend()
+plt.show()
\ No newline at end of file
@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.ensemble import simulate_ensemble_rk4
+from msf.timegrid import TimeGrid
+from msf.poincare import bifurcation_diagram, poincare_section
+
 # --- Parâmetros fixos do sistema ---
 m = 1.0  # kg
 k = 1.0  # N/m (não usado diretamente na força se Ep = alpha*x^4, mas pode estar implícito)
@@ -56,9 +64,10 @@ def simulate_oscillator_rk4_chaotic(x0, vx0, dt, t_total):
     x_values.append(x)
     vx_values.append(vx)
 
-    while t <= t_total:
+    grid = TimeGrid(t_total, dt)
+    for n in range(grid.n_steps):
         x, vx = rk4_step(x, vx, t, dt, acceleration_quartic_forced_damped_chaotic)
-        t = t + dt
+        t = grid.time(n + 1)
 
         t_values.append(t)
         x_values.append(x)
@@ -144,4 +153,72 @@ if divergence_time is not None:
 else:
     print(f"\nAs trajetórias não divergiram acima do limiar de {divergence_threshold} m dentro do tempo de simulação de {t_total_sim} s.")
 
-print("\n(A solução do PDF indica que a divergência ocorre até ~73 s).")
\ No newline at end of file
+print("\n(A solução do PDF indica que a divergência ocorre até ~73 s).")
+
+# --- Nuvem de condições iniciais (RK4 em modo ensemble) ---
+# Em vez de três trajetórias, uma nuvem de condições iniciais com x0 entre x0_base - delta_x e
+# x0_base + delta_x, avançada toda de uma vez (estado (N, 2), uma chamada por passo). A largura da
+# nuvem diz a partir de quando o estado deixa de ser previsível com esta incerteza em x0.
+# O passo divide o período da força em 600 passos; guarda-se uma amostra em cada 30.
+x0_nuvem = np.linspace(x0_base - delta_x, x0_base + delta_x, 2001)
+t_nuvem, estados_nuvem = simulate_ensemble_rk4(x0_nuvem, vx0, 2 * np.pi / wf / 600, t_total_sim,
+                                               acceleration_quartic_forced_damped_chaotic, keep_every=30)
+x_nuvem_max = estados_nuvem[:, :, 0].max(axis=1)
+x_nuvem_min = estados_nuvem[:, :, 0].min(axis=1)
+largura_nuvem = x_nuvem_max - x_nuvem_min
+
+plt.figure(figsize=(10, 6))
+plt.fill_between(t_nuvem, x_nuvem_min, x_nuvem_max, alpha=0.4, label=f'{len(x0_nuvem)} condições iniciais')
+plt.plot(t_nuvem, estados_nuvem[:, len(x0_nuvem) // 2, 0], 'k', linewidth=0.8, label=f'x0={x0_base:.3f} m')
+plt.xlabel('Tempo (s)')
+plt.ylabel('Posição (m)')
+plt.title('Nuvem de Condições Iniciais (RK4 em modo ensemble)')
+plt.grid(True)
+plt.legend()
+plt.show()
+
+if np.any(largura_nuvem > divergence_threshold):
+    print(f"Nuvem de {len(x0_nuvem)} condições iniciais (x0 entre {x0_nuvem[0]:.3f} e {x0_nuvem[-1]:.3f} m): "
+          f"largura > {divergence_threshold} m a partir de t = {t_nuvem[np.argmax(largura_nuvem > divergence_threshold)]:.1f} s")
+print(f"Em t = {t_nuvem[-1]:.0f} s a nuvem ocupa x entre {x_nuvem_min[-1]:.2f} e {x_nuvem_max[-1]:.2f} m")
+
+# --- Secção de Poincaré (estado só em t = n*2π/wf) ---
+# Em vez de guardar todos os passos, regista-se o estado uma vez por período da força. Cada período
+# é integrado com um número inteiro de passos, por isso o último aterra exatamente na secção.
+# A lei do movimento não é previsível, mas os pontos da secção desenham sempre o mesmo atrator.
+n_periodos_poincare = 2000
+x_poincare, vx_poincare = poincare_section(acceleration_quartic_forced_damped_chaotic, wf, x0_base, vx0,
+                                           n_periodos_poincare, dt=0.02, n_transient=100)
+
+plt.figure(figsize=(6, 6))
+plt.plot(x_poincare, vx_poincare, '.', markersize=1)
+plt.xlabel('x (m)')
+plt.ylabel('vx (m/s)')
+plt.title(f'Secção de Poincaré (t = n·2π/wf, {n_periodos_poincare} períodos)')
+plt.grid(True)
+plt.show()
+
+# --- Diagrama de bifurcação em F0 ---
+# Todos os valores de F0 são integrados em simultâneo e os pontos da secção vão para um histograma
+# (F0 x bins de x), por isso a memória não depende do número de períodos.
+def acceleration_quartic_F0(x, vx, t, F0):
+    return (-4 * alpha * x**3 - b * vx + F0 * np.cos(wf * t)) / m
+
+F0_valores = np.linspace(5.0, 10.0, 40)
+diagrama = bifurcation_diagram(acceleration_quartic_F0, F0_valores, wf, x0_base, vx0,
+                               n_periods=300, n_transient=100, dt=0.02, bins=150)
+
+plt.figure(figsize=(10, 6))
+plt.imshow(diagrama.density().T > 0, extent=diagrama.extent, origin='lower', aspect='auto', cmap='gray_r')
+plt.xlabel('F0 (N)')
+plt.ylabel('x na secção (m)')
+plt.title('Diagrama de bifurcação (x em t = n·2π/wf)')
+plt.show()
+
+# Poucos bins ocupados: regime periódico (nT ocupa ~n bins); muitos: caótico
+ocupados = diagrama.n_occupied()
+caoticos = F0_valores[ocupados > 20]
+print(f"\nDiagrama de bifurcação: {len(F0_valores)} valores de F0 x {diagrama.n_periods} períodos, "
+      f"histograma de {diagrama.counts.nbytes / 1024:.0f} kB")
+print(f"Regime caótico (mais de 20 bins ocupados) para F0 entre {caoticos.min():.2f} e {caoticos.max():.2f} N, "
+      f"com janelas periódicas pelo meio")
\ No newline at end of file
@@ -1,7 +1,17 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D # Para o plot 3D, opcional mas interessante
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.kernels import lorenz_rk4
+from msf.lorenz import (EnsembleAutocorrelation, EnsembleMoments, LorenzEnsemble, OccupancyHistogram,
+                        load_lorenz_sweep, lorenz_sweep, random_initial_states)
+from msf.lyapunov import lyapunov_exponents
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do sistema de Lorenz ---
 sigma = 10.0
 b = 8.0 / 3.0
@@ -16,69 +26,11 @@ z0 = 0.0
 dt = 0.001 # Passo de tempo
 t_total = 60.0 # Tempo total de simulação (como na solução)
 
-# --- Funções das Derivadas (dx/dt, dy/dt, dz/dt) ---
-def lorenz_dx(x, y, z, sigma):
-    return sigma * (y - x)
-
-def lorenz_dy(x, y, z, r):
-    return r * x - y - x * z
-
-def lorenz_dz(x, y, z, b):
-    return x * y - b * z
-
-# --- Implementação do Método de Runge-Kutta de 4ª Ordem (RK4) para Lorenz ---
-def rk4_step_lorenz(x, y, z, t, dt, sigma, r, b):
-    # k1
-    k1_x = lorenz_dx(x, y, z, sigma)
-    k1_y = lorenz_dy(x, y, z, r)
-    k1_z = lorenz_dz(x, y, z, b)
-
-    # k2
-    k2_x = lorenz_dx(x + k1_x * dt / 2, y + k1_y * dt / 2, z + k1_z * dt / 2, sigma)
-    k2_y = lorenz_dy(x + k1_x * dt / 2, y + k1_y * dt / 2, z + k1_z * dt / 2, r)
-    k2_z = lorenz_dz(x + k1_x * dt / 2, y + k1_y * dt / 2, z + k1_z * dt / 2, b)
-
-    # k3
-    k3_x = lorenz_dx(x + k2_x * dt / 2, y + k2_y * dt / 2, z + k2_z * dt / 2, sigma)
-    k3_y = lorenz_dy(x + k2_x * dt / 2, y + k2_y * dt / 2, z + k2_z * dt / 2, r)
-    k3_z = lorenz_dz(x + k2_x * dt / 2, y + k2_y * dt / 2, z + k2_z * dt / 2, b)
-
-    # k4
-    k4_x = lorenz_dx(x + k3_x * dt, y + k3_y * dt, z + k3_z * dt, sigma)
-    k4_y = lorenz_dy(x + k3_x * dt, y + k3_y * dt, z + k3_z * dt, r)
-    k4_z = lorenz_dz(x + k3_x * dt, y + k3_y * dt, z + k3_z * dt, b)
-
-    # Atualização
-    x_new = x + (k1_x + 2*k2_x + 2*k3_x + k4_x) * dt / 6
-    y_new = y + (k1_y + 2*k2_y + 2*k3_y + k4_y) * dt / 6
-    z_new = z + (k1_z + 2*k2_z + 2*k3_z + k4_z) * dt / 6
-
-    return x_new, y_new, z_new
-
 # --- Simulação principal ---
-t_values = []
-x_values = []
-y_values = []
-z_values = []
-
-t = 0.0
-x = x0
-y = y0
-z = z0
-
-t_values.append(t)
-x_values.append(x)
-y_values.append(y)
-z_values.append(z)
-
-while t <= t_total:
-    x, y, z = rk4_step_lorenz(x, y, z, t, dt, sigma, r, b)
-    t = t + dt
-
-    t_values.append(t)
-    x_values.append(x)
-    y_values.append(y)
-    z_values.append(z)
+# RK4 de passo fixo para (dx/dt, dy/dt, dz/dt) = (sigma*(y - x), r*x - y - x*z, x*y - b*z).
+# O ciclo corre em msf.kernels (compilado com numba se estiver instalado).
+grid = TimeGrid(t_total, dt)
+t_values, x_values, y_values, z_values = lorenz_rk4(x0, y0, z0, dt, grid.n_steps, sigma, r, b)
 
 # --- Plotar a Evolução Temporal ---
 fig_time, axs = plt.subplots(3, 1, figsize=(10, 8), sharex=True)
@@ -138,4 +90,132 @@ ax_3d.set_zlabel("Z Axis")
 ax_3d.set_title("Atractor de Lorenz (3D)")
 plt.show()
 
-print("Simulação das Equações de Lorenz concluída. Os gráficos mostram a evolução temporal não periódica e as projeções do famoso atraktor caótico no espaço de fase.")
\ No newline at end of file
+print("Simulação das Equações de Lorenz concluída. Os gráficos mostram a evolução temporal não periódica e as projeções do famoso atraktor caótico no espaço de fase.")
+
+# --- Expoentes de Lyapunov ---
+# O caos deixa de ser só qualitativo: λ1 > 0 é a taxa de afastamento de trajetórias vizinhas.
+# Espetro completo (3 vetores tangentes com renormalização QR), com a matriz jacobiana do sistema.
+def derivadas_lorenz(t, Y, sigma, r, b):
+    x, y, z = Y
+    return np.array([sigma * (y - x), r * x - y - x * z, x * y - b * z])
+
+def jacobiana_lorenz(t, Y, sigma, r, b):
+    x, y, z = Y
+    zero = np.zeros_like(x)
+    one = np.ones_like(x)
+    return np.array([[-sigma * one, sigma * one, zero],
+                     [r - z, -one, -x],
+                     [y, x, -b * one]])
+
+lyapunov = lyapunov_exponents(derivadas_lorenz, [x0, y0, z0], 0.01, t_total=500, t_transient=20, n_exponents=3,
+                              jacobian=jacobiana_lorenz, args=(sigma, r, b))
+print("\nExpoentes de Lyapunov (r = 28):")
+for i, (lam, err) in enumerate(zip(lyapunov.exponents, lyapunov.stderr), start=1):
+    print(f"  λ{i} = {lam:8.4f} ± {err:.4f}")
+print(f"  soma = {lyapunov.exponents.sum():.4f} (divergência do fluxo: -(sigma + 1 + b) = {-(sigma + 1 + b):.4f})")
+print(f"  dimensão de Kaplan-Yorke do atrator = {lyapunov.kaplan_yorke_dimension:.3f}")
+print("  (valores de referência: λ1 ≈ 0.906, λ2 = 0, λ3 ≈ -14.57)")
+
+# λ1 em função de r: todas as trajetórias integradas de uma só vez (r como array)
+r_valores = np.linspace(10.0, 40.0, 31)
+Y0 = np.repeat(np.array([[x0], [y0], [z0]]), len(r_valores), axis=1)
+lyapunov_r = lyapunov_exponents(derivadas_lorenz, Y0, 0.01, t_total=300, t_transient=50,
+                                jacobian=jacobiana_lorenz, args=(sigma, r_valores, b))
+
+plt.figure(figsize=(10, 4))
+plt.errorbar(r_valores, lyapunov_r.max_exponent, yerr=lyapunov_r.stderr[0], fmt='o-')
+plt.axhline(0, color='k', lw=0.5)
+plt.xlabel('r')
+plt.ylabel('λ1')
+plt.title('Expoente de Lyapunov máximo do sistema de Lorenz')
+plt.grid(True)
+plt.show()
+
+caoticos = r_valores[lyapunov_r.max_exponent > 0.05]
+print(f"λ1 > 0 (caos) a partir de r ≈ {caoticos.min():.0f} (os pontos fixos C± perdem a estabilidade em r ≈ 24.74)")
+
+# --- Ensemble de trajetórias e densidade invariante ---
+# 10⁵ trajetórias integradas juntas (estado (N, 3)); depois do transiente, o histograma 3D da
+# ocupação, as médias/variâncias e a autocorrelação são acumulados durante a integração,
+# sem guardar trajetórias.
+N_ensemble = 100_000
+dt_ensemble = 0.01
+ensemble = LorenzEnsemble(random_initial_states(N_ensemble, center=(x0, y0, z0), spread=5.0, seed=0),
+                          sigma, r, b)
+ensemble.run(dt_ensemble, 2500)  # transiente: o ensemble espalha-se pelo atrator
+
+ocupacao = OccupancyHistogram(bins=64)
+momentos = EnsembleMoments()
+autocorrelacao = EnsembleAutocorrelation(component=0, max_lag=300)
+ensemble.run(dt_ensemble, 1500, (ocupacao, momentos, autocorrelacao), sample_every=5)
+
+print(f"\nEnsemble de {N_ensemble} trajetórias ({momentos.n} amostras):")
+print(f"  média    (x, y, z) = ({momentos.mean[0]:.3f}, {momentos.mean[1]:.3f}, {momentos.mean[2]:.3f})")
+print(f"  desvio   (x, y, z) = ({momentos.std[0]:.3f}, {momentos.std[1]:.3f}, {momentos.std[2]:.3f})")
+print(f"  tempo de correlação de x (C < 1/e): {autocorrelacao.correlation_time():.2f}")
+print(f"  histograma: {ocupacao.bins}³ caixas, {np.count_nonzero(ocupacao.counts)} ocupadas, "
+      f"{ocupacao.outside} amostras fora")
+
+(x_lo, x_hi), _, (z_lo, z_hi) = ocupacao.bounds
+fig_ens, axs_ens = plt.subplots(1, 2, figsize=(14, 5))
+axs_ens[0].imshow(np.log1p(ocupacao.projection(axis=1)).T, origin='lower', aspect='auto',
+                  extent=(x_lo, x_hi, z_lo, z_hi), cmap='magma')
+axs_ens[0].set_xlabel('x')
+axs_ens[0].set_ylabel('z')
+axs_ens[0].set_title('Densidade invariante (projeção no plano x-z)')
+
+axs_ens[1].plot(autocorrelacao.lags, autocorrelacao.C)
+axs_ens[1].axhline(1 / np.e, color='k', lw=0.5, ls='--')
+axs_ens[1].set_xlabel('τ')
+axs_ens[1].set_ylabel('C(τ)')
+axs_ens[1].set_title('Autocorrelação de x (média no ensemble)')
+axs_ens[1].grid(True)
+plt.tight_layout()
+plt.show()
+
+# --- Varrimento em r: mapa de Lorenz e diagrama de bifurcação ---
+# Todos os valores de r são integrados num só ensemble; os máximos sucessivos de z são detetados
+# durante a integração. O resultado fica num ficheiro .npz comprimido ao lado do script, e as
+# execuções seguintes só voltam a desenhar. O ficheiro só é reaproveitado se tiver sido calculado com
+# os mesmos r, sigma, b, condição inicial, dt, t_transient e t_total; caso contrário é recalculado.
+ficheiro_varrimento = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lorenz_varrimento_r.npz')
+parametros_varrimento = dict(r=np.linspace(25.0, 250.0, 400), sigma=sigma, b=b, state0=(x0, y0, z0),
+                             dt=0.005, t_transient=50.0, t_total=100.0)
+varrimento = None
+if os.path.exists(ficheiro_varrimento):
+    varrimento = load_lorenz_sweep(ficheiro_varrimento)
+    if not varrimento.matches(**parametros_varrimento):
+        print("Varrimento em r guardado com outros parâmetros: a recalcular")
+        varrimento = None
+if varrimento is None:
+    varrimento = lorenz_sweep(**parametros_varrimento)
+    varrimento.save(ficheiro_varrimento)
+
+# Mapa de Lorenz z_{n+1}(z_n) para r = 28: várias condições iniciais com o mesmo r
+mapa_28 = lorenz_sweep(r=r, sigma=sigma, b=b, state0=random_initial_states(200, spread=5.0, seed=1),
+                       dt=0.005, t_transient=20.0, t_total=60.0)
+z_n, z_n1 = mapa_28.return_map()
+
+fig_map, axs_map = plt.subplots(1, 2, figsize=(14, 5))
+axs_map[0].plot(z_n, z_n1, '.', markersize=1)
+axs_map[0].plot([z_n.min(), z_n.max()], [z_n.min(), z_n.max()], 'k--', lw=0.5)
+axs_map[0].set_xlabel('$z_n$')
+axs_map[0].set_ylabel('$z_{n+1}$')
+axs_map[0].set_title(f'Mapa de Lorenz (r = {r:g}, {len(z_n)} pares)')
+axs_map[0].grid(True)
+
+r_pontos, z_pontos = varrimento.bifurcation('r')
+axs_map[1].plot(r_pontos, z_pontos, ',', alpha=0.5)
+axs_map[1].set_xlabel('r')
+axs_map[1].set_ylabel('máximos de z')
+axs_map[1].set_title('Diagrama de bifurcação')
+plt.tight_layout()
+plt.show()
+
+print(f"\nVarrimento em r: {len(varrimento)} valores, {len(varrimento.z_max)} máximos de z "
+      f"({os.path.getsize(ficheiro_varrimento) / 1024:.0f} kB em {os.path.basename(ficheiro_varrimento)})")
+# Janelas periódicas: poucos valores distintos de z_max depois do transiente (iguais a menos de 0.5)
+for r_janela in (100.5, 160.0):
+    i = np.argmin(np.abs(varrimento.r - r_janela))
+    n_distintos = 1 + np.count_nonzero(np.diff(np.sort(varrimento.maxima(i))) > 0.5)
+    print(f"  r = {varrimento.r[i]:.1f}: {n_distintos} máximos distintos de z (órbita periódica)")
\ No newline at end of file
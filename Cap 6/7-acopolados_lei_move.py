@@ -1,6 +1,13 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.linear import simulate_coupled_exact
+from msf.observers import OscillationObserver
+
 # --- Parâmetros do Sistema --- 
 m = 1.0  # kg
 k = 1.0  # N/m
@@ -9,47 +16,18 @@ x_Aeq = 1.0 # m
 x_Beq = 1.2 # m
 
 # --- Parâmetros da Simulação ---
-dt = 0.001  # Passo de tempo
+dt = 0.05  # Intervalo entre amostras (a solução é exata, não há erro de discretização)
 t_total = 40.0 # Tempo total de simulação 
 
-# --- Função de Simulação (Euler-Cromer) ---
-def simulate_coupled_oscillators(x_A0, x_B0, v_Ax0, v_Bx0, dt, t_total, case_label):
-    t_values = []
-    xA_values = []
-    xB_values = []
-    
-    # Converter posições iniciais para desvios
-    u_A = x_A0 - x_Aeq
-    u_B = x_B0 - x_Beq
-    
-    v_A = v_Ax0
-    v_B = v_Bx0
-    t = 0.0
-
-    t_values.append(t)
-    xA_values.append(u_A + x_Aeq) # Armazenar posição absoluta
-    xB_values.append(u_B + x_Beq)
-
-    while t <= t_total:
-        # Calcular acelerações
-        a_A = (-k * u_A - kp * (u_A - u_B)) / m
-        a_B = (-k * u_B + kp * (u_A - u_B)) / m # Cuidado com o sinal do segundo termo
-
-        # Atualizar velocidades
-        v_A = v_A + a_A * dt
-        v_B = v_B + a_B * dt
-
-        # Atualizar posições (desvios)
-        u_A = u_A + v_A * dt
-        u_B = u_B + v_B * dt
-
-        # Atualizar tempo
-        t = t + dt
-
-        t_values.append(t)
-        xA_values.append(u_A + x_Aeq) # Armazenar posição absoluta
-        xB_values.append(u_B + x_Beq)
-        
+# --- Função de Simulação (propagador exato) ---
+# O sistema é linear nos desvios u = x - x_eq: a solução é propagada exatamente de dt em dt
+# (msf.linear, expm(A dt) calculada uma vez), em vez de um ciclo de Euler-Cromer com dt = 0.001
+def simulate_coupled_oscillators(x_A0, x_B0, v_Ax0, v_Bx0, dt, t_total, case_label, observer=None):
+    # observer (opcional): OscillationObserver que recebe as amostras de x_A(t)
+    t_values, xA_values, xB_values = simulate_coupled_exact(x_A0, x_B0, v_Ax0, v_Bx0, dt, t_total,
+                                                            k, kp, m, x_Aeq, x_Beq)
+    if observer is not None:
+        observer.update(t_values, xA_values)
     return t_values, xA_values, xB_values
 
 # --- ALÍNEA a) - Calcular a lei do movimento para cada caso ---
@@ -59,14 +37,16 @@ x_A0_i = x_Aeq + 0.05
 x_B0_i = x_Beq + 0.05
 v_Ax0_i = 0.0
 v_Bx0_i = 0.0
-t_i, xA_i, xB_i = simulate_coupled_oscillators(x_A0_i, x_B0_i, v_Ax0_i, v_Bx0_i, dt, t_total, "Caso i")
+obs_i = OscillationObserver() # período do corpo A medido durante a simulação
+t_i, xA_i, xB_i = simulate_coupled_oscillators(x_A0_i, x_B0_i, v_Ax0_i, v_Bx0_i, dt, t_total, "Caso i", observer=obs_i)
 
 # Caso ii) 
 x_A0_ii = x_Aeq + 0.05
 x_B0_ii = x_Beq - 0.05
 v_Ax0_ii = 0.0
 v_Bx0_ii = 0.0
-t_ii, xA_ii, xB_ii = simulate_coupled_oscillators(x_A0_ii, x_B0_ii, v_Ax0_ii, v_Bx0_ii, dt, t_total, "Caso ii")
+obs_ii = OscillationObserver()
+t_ii, xA_ii, xB_ii = simulate_coupled_oscillators(x_A0_ii, x_B0_ii, v_Ax0_ii, v_Bx0_ii, dt, t_total, "Caso ii", observer=obs_ii)
 
 # Caso iii) 
 x_A0_iii = x_Aeq + 0.05
@@ -123,36 +103,19 @@ print("Caso iii): O movimento de cada corpo é mais complexo, parecendo irregula
 
 # --- ALÍNEA c) - Medir Período e Frequência Angular --- 
 
-# Funções para medir o período de um sinal senoidal/quase-senoidal
-def measure_period_and_omega(t_values, x_values, start_time_for_analysis=0.0):
-    # Encontrar picos para medir o período
-    t_peaks = []
-    # Encontra o primeiro índice após o tempo de início da análise
-    start_index = np.where(np.array(t_values) >= start_time_for_analysis)[0][0]
-    
-    for i in range(start_index + 1, len(x_values) - 1):
-        # Verifica se é um máximo local
-        if x_values[i] > x_values[i-1] and x_values[i] > x_values[i+1]:
-            t_peaks.append(t_values[i])
-            
-    if len(t_peaks) >= 2:
-        periods = np.diff(t_peaks)
-        avg_period = np.mean(periods)
-        avg_omega = 2 * np.pi / avg_period
-        return avg_period, avg_omega
-    else:
-        return np.nan, np.nan # Não foi possível determinar o período
+# O período e a frequência angular do corpo A foram estimados durante a simulação
+# (OscillationObserver), sem procurar picos na trajetória guardada.
 
 print("\n--- c) Período e Frequência Angular ---")
 
 # Caso i)
-T_num_i, omega_num_i = measure_period_and_omega(t_i, xA_i)
+T_num_i, omega_num_i = obs_i.period, obs_i.omega
 print(f"Caso i): Período Numérico = {T_num_i:.3f} s, Frequência Angular Numérica = {omega_num_i:.3f} rad/s")
 print(f"Esperado (Modo 1): T_1 = {2*np.pi/1.0:.3f} s, omega_1 = {1.0:.3f} rad/s")
 print(f"Conformidade: {'Sim' if abs(T_num_i - (2*np.pi/1.0)) < 0.01 and abs(omega_num_i - 1.0) < 0.01 else 'Não'}. ")
 
 # Caso ii)
-T_num_ii, omega_num_ii = measure_period_and_omega(t_ii, xA_ii)
+T_num_ii, omega_num_ii = obs_ii.period, obs_ii.omega
 print(f"Caso ii): Período Numérico = {T_num_ii:.3f} s, Frequência Angular Numérica = {omega_num_ii:.3f} rad/s")
 print(f"Esperado (Modo 2): T_2 = {2*np.pi/np.sqrt(2):.3f} s, omega_2 = {np.sqrt(2):.3f} rad/s")
 print(f"Conformidade: {'Sim' if abs(T_num_ii - (2*np.pi/np.sqrt(2))) < 0.01 and abs(omega_num_ii - np.sqrt(2)) < 0.01 else 'Não'}. ")
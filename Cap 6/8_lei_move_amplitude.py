@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.refine import adaptive_resonance_scan
+from msf.sweep import frequency_sweep
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do Sistema ---
 m = 1.0  # kg 
 k = 1.0  # N/m 
@@ -10,6 +18,14 @@ F0 = 0.005 # N
 x_Aeq = 1.0 # m 
 x_Beq = 1.2 # m 
 
+# --- Derivadas do sistema, y = [u_A, u_B, v_A, v_B] (desvios ao equilíbrio) ---
+# Também funciona com y de shape (4, N) e wf_current de shape (N,): uma coluna por frequência
+def derivadas_acoplados(t, y, wf_current):
+    u_A, u_B, v_A, v_B = y
+    a_A = (-k * u_A - kp * (u_A - u_B) - b * v_A + F0 * np.cos(wf_current * t)) / m
+    a_B = (-k * u_B + kp * (u_A - u_B) - b * v_B) / m
+    return np.array([v_A, v_B, a_A, a_B])
+
 # --- Função de Simulação (Euler-Cromer) ---
 def simulate_damped_forced_coupled_oscillators(x_A0, x_B0, v_Ax0, v_Bx0, wf_current, dt, t_total):
     t_values = []
@@ -28,7 +44,8 @@ def simulate_damped_forced_coupled_oscillators(x_A0, x_B0, v_Ax0, v_Bx0, wf_curr
     xA_values.append(u_A + x_Aeq) # Armazenar posição absoluta
     xB_values.append(u_B + x_Beq)
 
-    while t <= t_total:
+    grid = TimeGrid(t_total, dt)
+    for n in range(grid.n_steps):
         # Calcular acelerações 
         a_A = (-k * u_A - kp * (u_A - u_B) - b * v_A + F0 * np.cos(wf_current * t)) / m
         a_B = (-k * u_B + kp * (u_A - u_B) - b * v_B) / m 
@@ -42,7 +59,7 @@ def simulate_damped_forced_coupled_oscillators(x_A0, x_B0, v_Ax0, v_Bx0, wf_curr
         u_B = u_B + v_B * dt
 
         # Atualizar tempo
-        t = t + dt
+        t = grid.time(n + 1)
 
         t_values.append(t)
         xA_values.append(u_A + x_Aeq) # Armazenar posição absoluta
@@ -82,40 +99,28 @@ plt.show()
 # --- ALÍNEA b) - Amplitude em função de $\omega_f$ ---
 print("\n--- b) Amplitude em função de $\omega_f$ ---")
 
-wf_values_b = np.linspace(0.0, 2.5, 100) # Gama de $\omega_f$ de 0 a 2.5 rad/s 
-amplitudes_A = []
-amplitudes_B = []
-
-# Parâmetros de simulação para cada ponto do gráfico de amplitude
-# Tempo total deve ser suficiente para o regime estacionário. O tempo de decaimento (2m/b) = 40s.
-# Então, 150-200s é razoável para a simulação, e pegar a última parte para medir a amplitude.
+# Parâmetros de simulação: as frequências de cada varrimento são simuladas ao mesmo tempo (RK4), com as mesmas CI
+# da alínea a). A amplitude de cada corpo é medida por lock-in (componente à frequência da força)
+# num número inteiro de períodos entre t_transiente_b e t_total_b_sim, o que separa a resposta
+# forçada das oscilações livres que ainda não se amorteceram (com b = 0.05 demoram centenas de s).
 t_total_b_sim = 250.0 # s
-dt_b_sim = 0.001
-
-# Definir o ponto de início da medição da amplitude no regime estacionário
-steady_state_start_time = 150.0 # s (para garantir que o transiente já decaiu)
-
-for current_wf in wf_values_b:
-    # Simular o sistema para a frequência atual (com as mesmas CI da alínea a) 
-    t_sim, xA_sim, xB_sim = simulate_damped_forced_coupled_oscillators(
-        x_A0_a, x_B0_a, v_Ax0_a, v_Bx0_a, current_wf, dt_b_sim, t_total_b_sim
-    )
-    
-    # Encontrar o índice de início para o regime estacionário
-    steady_state_idx = np.where(np.array(t_sim) >= steady_state_start_time)[0]
-    if len(steady_state_idx) == 0:
-        # Caso o tempo de simulação seja muito curto para o tempo de início do regime estacionário
-        # usar a última parte dos dados
-        steady_state_idx = int(len(xA_sim) * 0.7)
-    else:
-        steady_state_idx = steady_state_idx[0]
-
-    # Medir a amplitude no regime estacionário 
-    amp_A_current = np.max(np.abs(np.array(xA_sim[steady_state_idx:]) - x_Aeq))
-    amp_B_current = np.max(np.abs(np.array(xB_sim[steady_state_idx:]) - x_Beq))
-    
-    amplitudes_A.append(amp_A_current)
-    amplitudes_B.append(amp_B_current)
+t_transiente_b = 150.0 # s
+dt_b_sim = 0.01
+y0_b = [x_A0_a - x_Aeq, x_B0_a - x_Beq, v_Ax0_a, v_Bx0_a]
+
+def amplitudes_vs_wf(wf_values):
+    return frequency_sweep(derivadas_acoplados, y0_b, wf_values, dt_b_sim, t_total_b_sim,
+                           t_transient=t_transiente_b, components=(0, 1)).amplitude
+
+# Gama de $\omega_f$ de 0 a 2.5 rad/s: grelha grosseira refinada só junto aos picos (omega_1 e omega_2)
+# e às frequências de meia potência, até localizar os picos a menos de 5e-3 rad/s
+varrimento_b = adaptive_resonance_scan(amplitudes_vs_wf, 0.0, 2.5, xtol=5e-3)
+wf_values_b = varrimento_b.wf
+amplitudes_A, amplitudes_B = varrimento_b.amplitude
+print(f"{varrimento_b.n_evaluations} simulações em {varrimento_b.n_rounds} varrimentos")
+for pico in varrimento_b.peaks:
+    print(f"Corpo {'AB'[pico.component]}: pico em wf = {pico.wf:.4f} rad/s, amplitude = {pico.height:.4f} m, "
+          f"meia largura = {pico.half_width:.4f} rad/s, Q = {pico.Q:.1f}")
 
 plt.figure(figsize=(10, 8))
 
@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from msf.timegrid import TimeGrid
+
 # --- Parâmetros do Sistema ---
 m = 1.0  # kg
 k = 1.0  # N/m
@@ -67,7 +73,8 @@ def simulate_3_coupled_oscillators(u_A0, u_B0, u_C0, v_A0, v_B0, v_C0, dt, t_tot
     uB_values.append(u_B)
     uC_values.append(u_C)
 
-    while t <= t_total:
+    grid = TimeGrid(t_total, dt)
+    for n in range(grid.n_steps):
         # Calcular acelerações (derivadas das equações de movimento)
         a_A = (-k * u_A - kp * (u_A - u_B)) / m
         a_B = (-kp * (u_B - u_A) - kp * (u_B - u_C)) / m
@@ -84,7 +91,7 @@ def simulate_3_coupled_oscillators(u_A0, u_B0, u_C0, v_A0, v_B0, v_C0, dt, t_tot
         u_C += v_C * dt
 
         # Atualizar tempo
-        t += dt
+        t = grid.time(n + 1)
 
         t_values.append(t)
         uA_values.append(u_A)
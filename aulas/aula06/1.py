@@ -1,30 +1,35 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.symplectic import integrate_symplectic
+
 
 t0 = 0.0
 tf = 10.0            
-dt = 0.001          
+dt = 0.01          
 v0 = 2 * np.pi
 x0 = 1.0            
 
 G = 4.0 * np.pi ** 2           
 
 
-t = np.arange(t0, tf, dt)           
-a = np.zeros([np.size(t), 2])      
-
-v = np.zeros([np.size(t), 2])       
-v[0, :] = np.array([0, v0])
+# Integrador simplético de 4ª ordem (Yoshida): a energia não deriva, por isso dt pode ser
+# 10 vezes maior do que com o método de Euler (dt = 0.001, que ainda assim perde ~30% da energia)
+def aceleracao(r):
+    return -G * r / np.linalg.norm(r) ** 3
 
-r = np.zeros([np.size(t), 2])     
-r[0, :] = np.array([x0, 0.0])
+def energia(r, v):
+    return 0.5 * np.dot(v, v) - G / np.linalg.norm(r)
 
-for i in range(np.size(t) - 1):
-    a[i, :] = -G * r[i, :] / np.linalg.norm(r[i, :]) ** 3
-    v[i + 1, :] = v[i, :] + a[i, :] * dt
-    r[i + 1, :] = r[i, :] + v[i, :] * dt
+t, r, v, erro_energia = integrate_symplectic(aceleracao, np.array([x0, 0.0]), np.array([0, v0]), dt, tf - t0,
+                                             scheme="yoshida4", energy_func=energia)
+t = t0 + t
+print(f"Erro relativo máximo da energia: {np.max(np.abs(erro_energia)) / abs(energia(r[0], v[0])):.1e}")
 
 fig, ax = plt.subplots()
 
@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.kernels import contact_chain_euler_cromer
+
 # Parâmetros do sistema
 d = 0.1               # diâmetro das esferas (m)
 l = 10 * d            # comprimento das cordas (m)
@@ -14,49 +20,23 @@ N = 2                 # número de esferas
 dt = 0.0001
 t_max = 5.0
 n_steps = int(t_max / dt)
-t_array = np.linspace(0, t_max, n_steps)
 
 # Condições iniciais
-x = np.zeros((N, n_steps))
-v = np.zeros((N, n_steps))
-x[0, 0] = -5 * d
-x[1, 0] = d
-
-# Função de aceleração por contato
-def acc_toque(dx, d):
-    if dx < d:
-        return (-k * abs(dx - d)**q) / m
-    return 0.0
-
-# Aceleração total para cada esfera
-def acc_i(i, x_vec):
-    a = 0
-    if i > 0:
-        a -= acc_toque(x_vec[i] - x_vec[i-1], d)
-    if i < N - 1:
-        a += acc_toque(x_vec[i+1] - x_vec[i], d)
-    a -= g * (x_vec[i] - d*i) / l
-    return a
-
-# Arrays para energia e momento
-momento_total = np.zeros(n_steps)
-energia_total = np.zeros(n_steps)
-energia_cinetica = np.zeros(n_steps)
-energia_potencial = np.zeros(n_steps)
+x0 = np.zeros(N)
+x0[0] = -5 * d
+x0[1] = d
 
 # Integração Euler-Cromer
-for t in range(n_steps - 1):
-    a = np.zeros(N)
-    for i in range(N):
-        a[i] = acc_i(i, x[:, t])
-        v[i, t+1] = v[i, t] + a[i] * dt
-        x[i, t+1] = x[i, t] + v[i, t+1] * dt
+# Aceleração da esfera i: -g (x_i - d*i) / l mais a força de contato k |Δx - d|^q / m
+# com cada vizinha quando a distância entre centros é menor que d.
+# O ciclo corre em msf.kernels (compilado com numba se estiver instalado).
+t_array, x, v = contact_chain_euler_cromer(x0, 0.0, dt, n_steps - 1, k, q, m, g, l, d)
 
-    # Momento e energias
-    momento_total[t] = m * np.sum(v[:, t])
-    energia_cinetica[t] = 0.5 * m * np.sum(v[:, t]**2)
-    energia_potencial[t] = 0.5 * m * g / l * np.sum((x[:, t] - np.array([d*i for i in range(N)]))**2)
-    energia_total[t] = energia_cinetica[t] + energia_potencial[t]
+# Momento e energias
+momento_total = m * np.sum(v, axis=0)
+energia_cinetica = 0.5 * m * np.sum(v**2, axis=0)
+energia_potencial = 0.5 * m * g / l * np.sum((x - d * np.arange(N)[:, None])**2, axis=0)
+energia_total = energia_cinetica + energia_potencial
 
 # Gráfico: posições das esferas
 plt.figure(figsize=(10, 6))
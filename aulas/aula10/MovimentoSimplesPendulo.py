@@ -1,7 +1,13 @@
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.symplectic import integrate_symplectic
+
 g = 9.8      
 L = 1.0 
 w0 = 0.0      
@@ -9,21 +15,19 @@ dt = 0.01
 T_total = 10  
 n_steps = int(T_total / dt)
 
-def euler_cromer(theta0):
-    
-    theta = np.zeros(n_steps)
-    omega = np.zeros(n_steps)
-    t = np.linspace(0, T_total, n_steps)
-
-
-    theta[0] = theta0
-    omega[0] = w0
+# Integrador simplético de 4ª ordem (Yoshida) em vez do Euler-Cromer (1ª ordem): a energia
+# não deriva e o erro de fase é muito menor para o mesmo dt
+def aceleracao(theta):
+    return -(g / L) * np.sin(theta)
 
-    for i in range(n_steps - 1):
-        omega[i+1] = omega[i] - dt * (g / L) * np.sin(theta[i])
-        theta[i+1] = theta[i] + dt * omega[i+1]
+def energia(theta, omega):
+    # Energia mecânica por unidade de massa
+    return 0.5 * (L * omega)**2 + g * L * (1 - np.cos(theta))
 
-    return t, theta
+def simular_pendulo(theta0):
+    t, theta, omega, erro_energia = integrate_symplectic(aceleracao, theta0, w0, dt, T_total,
+                                                         scheme="yoshida4", energy_func=energia)
+    return t, theta, erro_energia / energia(theta0, w0)
 
 def solucao_analitica(theta0):
     
@@ -42,8 +46,9 @@ angulos_iniciais = [0.1, 0.3, 0.5]
 
 
 for theta0 in angulos_iniciais:
-    t_num, theta_num = euler_cromer(theta0)
+    t_num, theta_num, erro_energia = simular_pendulo(theta0)
     t_ana, theta_ana = solucao_analitica(theta0)
+    print(f"θ₀ = {theta0:.1f} rad: erro relativo máximo da energia = {np.max(np.abs(erro_energia)):.1e}")
 
     plt.plot(t_num, theta_num, label=f'Numérico θ₀={theta0:.1f} rad')
     plt.plot(t_ana, theta_ana, '--', label=f'Analítico θ₀={theta0:.1f} rad')
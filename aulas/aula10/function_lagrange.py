@@ -1,21 +1,9 @@
-def maxmInv(xm1,xm2,xm3,ym1,ym2,ym3):  
-    # Máximo ou mínimo usando o polinómio de Lagrange
-    # Dados (input): (x0,y0), (x1,y1) e (x2,y2) 
-    # Resultados (output): xm, ymax 
-    xab=xm1-xm2
-    xac=xm1-xm3
-    xbc=xm2-xm3
-
-    a=ym1/(xab*xac)
-    b=-ym2/(xab*xbc)
-    c=ym3/(xac*xbc)
-
-    xmla=(b+c)*xm1+(a+c)*xm2+(a+b)*xm3
-    xm=0.5*xmla/(a+b+c)
-
-    xta=xm-xm1
-    xtb=xm-xm2
-    xtc=xm-xm3
-
-    ymax=a*xtb*xtc+b*xta*xtc+c*xta*xtb
-    return xm, ymax
\ No newline at end of file
+import os
+import sys
+
+# Máximo ou mínimo usando o polinómio de Lagrange
+# Dados (input): (x0,y0), (x1,y1) e (x2,y2) - escalares ou arrays de tripletos
+# Resultados (output): xm, ymax
+# A implementação partilhada (com intlagv e intlaginvv) está em msf/lagrange.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.lagrange import maxminv as maxmInv
@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.extrema import find_extrema
+from msf.steady_state import SteadyStateDetector
+from msf.sweep import frequency_sweep
+
 # Parâmetros físicos do sistema
 m = 1.0         # Massa (kg)
 k = 1.0        # Constante elástica (N/m)
@@ -11,7 +19,8 @@ omega_f = 0.5   # Frequência da força externa (rad/s)
 
 # Sistema de equações diferenciais
 # Sistema de equações diferenciais corrigido (sem termo não linear)
-def derivadas(t, y):
+#omega_f é argumento (por omissão 0.5) para o varrimento poder passar um array de frequências
+def derivadas(t, y, omega_f=omega_f):
     x, v = y
     dxdt = v
     dvdt = (F0 * np.cos(omega_f * t) - b * v - k * x) / m  #PELA SEGUNDA LEI DE NEWTON
@@ -35,14 +44,6 @@ def rk4(derivadas, y0, t0, tf, dt):
 
     return t, y
 
-# Função simples para detectar picos no array y (máximos locais)
-def detectar_picos(y):
-    picos = []
-    for i in range(1, len(y)-1):
-        if y[i-1] < y[i] > y[i+1]:
-            picos.append(i)
-    return picos
-
 y0 = [1.0, 0.0]
 t0 = 0
 tf = 100
@@ -61,18 +62,25 @@ plt.grid()
 plt.show()
 
 # b) Cálculo da amplitude e período no regime estacionário
-#analisa apenas ops últimos 30% 
-t_regime = t[int(len(t)*0.7):]
-x_regime = x[int(len(t)*0.7):]
+#o início do regime estacionário é detetado comparando períodos sucessivos da força
+#se não for atingido até tf, analisa apenas os últimos 30%
+detetor = SteadyStateDetector(omega_f)
+detetor.update(t, y)
+if detetor.settled:
+    inicio = np.searchsorted(t, detetor.t_settle)
+    print(f"Regime estacionário a partir de t ≈ {detetor.t_settle:.1f} s")
+else:
+    inicio = int(len(t)*0.7)
+    print(f"Regime estacionário não atingido até t = {tf} s: analisam-se os últimos 30%")
+t_regime = t[inicio:]
+x_regime = x[inicio:]
 
 amplitude = (np.max(x_regime) - np.min(x_regime)) / 2
-picos = detectar_picos(x_regime)  #encontra os picos 
+tempos_picos, _, periodos = find_extrema(t_regime, x_regime)  #encontra os picos (máximos locais)
 
 #se houver pelo menos 2 picos seguidos 
-if len(picos) >= 2:
-    tempos_picos = [t_regime[i] for i in picos]
-    periodos = [tempos_picos[i+1] - tempos_picos[i] for i in range(len(tempos_picos)-1)]
-    periodo_medio = sum(periodos) / len(periodos)
+if len(tempos_picos) >= 2:
+    periodo_medio = np.mean(periodos)
 else:
     periodo_medio = None
 
@@ -81,16 +89,12 @@ print(f"Período médio estimado: {periodo_medio:.4f} s")
 
 # Variação de ω_f de 0.2 a 2 rad/s e cálculo da amplitude
 omega_valores = np.linspace(0.2, 2.0, 50)  #arrayu para explorar difrentes frequências forçadas
-amplitudes = []
-
-#para cada frequência resolve o rk4 para regime estacionário 
-for omega in omega_valores:
-    omega_f = omega  # alterar frequência global
-    t_temp, y_temp = rk4(derivadas, y0, t0, tf, dt)
-    x_temp = y_temp[:, 0]
-    x_reg = x_temp[int(len(x_temp)*0.7):]
-    amp = (np.max(x_reg) - np.min(x_reg)) / 2
-    amplitudes.append(amp)
+
+#todas as frequências são resolvidas com o rk4 ao mesmo tempo (uma coluna do estado por frequência)
+#com b = 0.05 o transiente decai em ~2m/b = 40 s, por isso tf = 100 s não chega: usa-se tf = 400 s
+#e mede-se a amplitude (lock-in à frequência da força) entre 200 s e 400 s
+resposta = frequency_sweep(derivadas, y0, omega_valores, dt, 400, t_transient=200)
+amplitudes = resposta.amplitude
 
 # Encontrar a frequência que gera maior amplitude
 indice_max = np.argmax(amplitudes)
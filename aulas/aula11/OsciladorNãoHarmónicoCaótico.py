@@ -1,6 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Biblioteca partilhada msf/ (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from msf.divergence import divergence_times
+from msf.lyapunov import lyapunov_exponents
+from msf.poincare import bifurcation_diagram, poincare_section
+
 # Parâmetros físicos do sistema
 m = 1.0         # Massa (kg)
 k = 0.2         # Constante elástica (N/m)
@@ -83,6 +91,26 @@ plt.legend()
 plt.grid()
 plt.show()
 
+# Tempo de divergência: em vez de uma só perturbação, a trajetória de referência e 21 cópias com
+# x0 + δ0 (δ0 de 1e-12 a 1e-2) são integradas juntas, e regista-se o primeiro instante em que
+# |x - x_ref| > 0.1 m. Se |δ(t)| ~ δ0 exp(λ t), esse tempo é T_p = (1/λ) ln(0.1/δ0): uma reta em ln δ0.
+divergencia = divergence_times(derivadas, y0, dt, 2000, 0.1, component=0)
+print(f"Tempo para |x - x_ref| > {divergencia.threshold} m com δ0 = 1e-4: "
+      f"{divergencia.times[np.argmin(np.abs(divergencia.offsets - 1e-4))]:.1f} s")
+print(f"Ajuste T_p = (1/λ) ln(Δ/δ0): λ = {divergencia.lyapunov:.3f} s^-1; cada fator 10 de precisão "
+      f"em x0 só dá mais {np.log(10) / divergencia.lyapunov:.0f} s de previsibilidade")
+
+plt.figure(figsize=(8, 4))
+plt.semilogx(divergencia.offsets, divergencia.times, 'o', label='Primeira passagem do limiar')
+plt.semilogx(divergencia.offsets, divergencia.predictability(divergencia.offsets), '--',
+             label=f'Ajuste (λ = {divergencia.lyapunov:.3f} 1/s)')
+plt.xlabel('Perturbação inicial δ0 (m)')
+plt.ylabel('Tempo de divergência (s)')
+plt.title('Horizonte de Previsibilidade')
+plt.legend()
+plt.grid()
+plt.show()
+
 # O gráfico no espaço de fase (velocidade vs posição) mostra a natureza do movimento do sistema.
 # Neste caso, a trajetória não forma uma elipse fechada (como em osciladores harmônicos),
 # mas sim um padrão mais complexo, indicando a presença de não linearidade e amortecimento.
@@ -96,3 +124,84 @@ plt.title('Espaço de Fase: v(t) vs x(t)')
 plt.grid()
 plt.legend()
 plt.show()
+
+# Secção de Poincaré: em vez de guardar todos os passos, guarda-se o estado só em t = n*2π/omega_f
+# (cada período é integrado com um número inteiro de passos, que aterra exatamente na secção).
+# A trajetória no espaço de fase enche uma região; na secção aparece a estrutura do atrator.
+def aceleracao(x, v, t):
+    return derivadas(t, (x, v))[1]
+
+x_poincare, v_poincare = poincare_section(aceleracao, omega_f, y0[0], y0[1], 2000, dt=0.02, n_transient=50)
+
+plt.figure(figsize=(6, 6))
+plt.plot(x_poincare, v_poincare, '.', markersize=1)
+plt.xlabel('Posição x (m)')
+plt.ylabel('Velocidade v (m/s)')
+plt.title('Secção de Poincaré (t = n·2π/ω_f)')
+plt.grid()
+plt.show()
+
+# Diagrama de bifurcação em b: todos os valores de b são integrados juntos e os pontos da secção
+# são somados num histograma (a memória não depende do número de períodos)
+def aceleracao_b(x, v, t, b):
+    return (F0 * np.cos(omega_f * t) - b * v - k * x - 4 * alpha * x**3) / m
+
+b_valores = np.linspace(0.005, 0.2, 40)
+diagrama = bifurcation_diagram(aceleracao_b, b_valores, omega_f, y0[0], y0[1],
+                               n_periods=300, n_transient=100, dt=0.02, bins=150)
+
+plt.figure(figsize=(10, 6))
+plt.imshow(diagrama.density().T > 0, extent=diagrama.extent, origin='lower', aspect='auto', cmap='gray_r')
+plt.xlabel('b (kg/s)')
+plt.ylabel('x na secção (m)')
+plt.title('Diagrama de bifurcação (x em t = n·2π/ω_f)')
+plt.show()
+
+# Poucos bins ocupados: movimento periódico (período nT ocupa ~n bins); muitos: caótico
+ocupados = diagrama.n_occupied()
+print(f"b com movimento caótico (mais de 20 bins ocupados): {np.round(b_valores[ocupados > 20], 3)}")
+print(f"{np.count_nonzero(ocupados <= 3)} de {len(b_valores)} valores de b com movimento periódico (até 3 bins ocupados)")
+
+# Expoente de Lyapunov máximo: mede a sensibilidade às condições iniciais vista acima
+# (|δ(t)| ~ |δ(0)| exp(λ t)); λ > 0 indica caos, λ <= 0 movimento regular.
+lyapunov = lyapunov_exponents(derivadas, y0, dt, t_total=1000, t_transient=100, n_exponents=2)
+print(f"\nExpoentes de Lyapunov: λ1 = {lyapunov.exponents[0]:.4f} ± {lyapunov.stderr[0]:.4f} s^-1, "
+      f"λ2 = {lyapunov.exponents[1]:.4f} ± {lyapunov.stderr[1]:.4f} s^-1")
+print(f"Soma λ1 + λ2 = {lyapunov.exponents.sum():.4f} s^-1 (deve ser -b/m = {-b / m:.4f} s^-1)")
+
+plt.figure(figsize=(8, 4))
+plt.plot(lyapunov.checkpoints, lyapunov.history[:, 0], 'o-')
+plt.xlabel('Tempo de média (s)')
+plt.ylabel('λ1 (1/s)')
+plt.title('Convergência do expoente de Lyapunov máximo')
+plt.grid()
+plt.show()
+
+# Mapa de λ1 no plano (F0, ω_f): todos os pares são integrados em simultâneo (arrays de shape (N,)),
+# com a matriz jacobiana do sistema para os vetores tangentes
+def derivadas_grelha(t, y, F0, omega_f):
+    x, v = y
+    return np.array([v, (F0 * np.cos(omega_f * t) - b * v - k * x - 4 * alpha * x**3) / m])
+
+def jacobiana_grelha(t, y, F0, omega_f):
+    x, v = y
+    return np.array([[np.zeros_like(x), np.ones_like(x)],
+                     [(-k - 12 * alpha * x**2) / m, np.full_like(x, -b / m)]])
+
+F0_grelha, omega_grelha = np.meshgrid(np.linspace(0.5, 10.0, 30), np.linspace(0.2, 2.0, 30))
+y0_grelha = np.repeat(np.array(y0, dtype=float)[:, None], F0_grelha.size, axis=1)
+mapa = lyapunov_exponents(derivadas_grelha, y0_grelha, 0.02, t_total=400, t_transient=100,
+                          jacobian=jacobiana_grelha, args=(F0_grelha.ravel(), omega_grelha.ravel()))
+lambda_mapa = mapa.max_exponent.reshape(F0_grelha.shape)
+
+plt.figure(figsize=(8, 6))
+plt.pcolormesh(F0_grelha, omega_grelha, lambda_mapa, shading='auto', cmap='RdBu_r',
+               vmin=-np.nanmax(np.abs(lambda_mapa)), vmax=np.nanmax(np.abs(lambda_mapa)))
+plt.colorbar(label='λ1 (1/s)')
+plt.xlabel('F0 (N)')
+plt.ylabel('ω_f (rad/s)')
+plt.title('Expoente de Lyapunov máximo')
+plt.show()
+
+print(f"Mapa (F0, ω_f) de {F0_grelha.size} pontos: λ1 > 0.01 s^-1 (caos) em "
+      f"{np.count_nonzero(lambda_mapa > 0.01)} pontos")
@@ -0,0 +1,30 @@
+# Biblioteca partilhada de integradores e ferramentas de análise usadas pelos scripts de MSF.
+# Os scripts dos capítulos acrescentam a raiz do repositório ao sys.path para poderem fazer "import msf".
+
+from .ensemble import rk4_step_ensemble, simulate_ensemble_rk4
+from .recorder import TrajectoryRecorder
+from .adaptive import DenseSolution, accel_to_derivadas, dopri54, simulate_oscillator_adaptive
+from .linear import (LinearPropagator, coupled_oscillators_matrix, forced_damped_matrix,
+                     simulate_coupled_exact, simulate_forced_damped_exact)
+from .events import event, hermite_interpolant, rk4_events
+from .streaming import (EnergyTracker, PeakTimes, SteadyStateAmplitude, consume, stream_dopri54,
+                        stream_euler_cromer, stream_rk4)
+from .symplectic import integrate_symplectic, symplectic_step
+from .convergence import ConvergenceResult, dt_convergence
+from .timegrid import TimeGrid
+from .kernels import contact_chain_euler_cromer, cyclist_euler_cromer, lorenz_rk4
+from .extrema import find_crossings, find_extrema
+from .lagrange import intlaginvv, intlagv, maxminv
+from .observers import OscillationObserver, RunningStats
+from .steady_state import SteadyStateDetector, run_until_steady
+from .sweep import SweepResult, forced_oscillator_sweep, frequency_sweep
+from .refine import AdaptiveScan, ResonancePeak, adaptive_resonance_scan
+from .continuation import Branch, ContinuationResult, continuation_sweep
+from .harmonic_balance import PeriodicSolution, harmonic_balance, verify_periodic
+from .shooting import ShootingResult, shoot_periodic_orbits
+from .poincare import BifurcationDiagram, bifurcation_diagram, iter_poincare, poincare_section
+from .lyapunov import LyapunovResult, iter_lyapunov, lyapunov_exponents
+from .lorenz import (EnsembleAutocorrelation, EnsembleMoments, LorenzEnsemble, LorenzSweep, OccupancyHistogram,
+                     ZMaxima, load_lorenz_sweep, lorenz_sweep, random_initial_states)
+from .basins import BasinMap, basin_map
+from .divergence import DivergenceResult, divergence_times
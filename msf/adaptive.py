@@ -0,0 +1,224 @@
+import numpy as np
+
+from .events import find_step_events
+
+# --- Integrador adaptativo Dormand-Prince 5(4) com saída densa ---
+# Em vez de repetir a simulação com dt=1e-4 e dt=1e-5 para ganhar confiança, o passo é ajustado
+# automaticamente para que o erro local estimado (diferença entre as soluções de ordem 5 e 4)
+# fique abaixo de atol + rtol*|y|. A solução pode depois ser avaliada em qualquer instante
+# através do polinómio interpolador de 4ª ordem de cada passo ("dense output").
+
+# Tabela de Butcher (Dormand & Prince, 1980)
+C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+# Diferença entre os pesos de ordem 5 e 4 (a 7ª etapa é a derivada no fim do passo, FSAL)
+E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+# Coeficientes do interpolador contínuo: y(t + θh) = y + h * K^T P [θ, θ², θ³, θ⁴]
+P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def accel_to_derivadas(accel_func):
+    """Converte accel_func(x, vx, t) no sistema de 1ª ordem derivadas(t, y) com y = [x, vx]."""
+    def derivadas(t, y):
+        return np.array([y[1], accel_func(y[0], y[1], t)])
+    return derivadas
+
+
+class DenseSolution:
+    """
+    Resultado de dopri54: instantes e estados dos passos aceites, estatísticas do integrador,
+    eventos encontrados e interpolação contínua sol(t) (t escalar ou array) dentro de [t0, t[-1]].
+    """
+
+    def __init__(self, t, y, q, h, n_rhs, n_accepted, n_rejected, t_events=None, y_events=None):
+        self.t = t              # instantes dos passos aceites, shape (n+1,)
+        self.y = y              # estados nesses instantes, shape (d, n+1)
+        self._q = q             # coeficientes do interpolador de cada passo, shape (n, d, 4)
+        self._h = h             # tamanho de cada passo (o último pode ter sido cortado por um evento)
+        self.n_rhs = n_rhs
+        self.n_accepted = n_accepted
+        self.n_rejected = n_rejected
+        self.t_events = t_events if t_events is not None else []  # um array de instantes por evento
+        self.y_events = y_events if y_events is not None else []  # um array (m, d) de estados por evento
+
+    @property
+    def x(self):
+        return self.y[0]
+
+    @property
+    def vx(self):
+        return self.y[1]
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        t = np.atleast_1d(t)
+        i = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, len(self.t) - 2)
+        h = self._h[i]
+        theta = (t - self.t[i]) / h
+        powers = theta[:, None] ** np.arange(1, 5)           # (m, 4)
+        y = self.y[:, i] + h * np.einsum("mdk,mk->dm", self._q[i], powers)
+        return y[:, 0] if scalar else y
+
+
+def _rk_step(derivadas, t, y, f, h):
+    # Um passo de Dormand-Prince; devolve y_new, f_new e as 7 etapas K
+    K = np.empty((7, y.size))
+    K[0] = f
+    for s in range(1, 6):
+        dy = np.dot(K[:s].T, A[s]) * h
+        K[s] = derivadas(t + C[s] * h, y + dy)
+    y_new = y + h * np.dot(K[:6].T, B)
+    K[6] = derivadas(t + h, y_new)
+    return y_new, K[6], K
+
+
+def _initial_step(derivadas, t0, y0, f0, rtol, atol):
+    # Estimativa do primeiro passo (Hairer, Nørsett & Wanner, secção II.4)
+    scale = atol + np.abs(y0) * rtol
+    d0 = np.sqrt(np.mean((y0 / scale) ** 2))
+    d1 = np.sqrt(np.mean((f0 / scale) ** 2))
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = derivadas(t0 + h0, y0 + h0 * f0)
+    d2 = np.sqrt(np.mean(((f1 - f0) / scale) ** 2)) / h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+    return min(100 * h0, h1)
+
+
+class StepStats:
+    # Contadores partilhados entre o gerador de passos e quem o consome
+    def __init__(self):
+        self.n_rhs = 0
+        self.n_accepted = 0
+        self.n_rejected = 0
+
+
+def dopri54_steps(derivadas, y0, t0, t_final, rtol=1e-6, atol=1e-9, h0=None, max_step=np.inf, stats=None):
+    """
+    Gerador dos passos aceites de Dormand-Prince: produz (t_old, y_old, h, q, t, y) por passo,
+    onde q são os coeficientes do interpolador (y(t_old + θh) = y_old + h q [θ, θ², θ³, θ⁴]).
+    Se stats (StepStats) for dado, é atualizado com o número de avaliações e de passos.
+    """
+    stats = stats if stats is not None else StepStats()
+    y = np.array(y0, dtype=float)
+    t = float(t0)
+    f = np.asarray(derivadas(t, y), dtype=float)
+    stats.n_rhs += 1
+
+    if h0 is None:
+        h = _initial_step(derivadas, t, y, f, rtol, atol)
+        stats.n_rhs += 1
+    else:
+        h = h0
+
+    while t < t_final:
+        h = min(h, max_step, t_final - t)
+        step_rejected = False
+        while True:
+            y_new, f_new, K = _rk_step(derivadas, t, y, f, h)
+            stats.n_rhs += 6
+            scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+            err = np.sqrt(np.mean((h * np.dot(K.T, E) / scale) ** 2))
+            if err <= 1.0:
+                break
+            # Passo rejeitado: reduzir h e repetir
+            stats.n_rejected += 1
+            step_rejected = True
+            h *= max(MIN_FACTOR, SAFETY * err ** (-1 / 5))
+            if t + h == t:
+                raise RuntimeError(f"Passo demasiado pequeno em t={t}")
+
+        stats.n_accepted += 1
+        t_old, y_old = t, y
+        t = t + h if t_final - (t + h) > 1e-12 * abs(t_final) else t_final
+        y = y_new
+        f = f_new
+        yield t_old, y_old, h, np.dot(K.T, P), t, y
+
+        # Próximo passo (sem aumentar logo a seguir a uma rejeição)
+        factor = MAX_FACTOR if err == 0 else min(MAX_FACTOR, SAFETY * err ** (-1 / 5))
+        if step_rejected:
+            factor = min(1.0, factor)
+        h *= factor
+
+
+def dopri54(derivadas, y0, t0, t_final, rtol=1e-6, atol=1e-9, h0=None, max_step=np.inf, events=None):
+    """
+    Integra dy/dt = derivadas(t, y) de t0 até t_final com passo adaptativo.
+    Devolve um DenseSolution com os passos aceites, a saída densa e as estatísticas
+    (n_rhs avaliações de derivadas, n_accepted passos aceites, n_rejected rejeitados).
+    events: funções g(t, y) cujos zeros são localizados com a saída densa (ver msf.events);
+    a integração para no primeiro evento terminal.
+    """
+    y = np.array(y0, dtype=float)
+    t = float(t0)
+    stats = StepStats()
+
+    t_values = [t]
+    y_values = [y]
+    q_values = []
+    h_values = []
+
+    events = list(events) if events is not None else []
+    g_values = [g(t, y) for g in events]
+    t_events = [[] for _ in events]
+    y_events = [[] for _ in events]
+
+    for t_old, y_old, h, q, t, y in dopri54_steps(derivadas, y, t, t_final, rtol, atol, h0, max_step, stats):
+        q_values.append(q)
+        h_values.append(h)
+
+        if events:
+            def interpolant(tt):
+                theta = (tt - t_old) / h
+                return y_old + h * np.dot(q, theta ** np.arange(1, 5))
+
+            found, g_values, stop = find_step_events(events, g_values, t_old, t, y, interpolant)
+            for j, t_ev, y_ev in found:
+                t_events[j].append(t_ev)
+                y_events[j].append(y_ev)
+            if stop is not None:
+                t, y = stop
+                t_values.append(t)
+                y_values.append(y)
+                break
+
+        t_values.append(t)
+        y_values.append(y)
+
+    d = len(y_values[0])
+    return DenseSolution(np.array(t_values), np.array(y_values).T,
+                         np.array(q_values).reshape(-1, d, 4), np.array(h_values),
+                         stats.n_rhs, stats.n_accepted, stats.n_rejected,
+                         [np.array(te) for te in t_events],
+                         [np.array(ye).reshape(-1, d) for ye in y_events])
+
+
+def simulate_oscillator_adaptive(x0, vx0, t_total, accel_func, rtol=1e-6, atol=1e-9, max_step=np.inf,
+                                 events=None):
+    """Versão adaptativa dos simulate_* dos scripts: mesma accel_func(x, vx, t)."""
+    return dopri54(accel_to_derivadas(accel_func), [x0, vx0], 0.0, t_total,
+                   rtol=rtol, atol=atol, max_step=max_step, events=events)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from .parallel import make_executor
+from .poincare import iter_poincare
+
+# --- Bacias de atração de osciladores forçados ---
+# Com vários regimes estacionários (ex.: período 2T e 3T no oscilador quártico do Cap 5/21), o
+# regime final depende de (x0, vx0). Aqui integra-se uma grelha de condições iniciais inteira
+# (arrays de shape (N,)), período a período na secção estroboscópica t = n*2π/wf (msf.poincare),
+# e classifica-se cada ponto pela "impressão digital" do seu atrator:
+#   - o período m (em múltiplos de T): o menor m <= max_period com s(n + m) = s(n) nos
+#     2*max_period estados estroboscópicos depois do transiente (e nenhum atraso menor quase a repetir);
+#   - o ponto do ciclo com menor x (o mesmo qualquer que seja a fase em que o ciclo é apanhado).
+# Pontos que ainda não repetem ao fim do transiente ficam com rótulo -1.
+# A grelha é dividida em blocos (tiles) corridos num conjunto de processos (msf.parallel).
+# Com cache_dir, cada bloco terminado é guardado em disco (.npz); se a execução for interrompida,
+# a seguinte só calcula os blocos que faltam. O nome dos ficheiros inclui uma assinatura do nome
+# de accel_func, dos parâmetros, de args e da grelha. Os parâmetros físicos (F0, b, ...) devem por
+# isso ser passados em args, accel_func(x, vx, t, *args): uma variável global alterada não muda a
+# assinatura, e a cache devolveria os blocos do valor antigo.
+
+
+class BasinMap:
+    def __init__(self, x0, vx0, labels, attractors, period, point):
+        self.x0 = x0                  # valores de x0 (colunas da grelha)
+        self.vx0 = vx0                # valores de vx0 (linhas da grelha)
+        self.labels = labels          # atrator de cada condição inicial, shape (len(vx0), len(x0)); -1 se não convergiu
+        self.attractors = attractors  # lista de (período em múltiplos de T, ponto (x, vx) do ciclo com menor x)
+        self.period = period          # período do regime de cada condição inicial (0 se não convergiu)
+        self.point = point            # ponto do ciclo com menor x, shape (len(vx0), len(x0), 2)
+
+    @property
+    def extent(self):
+        """(x_min, x_max, vx_min, vx_max) para plt.imshow(basins.labels, extent=..., origin='lower')."""
+        return (self.x0[0], self.x0[-1], self.vx0[0], self.vx0[-1])
+
+    def fractions(self):
+        """Fração da grelha em cada atrator (e, na última posição, a fração que não convergiu)."""
+        counts = np.bincount(self.labels.ravel() + 1, minlength=len(self.attractors) + 1)
+        return np.append(counts[1:], counts[0]) / self.labels.size
+
+
+def _fingerprint(strobe, max_period, tol):
+    # strobe: estados estroboscópicos, shape (n, M, 2) com n = 2*max_period
+    M = strobe.shape[1]
+    scale = 1 + np.abs(strobe).max(axis=(0, 2))
+    period = np.zeros(M, dtype=np.int8)
+    open_ = np.ones(M, dtype=bool)
+    for m in range(1, max_period + 1):
+        diff = np.abs(strobe[m:] - strobe[:-m]).max(axis=(0, 2)) / scale
+        period[open_ & (diff <= tol)] = m
+        # Quase periódico com atraso m: um atraso maior pode passar o teste só porque o resto do
+        # transiente roda e volta ao mesmo sítio (como em msf.continuation), por isso fica por decidir
+        open_ &= diff > np.sqrt(tol)
+    # Ponto do ciclo com menor x, entre os primeiros m estados
+    x = np.where(np.arange(max_period)[:, None] < period[None, :], strobe[:max_period, :, 0], np.inf)
+    first = np.argmin(x, axis=0)
+    point = strobe[first, np.arange(M)]
+    point[period == 0] = np.nan
+    return period, point
+
+
+def _basin_tile(accel_func, args, wf, x0, vx0, dt, n_transient, max_period, tol):
+    def accel(x, vx, t):
+        return accel_func(x, vx, t, *args)
+
+    X0, VX0 = np.meshgrid(x0, vx0)
+    n_keep = 2 * max_period
+    strobe = np.empty((n_keep,) + X0.shape + (2,))
+    with np.errstate(all="ignore"):
+        for n, (x, vx) in enumerate(iter_poincare(accel, wf, X0.ravel(), VX0.ravel(), dt)):
+            if n >= n_transient:
+                strobe[n - n_transient] = np.stack((x, vx), axis=-1).reshape(X0.shape + (2,))
+            if n + 1 == n_transient + n_keep:
+                break
+    period, point = _fingerprint(strobe.reshape(n_keep, -1, 2), max_period, tol)
+    return period.reshape(X0.shape), point.reshape(X0.shape + (2,))
+
+
+def _signature(accel_func, args, wf, x0, vx0, dt, n_transient, max_period, tol, tile_size):
+    h = hashlib.sha1()
+    h.update(f"{getattr(accel_func, '__module__', '')}.{getattr(accel_func, '__qualname__', repr(accel_func))}"
+             .encode())
+    for a in args:
+        h.update(repr(np.shape(a)).encode())
+        h.update(np.ascontiguousarray(a, dtype=float).tobytes())
+    h.update(repr((float(wf), float(dt), int(n_transient), int(max_period), float(tol), int(tile_size))).encode())
+    h.update(np.ascontiguousarray(x0, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(vx0, dtype=float).tobytes())
+    return h.hexdigest()[:12]
+
+
+def _label(period, point, tol):
+    # Agrupa os pontos convergidos em atratores: mesmo período e ponto do ciclo a menos de tol*escala
+    labels = np.full(period.shape, -1, dtype=np.int32)
+    attractors = []
+    converged = period > 0
+    if not converged.any():
+        return labels, attractors
+    keys = np.column_stack((period[converged], point[converged]))
+    scale = 1 + np.abs(keys[:, 1:]).max() if len(keys) else 1.0
+    step = 100 * tol * scale
+    unique, inverse = np.unique(np.column_stack((keys[:, :1], np.round(keys[:, 1:] / step))), axis=0,
+                                return_inverse=True)
+    unique_label = np.empty(len(unique), dtype=np.int32)
+    for u, key in enumerate(unique):
+        m, p = int(key[0]), key[1:] * step
+        for a, (m_a, p_a) in enumerate(attractors):
+            # Arredondamentos diferentes do mesmo atrator ficam em caixas vizinhas
+            if m_a == m and np.max(np.abs(p_a - p)) <= 1.5 * step:
+                unique_label[u] = a
+                break
+        else:
+            unique_label[u] = len(attractors)
+            attractors.append((m, p))
+    labels[converged] = unique_label[inverse.ravel()]
+    # O ponto representativo de cada atrator passa a ser a média dos pontos da grelha que lhe pertencem
+    attractors = [(m, point[labels == a].mean(axis=0)) for a, (m, _) in enumerate(attractors)]
+    return labels, attractors
+
+
+def basin_map(accel_func, wf, x0_values, vx0_values, n_transient=100, max_period=6, dt=0.02, tol=1e-4,
+              tile_size=100, max_workers=None, cache_dir=None, args=()):
+    """
+    Bacias de atração de x'' = accel_func(x, vx, t, *args) (vetorizada, força de frequência wf) na
+    grelha de condições iniciais x0_values x vx0_values.
+    args: parâmetros de accel_func (F0, b, ...); entram na assinatura dos blocos da cache.
+    n_transient: períodos da força antes de comparar os estados estroboscópicos.
+    max_period: maior período do regime procurado, em múltiplos de T.
+    tol: tolerância relativa para dois estados estroboscópicos serem iguais.
+    A grelha é dividida em blocos tile_size x tile_size, corridos por até max_workers processos;
+    com cache_dir, os blocos terminados são guardados nessa pasta e reaproveitados.
+    Devolve um BasinMap.
+    """
+    x0 = np.asarray(x0_values, dtype=float)
+    vx0 = np.asarray(vx0_values, dtype=float)
+    period = np.zeros((len(vx0), len(x0)), dtype=np.int8)
+    point = np.full((len(vx0), len(x0), 2), np.nan)
+    tiles = [(i, j) for i in range(0, len(vx0), tile_size) for j in range(0, len(x0), tile_size)]
+
+    def tile_path(i, j):
+        return os.path.join(cache_dir, f"basin_{signature}_{i // tile_size:04d}_{j // tile_size:04d}.npz")
+
+    todo = tiles
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        signature = _signature(accel_func, args, wf, x0, vx0, dt, n_transient, max_period, tol, tile_size)
+        todo = []
+        for i, j in tiles:
+            if os.path.exists(tile_path(i, j)):
+                with np.load(tile_path(i, j)) as data:
+                    period[i:i + tile_size, j:j + tile_size] = data["period"]
+                    point[i:i + tile_size, j:j + tile_size] = data["point"]
+            else:
+                todo.append((i, j))
+
+    if todo:
+        options = (dt, n_transient, max_period, tol)
+        with make_executor(max_workers, accel_func) as executor:
+            futures = {executor.submit(_basin_tile, accel_func, args, wf, x0[j:j + tile_size], vx0[i:i + tile_size],
+                                       *options): (i, j) for i, j in todo}
+            for future in as_completed(futures):
+                i, j = futures[future]
+                p, q = future.result()
+                period[i:i + tile_size, j:j + tile_size] = p
+                point[i:i + tile_size, j:j + tile_size] = q
+                if cache_dir is not None:
+                    # Escreve num ficheiro temporário e muda o nome: um bloco interrompido a meio
+                    # da escrita não fica na cache
+                    path = tile_path(i, j)
+                    np.savez(path + ".tmp.npz", period=p, point=q)
+                    os.replace(path + ".tmp.npz", path)
+
+    labels, attractors = _label(period, point, tol)
+    return BasinMap(x0, vx0, labels, attractors, period, point)
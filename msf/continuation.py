@@ -0,0 +1,128 @@
+import numpy as np
+
+from .parallel import make_executor
+from .streaming import rk4_step
+
+# --- Varrimentos por continuação (histerese e saltos) ---
+# Nos osciladores não lineares o regime estacionário depende das condições iniciais, e começar
+# cada ponto do varrimento do repouso obriga a pagar o transiente completo. Aqui cada valor do
+# parâmetro (wf, F0, alpha, ...) começa no estado estacionário do valor anterior: como a força é
+# cos(wf*t), o estado estroboscópico em t = n*T (fase 0 da força) é um bom ponto de partida para
+# o parâmetro seguinte, que é integrado de novo a partir de t = 0.
+# Cada ponto é integrado período a período (RK4 com T/dt passos inteiros, sem deriva de fase) até
+# o estado estroboscópico se repetir ao fim de m períodos (m = 1 harmónico, m = 2, 3 ... sub-harmónicos)
+# em n_confirm períodos seguidos; m é o menor atraso em que isso acontece.
+# O varrimento é feito a subir e a descer (em paralelo, msf.parallel); onde os dois ramos não
+# coincidem há histerese, e as mudanças bruscas de amplitude ao longo de um ramo são os saltos.
+
+
+class Branch:
+    def __init__(self, direction, params, x_max, x_min, strobe, subharmonic, settled, n_periods):
+        self.direction = direction      # "up" ou "down"
+        self.params = params            # valores do parâmetro, por ordem crescente
+        self.x_max = x_max              # limites do movimento no regime estacionário
+        self.x_min = x_min
+        self.strobe = strobe            # estado [x, vx] em t = n*T, shape (N, 2)
+        self.subharmonic = subharmonic  # período do regime em múltiplos de T (0 se não estabilizou)
+        self.settled = settled
+        self.n_periods = n_periods      # períodos da força integrados em cada ponto
+
+    @property
+    def amplitude(self):
+        return (self.x_max - self.x_min) / 2
+
+    def jumps(self, rtol=0.3):
+        """
+        Pares (parâmetro antes, parâmetro depois), pela ordem do varrimento, onde a amplitude muda
+        mais que rtol ou o regime muda de período (ex.: de T para 3T).
+        """
+        A = self.amplitude
+        changed = (np.abs(np.diff(A)) > rtol * np.maximum(A[:-1], A[1:])) | (np.diff(self.subharmonic) != 0)
+        i = np.flatnonzero(changed)
+        pairs = [(self.params[j], self.params[j + 1]) for j in i]
+        return pairs if self.direction == "up" else [(p1, p0) for p0, p1 in reversed(pairs)]
+
+
+class ContinuationResult:
+    def __init__(self, params, up, down):
+        self.params = params
+        self.up = up
+        self.down = down
+
+    def hysteresis(self, rtol=0.05):
+        """Máscara dos valores do parâmetro em que os ramos a subir e a descer são diferentes."""
+        A_up = self.up.amplitude
+        A_down = self.down.amplitude
+        return np.abs(A_up - A_down) > rtol * np.maximum(A_up, A_down)
+
+
+def _one_period(accel_func, x, vx, dt, n_steps):
+    # Um período da força a partir de t = 0; devolve o estado final e os limites de x
+    x_max = x_min = x
+    for n in range(n_steps):
+        x, vx = rk4_step(x, vx, n * dt, dt, accel_func)
+        x_max = max(x_max, x)
+        x_min = min(x_min, x)
+    return x, vx, x_max, x_min
+
+
+def _settle(accel_func, x, vx, wf, dt, max_periods, max_subharmonic, rtol, atol, n_confirm):
+    T = 2 * np.pi / wf
+    n_steps = max(1, int(round(T / dt)))
+    strobes = [(x, vx)]
+    limits = []
+    for n in range(max_periods):
+        x, vx, x_max, x_min = _one_period(accel_func, x, vx, T / n_steps, n_steps)
+        strobes.append((x, vx))
+        limits.append((x_max, x_min))
+        s = np.array(strobes[-(max_subharmonic + n_confirm + 1):])
+        scale = max(x_max - x_min, np.abs(s).max())
+        tol = atol + rtol * scale
+        for m in range(1, max_subharmonic + 1):
+            if len(s) < m + n_confirm:
+                break
+            diff = np.abs(s[-n_confirm:] - s[-n_confirm - m:len(s) - m]).max()
+            if diff <= tol:
+                last = np.array(limits[-m:])
+                return x, vx, last[:, 0].max(), last[:, 1].min(), m, True, n + 1
+            if diff <= np.sqrt(tol * scale):
+                # Quase periódico com atraso m: um atraso maior pode passar o teste só porque o resto
+                # do transiente roda e volta ao mesmo sítio, por isso espera-se que este estabilize
+                break
+    last = np.array(limits[-max_subharmonic:])
+    return x, vx, last[:, 0].max(), last[:, 1].min(), 0, False, max_periods
+
+
+def _run_branch(accel_func, params, x0, vx0, dt, wf, max_periods, max_subharmonic, rtol, atol, n_confirm):
+    x, vx = x0, vx0
+    rows = []
+    for p in params:
+        def accel(x, vx, t, p=p):
+            return accel_func(x, vx, t, p)
+        x, vx, x_max, x_min, m, settled, n = _settle(accel, x, vx, p if wf is None else wf, dt,
+                                                     max_periods, max_subharmonic, rtol, atol, n_confirm)
+        rows.append((x_max, x_min, x, vx, m, settled, n))
+    return rows
+
+
+def continuation_sweep(accel_func, param_values, x0, vx0, dt, wf=None, max_periods=400, max_subharmonic=6,
+                       rtol=1e-4, atol=1e-8, n_confirm=3, max_workers=2):
+    """
+    Varrimento por continuação de accel_func(x, vx, t, p) nos valores param_values, a subir e a descer.
+    wf: frequência da força; None se o parâmetro varrido é a própria wf.
+    (x0, vx0) é o estado inicial do primeiro ponto de cada ramo; os seguintes começam no anterior.
+    Devolve um ContinuationResult com os ramos up e down (ambos por ordem crescente do parâmetro).
+    """
+    params = np.sort(np.asarray(param_values, dtype=float))
+    args = (x0, vx0, dt, wf, max_periods, max_subharmonic, rtol, atol, n_confirm)
+    with make_executor(max_workers, accel_func) as executor:
+        future_up = executor.submit(_run_branch, accel_func, params, *args)
+        future_down = executor.submit(_run_branch, accel_func, params[::-1], *args)
+        rows = {"up": future_up.result(), "down": future_down.result()[::-1]}
+
+    branches = {}
+    for direction, r in rows.items():
+        x_max, x_min, x, vx, m, settled, n = (np.array(c) for c in zip(*r))
+        branches[direction] = Branch(direction, params, x_max, x_min, np.column_stack((x, vx)),
+                                     m, settled, n)
+    return ContinuationResult(params, branches["up"], branches["down"])
@@ -0,0 +1,116 @@
+import numpy as np
+
+from .parallel import make_executor
+
+# --- Convergência em dt com comparação na mesma grelha temporal ---
+# Corre a mesma simulação com dt0, dt0/2, dt0/4, ... (várias em simultâneo), interpola cada
+# resultado numa grelha temporal comum (as simulações têm instantes diferentes, por isso não se
+# pode comparar x1[i] com x2[i]) e, com três níveis consecutivos, estima:
+#   - a ordem observada p = log2(|u_h - u_h/2| / |u_h/2 - u_h/4|);
+#   - o erro da solução mais fina por extrapolação de Richardson, |u_h/2 - u_h/4| / (2^p - 1).
+# Para de refinar quando esse erro fica abaixo da tolerância.
+# Só interessam os instantes da grelha comum: se estes forem múltiplos de dt, cada nível guarda
+# apenas um passo em cada keep_every = espaçamento da grelha / dt (os níveis dt/2, dt/4, ... com
+# todos os passos ocupavam centenas de MB, copiados de volta dos processos).
+
+
+class ConvergenceResult:
+    def __init__(self, t, dts, solutions, differences, order, error, converged):
+        self.t = t                      # grelha temporal comum
+        self.dts = dts                  # passos usados (do maior para o menor)
+        self.solutions = solutions      # uma solução interpolada em t por passo
+        self.differences = differences  # max|u_k - u_{k-1}| para k = 1, 2, ...
+        self.order = order              # ordem de precisão observada
+        self.error = error              # erro estimado da solução mais fina (Richardson)
+        self.converged = converged
+
+    @property
+    def solution(self):
+        return self.solutions[-1]
+
+    @property
+    def extrapolated(self):
+        # Extrapolação de Richardson com a ordem observada
+        if len(self.solutions) < 2 or not np.isfinite(self.order):
+            return self.solution
+        return self.solution + (self.solutions[-1] - self.solutions[-2]) / (2 ** self.order - 1)
+
+
+def _estimate(differences):
+    # Ordem observada e erro de Richardson a partir das duas últimas diferenças
+    # (são precisos pelo menos três níveis)
+    if len(differences) < 2:
+        return np.nan, np.inf
+    if differences[-1] == 0:
+        return np.nan, 0.0
+    order = float(np.log2(differences[-2] / differences[-1]))
+    if order <= 0:
+        return order, differences[-1]
+    return order, differences[-1] / (2 ** order - 1)
+
+
+def _keep_every(t_grid, dt):
+    # Dizimação que ainda guarda todos os instantes de t_grid: a grelha tem de ser uniforme, com
+    # instantes múltiplos do espaçamento; senão (1) guardam-se todos os passos
+    if len(t_grid) < 2:
+        return 1
+    spacing = t_grid[1] - t_grid[0]
+    keep_every = int(round(spacing / dt))
+    if keep_every <= 1 or abs(keep_every * dt - spacing) > 1e-9 * spacing:
+        return 1
+    if not np.allclose(np.diff(t_grid), spacing, rtol=1e-9, atol=0):
+        return 1
+    n = t_grid / spacing
+    if np.max(np.abs(n - np.round(n))) > 1e-6:
+        return 1
+    return keep_every
+
+
+def _run(simulate, dt, keep_every):
+    return simulate(dt, keep_every=keep_every) if keep_every > 1 else simulate(dt)
+
+
+def dt_convergence(simulate, dt0, t_grid, tol, max_levels=5, component=1, max_workers=3, base=None):
+    """
+    simulate(dt) -> tuplo de arrays (t, ...); component escolhe o array a comparar (1 = x
+    nos simulate_* dos scripts). Use functools.partial para fixar os outros argumentos, ex.:
+    partial(simulate_oscillator_rk4, x0, vx0, t_total=100.0).
+    Se os instantes de t_grid forem múltiplos do seu espaçamento e este de dt, simulate é
+    chamada como simulate(dt, keep_every=k) e só guarda os instantes da grelha.
+    base: resultado de simulate(dt0) já calculado pelo script, reaproveitado como primeiro nível.
+    Corre até max_workers níveis em simultâneo e devolve um ConvergenceResult.
+    """
+    t_grid = np.asarray(t_grid, dtype=float)
+    dts = []
+    solutions = []
+    differences = []
+    order, error = np.nan, np.inf
+
+    with make_executor(max_workers, simulate) as executor:
+        pending = {}
+        next_level = 0 if base is None else 1
+
+        def submit_until_full():
+            nonlocal next_level
+            while len(pending) < max_workers and next_level < max_levels:
+                dt = dt0 / 2 ** next_level
+                pending[next_level] = executor.submit(_run, simulate, dt, _keep_every(t_grid, dt))
+                next_level += 1
+
+        submit_until_full()
+        for level in range(max_levels):
+            result = base if level == 0 and base is not None else pending.pop(level).result()
+            submit_until_full()
+
+            dts.append(dt0 / 2 ** level)
+            solutions.append(np.interp(t_grid, np.asarray(result[0]), np.asarray(result[component])))
+            if level > 0:
+                differences.append(float(np.max(np.abs(solutions[-1] - solutions[-2]))))
+            order, error = _estimate(differences)
+            if error < tol:
+                break
+
+        for future in pending.values():
+            future.cancel()
+
+    return ConvergenceResult(t_grid, dts, solutions, differences, order, error, error < tol)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from .timegrid import TimeGrid
+
+# --- Tempo de divergência (horizonte de previsibilidade) ---
+# Em vez de comparar duas trajetórias a olho (x0 = 1.0 e x0 = 1.0001), integra-se uma trajetória
+# de referência e M cópias perturbadas com afastamentos iniciais δ0 em escala logarítmica
+# (1e-12 ... 1e-2), todas de uma vez (estado de shape (d, 1 + M), como derivadas(t, y) já aceita).
+# Depois de cada passo calcula-se só a distância de cada cópia à referência e regista-se o primeiro
+# instante em que passa o limiar Δ (interpolado em log da distância entre os dois passos); não se
+# guarda nenhuma trajetória.
+# Num sistema caótico a distância cresce como δ0 exp(λ t), por isso o horizonte de previsibilidade é
+#     T_p = (1/λ) ln(Δ / δ0),
+# uma reta em ln δ0 com declive -1/λ: o ajuste dá λ e o horizonte para qualquer δ0.
+
+
+class DivergenceResult:
+    def __init__(self, offsets, times, threshold, lyapunov, intercept):
+        self.offsets = offsets      # afastamentos iniciais δ0
+        self.times = times          # primeiro instante com distância > threshold (nan se não passou)
+        self.threshold = threshold  # limiar Δ
+        self.lyapunov = lyapunov    # λ do ajuste T_p = (1/λ) ln(Δ/δ0) (+ constante)
+        self.intercept = intercept  # T_p ajustado para δ0 = 1
+
+    @property
+    def diverged(self):
+        return np.isfinite(self.times)
+
+    def predictability(self, delta0):
+        """Horizonte de previsibilidade ajustado para um afastamento inicial delta0."""
+        return self.intercept - np.log(delta0) / self.lyapunov
+
+
+def _rk4_step(derivadas, t, y, dt, args):
+    k1 = derivadas(t, y, *args)
+    k2 = derivadas(t + dt / 2, y + k1 * dt / 2, *args)
+    k3 = derivadas(t + dt / 2, y + k2 * dt / 2, *args)
+    k4 = derivadas(t + dt, y + k3 * dt, *args)
+    return y + (k1 + 2 * k2 + 2 * k3 + k4) * dt / 6
+
+
+def divergence_times(derivadas, y0, dt, t_max, threshold, offsets=None, direction=None, component=None, args=()):
+    """
+    Primeiro instante em que cada cópia perturbada, y0 + δ0*direction, se afasta mais que threshold
+    da trajetória que parte de y0, para derivadas(t, y, *args) com y de shape (d, N).
+    offsets: afastamentos δ0 (por omissão 21 valores de 1e-12 a 1e-2).
+    direction: direção da perturbação (por omissão a primeira componente, ex.: x0 + δ0).
+    component: índice da componente usada na distância (None: norma euclidiana do estado).
+    Devolve um DivergenceResult com os tempos e o ajuste T_p = (1/λ) ln(Δ/δ0).
+    """
+    offsets = np.logspace(-12, -2, 21) if offsets is None else np.asarray(offsets, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+    if direction is None:
+        direction = np.eye(len(y0))[0]
+    direction = np.asarray(direction, dtype=float) / np.linalg.norm(direction)
+    y = np.column_stack((y0, y0[:, None] + direction[:, None] * offsets))
+
+    def distance(y):
+        d = y[:, 1:] - y[:, :1]
+        return np.abs(d[component]) if component is not None else np.sqrt(np.sum(d ** 2, axis=0))
+
+    times = np.full(len(offsets), np.nan)
+    d_prev = distance(y)
+    grid = TimeGrid(t_max, dt)
+    for n in range(grid.n_steps):
+        t = grid.time(n)
+        h = grid.time(n + 1) - t
+        y = _rk4_step(derivadas, t, y, h, args)
+        d = distance(y)
+        crossed = np.isnan(times) & (d > threshold)
+        if crossed.any():
+            # Interpolação em ln(distância) entre os dois passos (o crescimento é exponencial)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                frac = np.log(threshold / d_prev[crossed]) / np.log(d[crossed] / d_prev[crossed])
+            times[crossed] = t + h * np.clip(np.nan_to_num(frac, nan=1.0), 0.0, 1.0)
+            if not np.isnan(times).any():
+                break
+        d_prev = d
+
+    # Ajuste linear T_p = intercept - ln(δ0)/λ nas cópias que divergiram (pelo menos 2)
+    ok = np.isfinite(times) & (offsets < threshold)
+    lyapunov = intercept = np.nan
+    if np.count_nonzero(ok) >= 2:
+        slope, intercept = np.polyfit(np.log(offsets[ok]), times[ok], 1)
+        lyapunov = -1 / slope
+    return DivergenceResult(offsets, times, threshold, lyapunov, intercept)
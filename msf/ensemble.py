@@ -0,0 +1,64 @@
+import numpy as np
+
+# --- RK4 em modo "ensemble" ---
+# O estado é um array (N, 2): coluna 0 = posição x, coluna 1 = velocidade vx.
+# Uma única chamada avança as N trajetórias com a mesma accel_func(x, vx, t, *args),
+# que recebe arrays de tamanho N (as funções de aceleração dos scripts já usam np.cos, etc.,
+# por isso funcionam tal como estão).
+
+
+def rk4_step_ensemble(state, t, dt, accel_func, *args):
+    """Avança N pares (x, vx) um passo dt com Runge-Kutta de 4ª ordem."""
+    x = state[:, 0]
+    vx = state[:, 1]
+    h = dt / 2
+
+    # k1
+    k1_vx = accel_func(x, vx, t, *args)
+    k1_x = vx
+
+    # k2
+    k2_x = vx + k1_vx * h
+    k2_vx = accel_func(x + k1_x * h, k2_x, t + h, *args)
+
+    # k3
+    k3_x = vx + k2_vx * h
+    k3_vx = accel_func(x + k2_x * h, k3_x, t + h, *args)
+
+    # k4
+    k4_x = vx + k3_vx * dt
+    k4_vx = accel_func(x + k3_x * dt, k4_x, t + dt, *args)
+
+    # Atualização
+    new_state = np.empty_like(state)
+    new_state[:, 0] = x + (k1_x + 2 * k2_x + 2 * k3_x + k4_x) * dt / 6
+    new_state[:, 1] = vx + (k1_vx + 2 * k2_vx + 2 * k3_vx + k4_vx) * dt / 6
+    return new_state
+
+
+def simulate_ensemble_rk4(x0, vx0, dt, t_total, accel_func, *args, keep_every=None):
+    """
+    Integra N osciladores em simultâneo desde t=0 até t_total.
+    x0 e vx0 podem ser escalares ou arrays (são combinados por broadcasting).
+    Devolve o instante final e o estado final (N, 2).
+    Com keep_every=k, devolve a trajetória com uma amostra em cada k passos (incluindo t=0):
+    instantes de shape (n,) e estados de shape (n, N, 2).
+    """
+    x0, vx0 = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(vx0, dtype=float))
+    state = np.column_stack((x0.ravel(), vx0.ravel()))
+
+    n_steps = int(round(t_total / dt))
+    if keep_every is not None:
+        t_kept = np.arange(0, n_steps + 1, keep_every) * dt
+        states = np.empty((len(t_kept),) + state.shape)
+        states[0] = state
+    t = 0.0
+    for n in range(n_steps):
+        state = rk4_step_ensemble(state, t, dt, accel_func, *args)
+        t = (n + 1) * dt
+        if keep_every is not None and (n + 1) % keep_every == 0:
+            states[(n + 1) // keep_every] = state
+
+    if keep_every is not None:
+        return t_kept, states
+    return t, state
@@ -0,0 +1,117 @@
+import numpy as np
+from scipy.optimize import brentq
+
+# --- Deteção de eventos com precisão inferior ao passo ---
+# Um evento é uma função g(t, y) que muda de sinal quando acontece algo (ex.: g = y[1] para
+# "a bola toca no chão"). Seguindo a convenção de scipy.integrate.solve_ivp, a função pode ter
+# os atributos:
+#   terminal  (bool) -> parar a integração no primeiro zero;
+#   direction (+1, -1 ou 0) -> só contar zeros em que g passa de - para + (+1), de + para - (-1),
+#                              ou ambos (0).
+# Em cada passo compara-se o sinal de g no início e no fim; se mudou, o zero é localizado
+# (brentq) sobre o interpolador contínuo do passo, em vez de ficar com um erro de ±dt.
+
+
+def event(func, terminal=False, direction=0):
+    """Marca func(t, y) como evento (define os atributos terminal e direction)."""
+    func.terminal = terminal
+    func.direction = direction
+    return func
+
+
+def _crossed(g_old, g_new, direction):
+    if direction > 0:
+        return g_old < 0 <= g_new
+    if direction < 0:
+        return g_old > 0 >= g_new
+    return (g_old < 0 <= g_new) or (g_old > 0 >= g_new)
+
+
+def find_step_events(events, g_old, t_old, t_new, y_new, interpolant):
+    """
+    Procura zeros dos eventos no passo [t_old, t_new]; interpolant(t) devolve o estado nesse intervalo.
+    Devolve (lista de (índice, t_evento, y_evento) por ordem temporal, valores de g em t_new,
+    (t, y) do primeiro evento terminal ou None).
+    """
+    g_new = [g(t_new, y_new) for g in events]
+    found = []
+    for j, g in enumerate(events):
+        if not _crossed(g_old[j], g_new[j], getattr(g, "direction", 0)):
+            continue
+        if g_new[j] == 0:
+            t_ev = t_new
+        else:
+            # Tolerância relativa a t, com um mínimo positivo (brentq exige xtol > 0, mesmo com t_new = 0)
+            xtol = max(4 * np.finfo(float).eps * abs(t_new), np.finfo(float).tiny)
+            t_ev = brentq(lambda tt: g(tt, interpolant(tt)), t_old, t_new, xtol=xtol)
+        found.append((j, t_ev, interpolant(t_ev)))
+    found.sort(key=lambda item: item[1])
+
+    stop = None
+    for i, (j, t_ev, y_ev) in enumerate(found):
+        if getattr(events[j], "terminal", False):
+            stop = (t_ev, y_ev)
+            found = found[:i + 1]
+            break
+    return found, g_new, stop
+
+
+def hermite_interpolant(t0, y0, f0, t1, y1, f1):
+    """Interpolador cúbico de Hermite num passo de um integrador de passo fixo (usa y e dy/dt nos extremos)."""
+    h = t1 - t0
+
+    def interpolant(t):
+        s = (t - t0) / h
+        h00 = (1 + 2 * s) * (1 - s) ** 2
+        h10 = s * (1 - s) ** 2
+        h01 = s * s * (3 - 2 * s)
+        h11 = s * s * (s - 1)
+        return h00 * y0 + h10 * h * f0 + h01 * y1 + h11 * h * f1
+    return interpolant
+
+
+def rk4_events(derivadas, y0, t0, t_final, dt, events):
+    """
+    RK4 de passo fixo com deteção de eventos (interpolação de Hermite em cada passo).
+    Devolve t, y (shape (n, d), até ao evento terminal, se houver), t_events e y_events
+    (um array por evento).
+    """
+    y = np.array(y0, dtype=float)
+    t = float(t0)
+    f = np.asarray(derivadas(t, y), dtype=float)
+    n_steps = int(np.ceil((t_final - t0) / dt - 1e-9))
+
+    t_values = [t]
+    y_values = [y]
+    g_values = [g(t, y) for g in events]
+    t_events = [[] for _ in events]
+    y_events = [[] for _ in events]
+
+    for n in range(n_steps):
+        h = min(dt, t_final - t)
+        k1 = f
+        k2 = derivadas(t + h / 2, y + k1 * h / 2)
+        k3 = derivadas(t + h / 2, y + k2 * h / 2)
+        k4 = derivadas(t + h, y + k3 * h)
+        y_new = y + (k1 + 2 * k2 + 2 * k3 + k4) * h / 6
+        t_new = t0 + (n + 1) * dt if n < n_steps - 1 else t_final
+        f_new = np.asarray(derivadas(t_new, y_new), dtype=float)  # é o k1 do passo seguinte
+
+        interpolant = hermite_interpolant(t, y, f, t_new, y_new, f_new)
+        found, g_values, stop = find_step_events(events, g_values, t, t_new, y_new, interpolant)
+        for j, t_ev, y_ev in found:
+            t_events[j].append(t_ev)
+            y_events[j].append(y_ev)
+
+        t, y, f = t_new, y_new, f_new
+        if stop is not None:
+            t, y = stop
+            t_values.append(t)
+            y_values.append(y)
+            break
+        t_values.append(t)
+        y_values.append(y)
+
+    d = len(y0)
+    return (np.array(t_values), np.array(y_values),
+            [np.array(te) for te in t_events], [np.array(ye).reshape(-1, d) for ye in y_events])
@@ -0,0 +1,78 @@
+import numpy as np
+from scipy.signal import peak_prominences
+
+from .lagrange import intlaginvv, maxminv
+
+# --- Extremos locais (vetorizado) ---
+# Substitui os ciclos "for i in range(1, len(x) - 1): if x[i] > x[i-1] and x[i] > x[i+1]"
+# espalhados pelos scripts. Os máximos/mínimos estritos saem das mudanças de sinal de np.diff(y)
+# e todos os picos são refinados de uma só vez pela parábola que passa pelos 3 pontos
+# (t[i-1], t[i], t[i+1]), com o maxminv vetorizado de msf.lagrange.
+
+
+def _strict_extrema(y):
+    s = np.sign(np.diff(y))
+    is_max = (s[:-1] > 0) & (s[1:] < 0)
+    is_min = (s[:-1] < 0) & (s[1:] > 0)
+    return np.flatnonzero(is_max) + 1, np.flatnonzero(is_min) + 1
+
+
+def find_extrema(t, y, kind="max", prominence=None, refine=True):
+    """
+    Extremos locais de y(t). kind = "max", "min" ou "both".
+    prominence descarta extremos com proeminência (scipy.signal.peak_prominences) menor que o valor dado.
+    Devolve (tempos, valores, períodos); os períodos são as diferenças entre extremos do mesmo tipo.
+    """
+    if kind not in ("max", "min", "both"):
+        raise ValueError(f"kind desconhecido: {kind!r} (usar 'max', 'min' ou 'both')")
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(y) < 3:
+        empty = np.empty(0)
+        return empty, empty, empty
+
+    i_max, i_min = _strict_extrema(y)
+    if prominence is not None:
+        i_max = i_max[peak_prominences(y, i_max)[0] >= prominence]
+        i_min = i_min[peak_prominences(-y, i_min)[0] >= prominence]
+
+    if kind == "max":
+        idx = i_max
+    elif kind == "min":
+        idx = i_min
+    else:
+        idx = np.sort(np.concatenate([i_max, i_min]))
+
+    if refine:
+        t_ext, y_ext = maxminv(t[idx - 1], t[idx], t[idx + 1], y[idx - 1], y[idx], y[idx + 1])
+    else:
+        t_ext, y_ext = t[idx], y[idx]
+
+    if kind == "both":
+        periods = t_ext[2:] - t_ext[:-2]
+    else:
+        periods = np.diff(t_ext)
+    return t_ext, y_ext, periods
+
+
+def find_crossings(t, y, level=0.0, direction=0):
+    """
+    Instantes em que y(t) passa pelo valor level (direction = +1 só a subir, -1 só a descer, 0 ambos).
+    Cada passagem é refinada por interpolação inversa de Lagrange (intlaginvv) com 3 pontos.
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(y) < 3:
+        return np.empty(0)
+    above = y >= level
+    i = np.flatnonzero(above[1:] != above[:-1])
+    if direction > 0:
+        i = i[above[i + 1]]
+    elif direction < 0:
+        i = i[~above[i + 1]]
+    # Tripleto (i-1, i, i+1), ou (i, i+1, i+2) no início da série; inclui sempre o intervalo da passagem
+    j = np.maximum(i, 1)
+    t_cross, _ = intlaginvv(level, t[j - 1], t[j], t[j + 1], y[j - 1], y[j], y[j + 1])
+    # Se a parábola não tem raiz no tripleto (passagem muito abrupta), usa interpolação linear
+    linear = t[i] + (level - y[i]) * (t[i + 1] - t[i]) / (y[i + 1] - y[i])
+    return np.where(np.isnan(t_cross), linear, t_cross)
@@ -0,0 +1,154 @@
+import numpy as np
+
+from .streaming import rk4_step
+
+# --- Balanço harmónico (regime estacionário periódico sem integrar o transiente) ---
+# Em vez de integrar 100-200 s de transiente até o movimento estabilizar, procura-se diretamente
+# uma solução periódica de período T = n*2π/wf (n = 1 harmónica, n = 2, 3 ... sub-harmónicas):
+#     x(t) = soma de c_k exp(i k (2π/T) t),  |k| <= H.
+# Colocação de Fourier: as incógnitas são os valores x_j nos M = 2H+1 instantes t_j = j*T/M.
+# As derivadas saem da FFT (multiplicar o espetro por ik e -k²) e o termo não linear é calculado
+# no domínio do tempo, ponto a ponto: o resíduo é
+#     R_j = x''(t_j) - accel_func(x_j, x'(t_j), t_j)
+# e resolve-se R = 0 pelo método de Newton com a matriz jacobiana
+#     J = D2 - diag(a_x) - diag(a_v) D1,
+# onde D1 e D2 são as matrizes de derivação espetral e a_x, a_v as derivadas parciais da aceleração
+# (por diferenças finitas centradas, por isso accel_func pode ser qualquer função vetorizada).
+# verify_periodic integra a solução no tempo (RK4) para confirmar que é mesmo uma órbita do sistema.
+
+
+class PeriodicSolution:
+    def __init__(self, period, t, x, converged, iterations, residual, subharmonic=1):
+        self.period = period          # período da solução
+        self.subharmonic = subharmonic  # período pedido, em múltiplos do período da força
+        self.t = t                    # instantes de colocação
+        self.x = x                    # x(t) nos instantes de colocação
+        self.converged = converged
+        self.iterations = iterations  # iterações de Newton
+        self.residual = residual      # max |R_j| final
+        self._coefficients = np.fft.fft(x) / len(x)
+        self._k = _wavenumbers(len(x), period)
+
+    def __call__(self, t):
+        """x(t) em instantes quaisquer (soma da série de Fourier)."""
+        t = np.asarray(t, dtype=float)
+        return np.real(np.exp(1j * np.multiply.outer(t, self._k)) @ self._coefficients)
+
+    def velocity(self, t):
+        t = np.asarray(t, dtype=float)
+        return np.real(np.exp(1j * np.multiply.outer(t, self._k)) @ (1j * self._k * self._coefficients))
+
+    @property
+    def v(self):
+        return self.velocity(self.t)
+
+    def harmonics(self):
+        """Amplitudes |x_k| das harmónicas k = 0, 1, ..., H da frequência 2π/T."""
+        H = len(self.x) // 2
+        c = self._coefficients
+        return np.concatenate(([np.abs(c[0])], 2 * np.abs(c[1:H + 1])))
+
+    @property
+    def minimal_subharmonic(self):
+        """
+        Período mínimo em múltiplos do período da força: uma solução procurada com período 2T
+        pode ter só as harmónicas pares e ser, afinal, de período T.
+        """
+        n = self.subharmonic
+        power = np.abs(self._coefficients[1:]) ** 2
+        k = np.abs(np.round(self._k[1:] * self.period / (2 * np.pi))).astype(int)
+        for m in range(1, n + 1):
+            if n % m == 0 and power[k % (n // m) != 0].sum() <= 1e-12 * power.sum():
+                return m
+        return n
+
+    def limits(self, n_samples=2000):
+        """(x_min, x_max) num período, numa grelha fina."""
+        x = self(np.linspace(0.0, self.period, n_samples, endpoint=False))
+        return x.min(), x.max()
+
+    @property
+    def amplitude(self):
+        x_min, x_max = self.limits()
+        return (x_max - x_min) / 2
+
+
+def _wavenumbers(M, period):
+    return 2 * np.pi / period * np.fft.fftfreq(M, 1.0 / M)
+
+
+def _spectral_matrices(M, period):
+    # Matrizes de derivação da colocação de Fourier (M ímpar): D1 x = x'(t_j), D2 x = x''(t_j)
+    k = _wavenumbers(M, period)
+    F = np.fft.fft(np.eye(M), axis=0)
+    D1 = np.real(np.fft.ifft(1j * k[:, None] * F, axis=0))
+    D2 = np.real(np.fft.ifft(-(k ** 2)[:, None] * F, axis=0))
+    return D1, D2
+
+
+def harmonic_balance(accel_func, wf, x_guess, n_harmonics=25, subharmonic=1, tol=1e-10, max_iter=50):
+    """
+    Solução periódica de x'' = accel_func(x, vx, t) com período subharmonic*2π/wf.
+    accel_func tem de aceitar arrays (como as funções dos scripts, que usam np.cos).
+    n_harmonics: número de harmónicas de wf na série (com sub-harmónicas, n_harmonics*subharmonic termos).
+    x_guess: estimativa inicial, um número A (x = A cos(wf t)), uma função x(t) ou um array com
+    os valores nos 2*n_harmonics*subharmonic + 1 instantes de colocação.
+    Devolve uma PeriodicSolution.
+    """
+    period = subharmonic * 2 * np.pi / wf
+    M = 2 * n_harmonics * subharmonic + 1
+    t = period * np.arange(M) / M
+    if callable(x_guess):
+        x = np.asarray(x_guess(t), dtype=float)
+    elif np.ndim(x_guess) == 0:
+        x = x_guess * np.cos(wf * t)
+    else:
+        x = np.array(x_guess, dtype=float)
+    D1, D2 = _spectral_matrices(M, period)
+
+    def residual(x):
+        v = D1 @ x
+        return D2 @ x - accel_func(x, v, t), v
+
+    R, v = residual(x)
+    norm = np.max(np.abs(R))
+    iterations = 0
+    while norm > tol and iterations < max_iter:
+        iterations += 1
+        hx = 1e-6 * (1 + np.abs(x))
+        hv = 1e-6 * (1 + np.abs(v))
+        a_x = (accel_func(x + hx, v, t) - accel_func(x - hx, v, t)) / (2 * hx)
+        a_v = (accel_func(x, v + hv, t) - accel_func(x, v - hv, t)) / (2 * hv)
+        J = D2 - np.diag(a_x) - a_v[:, None] * D1
+        dx = np.linalg.solve(J, -R)
+        # Newton amortecido: divide o passo ao meio enquanto o resíduo não diminuir
+        step = 1.0
+        while step > 1e-4:
+            x_new = x + step * dx
+            R_new, v_new = residual(x_new)
+            norm_new = np.max(np.abs(R_new))
+            if norm_new < norm:
+                break
+            step /= 2
+        else:
+            # Nenhum passo reduz o resíduo: pára sem atualizar x (a solução fica com converged=False)
+            break
+        x, R, v, norm = x_new, R_new, v_new, norm_new
+    return PeriodicSolution(period, t, x, norm <= tol, iterations, norm, subharmonic)
+
+
+def verify_periodic(accel_func, solution, dt=0.01, n_periods=1):
+    """
+    Verificação no tempo: integra (RK4) a partir de (x(0), v(0)) da solução durante n_periods
+    períodos e devolve o maior desvio |x_RK4(t) - x(t)|. Um desvio pequeno confirma a órbita
+    (e, com muitos períodos, que é estável).
+    """
+    n_steps = max(1, int(round(solution.period / dt)))
+    dt = solution.period / n_steps
+    x, vx = float(solution(0.0)), float(solution.velocity(0.0))
+    t_all = dt * np.arange(1, n_periods * n_steps + 1)
+    x_num = np.empty(len(t_all))
+    for n in range(len(t_all)):
+        x, vx = rk4_step(x, vx, n * dt, dt, accel_func)
+        x_num[n] = x
+    return np.max(np.abs(x_num - solution(t_all)))
@@ -0,0 +1,165 @@
+import numpy as np
+
+# --- Kernels compilados (opcionais) para os ciclos mais pesados ---
+# Se o numba estiver instalado, os kernels são compilados com njit(cache=True): a compilação
+# fica guardada em __pycache__ e as execuções seguintes carregam o código máquina do disco.
+# Sem numba, os mesmos nomes apontam para versões em Python/NumPy puro (o ciclo da cadeia de
+# esferas é vetorizado em NumPy). A API é a mesma nos dois casos; BACKEND diz qual está ativo.
+
+try:
+    from numba import njit
+    BACKEND = "numba"
+except ImportError:
+    njit = None
+    BACKEND = "numpy"
+
+
+def _jit(func):
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+# --- Sistema de Lorenz (Cap 5/23) ---
+
+def _lorenz_rk4(x0, y0, z0, dt, n_steps, sigma, r, b):
+    out = np.empty((n_steps + 1, 3))
+    x, y, z = x0, y0, z0
+    out[0, 0] = x
+    out[0, 1] = y
+    out[0, 2] = z
+    for n in range(n_steps):
+        k1_x = sigma * (y - x)
+        k1_y = r * x - y - x * z
+        k1_z = x * y - b * z
+
+        x2 = x + k1_x * dt / 2
+        y2 = y + k1_y * dt / 2
+        z2 = z + k1_z * dt / 2
+        k2_x = sigma * (y2 - x2)
+        k2_y = r * x2 - y2 - x2 * z2
+        k2_z = x2 * y2 - b * z2
+
+        x3 = x + k2_x * dt / 2
+        y3 = y + k2_y * dt / 2
+        z3 = z + k2_z * dt / 2
+        k3_x = sigma * (y3 - x3)
+        k3_y = r * x3 - y3 - x3 * z3
+        k3_z = x3 * y3 - b * z3
+
+        x4 = x + k3_x * dt
+        y4 = y + k3_y * dt
+        z4 = z + k3_z * dt
+        k4_x = sigma * (y4 - x4)
+        k4_y = r * x4 - y4 - x4 * z4
+        k4_z = x4 * y4 - b * z4
+
+        x = x + (k1_x + 2 * k2_x + 2 * k3_x + k4_x) * dt / 6
+        y = y + (k1_y + 2 * k2_y + 2 * k3_y + k4_y) * dt / 6
+        z = z + (k1_z + 2 * k2_z + 2 * k3_z + k4_z) * dt / 6
+        out[n + 1, 0] = x
+        out[n + 1, 1] = y
+        out[n + 1, 2] = z
+    return out
+
+
+_lorenz_rk4_kernel = _jit(_lorenz_rk4)
+
+
+def lorenz_rk4(x0, y0, z0, dt, n_steps, sigma=10.0, r=28.0, b=8.0 / 3.0):
+    """Trajetória RK4 do sistema de Lorenz. Devolve (t, x, y, z) com n_steps + 1 pontos."""
+    n_steps = int(n_steps)
+    out = _lorenz_rk4_kernel(float(x0), float(y0), float(z0), float(dt), n_steps,
+                             float(sigma), float(r), float(b))
+    t = dt * np.arange(n_steps + 1)
+    return t, out[:, 0], out[:, 1], out[:, 2]
+
+
+# --- Ciclista com potência constante numa subida (Cap 4/17) ---
+
+def _cyclist_euler_cromer(v0, dt, n_steps, P, m, k, g_sin_theta):
+    v = np.empty(n_steps + 1)
+    x = np.empty(n_steps + 1)
+    v[0] = v0
+    x[0] = 0.0
+    vi, xi = v0, 0.0
+    for i in range(n_steps):
+        if vi <= 0:
+            a = 0.0
+        else:
+            a = P / (m * vi) - (k / m) * vi ** 2 - g_sin_theta
+        vi = vi + a * dt
+        xi = xi + vi * dt
+        v[i + 1] = vi
+        x[i + 1] = xi
+    return v, x
+
+
+_cyclist_euler_cromer_kernel = _jit(_cyclist_euler_cromer)
+
+
+def cyclist_euler_cromer(v0, dt, n_steps, P, m, k, g, theta):
+    """Euler-Cromer do ciclista (potência P, resistência k*v², inclinação theta em rad). Devolve (t, v, x)."""
+    n_steps = int(n_steps)
+    v, x = _cyclist_euler_cromer_kernel(float(v0), float(dt), n_steps, float(P), float(m), float(k),
+                                        float(g * np.sin(theta)))
+    t = dt * np.arange(n_steps + 1)
+    return t, v, x
+
+
+# --- Cadeia de esferas suspensas com força de contato (aulas/aula09) ---
+# A esfera i está pendurada em x_eq = d*i; duas esferas vizinhas repelem-se com
+# k*|Δx - d|^q / m quando a distância entre centros é menor que o diâmetro d.
+
+def _contact_chain_loop(x0, v0, dt, n_steps, k, q, m, g, l, d):
+    N = x0.shape[0]
+    x = np.empty((N, n_steps + 1))
+    v = np.empty((N, n_steps + 1))
+    x[:, 0] = x0
+    v[:, 0] = v0
+    a = np.empty(N)
+    for n in range(n_steps):
+        for i in range(N):
+            a[i] = -g * (x[i, n] - d * i) / l
+        for i in range(N - 1):
+            dx = x[i + 1, n] - x[i, n]
+            if dx < d:
+                f = k * abs(dx - d) ** q / m
+                a[i] -= f
+                a[i + 1] += f
+        for i in range(N):
+            v[i, n + 1] = v[i, n] + a[i] * dt
+            x[i, n + 1] = x[i, n] + v[i, n + 1] * dt
+    return x, v
+
+
+def _contact_chain_numpy(x0, v0, dt, n_steps, k, q, m, g, l, d):
+    N = x0.shape[0]
+    x = np.empty((N, n_steps + 1))
+    v = np.empty((N, n_steps + 1))
+    x[:, 0] = x0
+    v[:, 0] = v0
+    x_eq = d * np.arange(N)
+    for n in range(n_steps):
+        a = -g * (x[:, n] - x_eq) / l
+        dx = np.diff(x[:, n])
+        f = np.where(dx < d, k * np.abs(dx - d) ** q / m, 0.0)
+        a[:-1] -= f
+        a[1:] += f
+        v[:, n + 1] = v[:, n] + a * dt
+        x[:, n + 1] = x[:, n] + v[:, n + 1] * dt
+    return x, v
+
+
+_contact_chain_kernel = _jit(_contact_chain_loop) if njit is not None else _contact_chain_numpy
+
+
+def contact_chain_euler_cromer(x0, v0, dt, n_steps, k, q, m, g, l, d):
+    """Euler-Cromer da cadeia de N esferas com contato. Devolve (t, x, v) com x, v de shape (N, n_steps + 1)."""
+    n_steps = int(n_steps)
+    x0 = np.asarray(x0, dtype=float)
+    v0 = np.broadcast_to(np.asarray(v0, dtype=float), x0.shape).copy()
+    x, v = _contact_chain_kernel(x0, v0, float(dt), n_steps, float(k), float(q), float(m),
+                                 float(g), float(l), float(d))
+    t = dt * np.arange(n_steps + 1)
+    return t, x, v
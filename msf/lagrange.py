@@ -0,0 +1,66 @@
+import numpy as np
+
+# --- Interpolação de Lagrange com 3 pontos (versões vetorizadas) ---
+# Mesmos nomes e argumentos das funções das aulas (aulas/aula10): intlagv, intlaginvv e maxminv
+# recebem os tripletos (xm1, xm2, xm3), (ym1, ym2, ym3), mas aqui cada argumento pode ser um
+# escalar ou um array, e tudo é feito com broadcasting, sem ciclos em Python.
+# O polinómio é escrito em torno do ponto central, y = ym2 + b*s + a*s² com s = x - xm2,
+# o que evita a perda de precisão da forma de Lagrange quando x é grande comparado com dt.
+# Tripletos degenerados (pontos colineares ou abcissas repetidas) não lançam exceções:
+# maxminv devolve o ponto central e as restantes funções devolvem nan onde não há solução.
+
+
+def _coefficients(xm1, xm2, xm3, ym1, ym2, ym3):
+    h0 = np.asarray(xm1, dtype=float) - xm2
+    h2 = np.asarray(xm3, dtype=float) - xm2
+    d0 = np.asarray(ym1, dtype=float) - ym2
+    d2 = np.asarray(ym3, dtype=float) - ym2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (d0 * h2 - d2 * h0) / (h0 * h2 * (h0 - h2))
+        b = (d0 - a * h0 ** 2) / h0
+    return a, b
+
+
+def _scalar(*arrays):
+    return tuple(a[()] for a in arrays)
+
+
+def intlagv(xinp, xm1, xm2, xm3, ym1, ym2, ym3):
+    """Valor em xinp do polinómio de grau 2 que passa pelos 3 pontos. Devolve (xinp, yout)."""
+    a, b = _coefficients(xm1, xm2, xm3, ym1, ym2, ym3)
+    s = np.asarray(xinp, dtype=float) - xm2
+    yout = ym2 + (b + a * s) * s
+    return _scalar(np.asarray(xinp, dtype=float), np.asarray(yout, dtype=float))
+
+
+def intlaginvv(yinp, xm1, xm2, xm3, ym1, ym2, ym3):
+    """
+    Interpolação inversa: x onde o polinómio de grau 2 pelos 3 pontos vale yinp,
+    escolhendo a raiz dentro do intervalo [xm1, xm3]. Devolve (xout, yout).
+    """
+    a, b = _coefficients(xm1, xm2, xm3, ym1, ym2, ym3)
+    c = np.asarray(ym2, dtype=float) - yinp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Fórmula resolvente na forma estável; com a = 0 (pontos colineares) r2 é a raiz da reta
+        q = -0.5 * (b + np.where(b >= 0, 1.0, -1.0) * np.sqrt(b * b - 4 * a * c))
+        r1 = q / a
+        r2 = c / q
+    lo = np.minimum(xm1, xm3) - np.asarray(xm2, dtype=float)
+    hi = np.maximum(xm1, xm3) - np.asarray(xm2, dtype=float)
+    r1_inside = (r1 >= lo) & (r1 <= hi)
+    r2_inside = (r2 >= lo) & (r2 <= hi)
+    s = np.where(r2_inside, r2, np.where(r1_inside, r1, np.nan))
+    xout = xm2 + s
+    yout = ym2 + (b + a * s) * s
+    return _scalar(np.asarray(xout, dtype=float), np.asarray(yout, dtype=float))
+
+
+def maxminv(xm1, xm2, xm3, ym1, ym2, ym3):
+    """Máximo ou mínimo (vértice) do polinómio de grau 2 que passa pelos 3 pontos. Devolve (xm, ymax)."""
+    a, b = _coefficients(xm1, xm2, xm3, ym1, ym2, ym3)
+    curved = np.isfinite(a) & (a != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(curved, -b / (2 * a), 0.0)
+        ymax = np.where(curved, ym2 - b ** 2 / (4 * a), ym2)
+    xm = xm2 + s
+    return _scalar(np.asarray(xm, dtype=float), np.asarray(ymax, dtype=float))
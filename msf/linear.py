@@ -0,0 +1,86 @@
+import numpy as np
+from scipy.linalg import expm
+
+# --- Propagador exato para osciladores lineares ---
+# Para sistemas lineares dy/dt = A y + f cos(wf t) a solução é conhecida exatamente:
+#   y(t) = y_p(t) + expm(A (t - t0)) (y(t0) - y_p(t0)),
+# onde y_p(t) = c cos(wf t) + s sin(wf t) é a solução particular (regime estacionário).
+# expm(A Δt) é calculada uma única vez; cada amostra de saída custa um produto matriz-vetor
+# e não há erro de discretização, seja qual for Δt.
+
+
+def forced_damped_matrix(k, m, b):
+    """Matriz A do oscilador forçado e amortecido (Cap 5/18, 5/19), estado y = [x, vx]."""
+    return np.array([[0.0, 1.0],
+                     [-k / m, -b / m]])
+
+
+def coupled_oscillators_matrix(k, kp, m):
+    """Matriz A dos osciladores acoplados (Cap 6/7), estado y = [u_A, u_B, v_A, v_B] (desvios)."""
+    return np.array([[0.0, 0.0, 1.0, 0.0],
+                     [0.0, 0.0, 0.0, 1.0],
+                     [-(k + kp) / m, kp / m, 0.0, 0.0],
+                     [kp / m, -(k + kp) / m, 0.0, 0.0]])
+
+
+class LinearPropagator:
+    def __init__(self, A, dt, forcing=None, wf=0.0):
+        """
+        A: matriz do sistema (d, d); dt: intervalo entre amostras de saída.
+        forcing: vetor f da força f*cos(wf*t) (None para sistemas livres).
+        """
+        self.A = np.asarray(A, dtype=float)
+        self.dt = dt
+        self.wf = wf
+        self.step_matrix = expm(self.A * dt)
+
+        d = self.A.shape[0]
+        self._c = np.zeros(d)
+        self._s = np.zeros(d)
+        if forcing is not None:
+            # Substituindo y_p = c cos + s sin na equação:
+            #   A c - wf s = -f   e   wf c + A s = 0
+            # (sistema singular apenas em ressonância sem amortecimento)
+            identity = np.eye(d)
+            M = np.block([[self.A, -wf * identity],
+                          [wf * identity, self.A]])
+            rhs = np.concatenate((-np.asarray(forcing, dtype=float), np.zeros(d)))
+            cs = np.linalg.solve(M, rhs)
+            self._c = cs[:d]
+            self._s = cs[d:]
+
+    def particular(self, t):
+        """Solução particular y_p(t); t escalar ou array (devolve shape (d,) ou (len(t), d))."""
+        t = np.asarray(t, dtype=float)
+        return np.multiply.outer(np.cos(self.wf * t), self._c) + np.multiply.outer(np.sin(self.wf * t), self._s)
+
+    def step(self, y, t):
+        """Avança o estado y de t para t + dt (exatamente)."""
+        return self.particular(t + self.dt) + self.step_matrix @ (y - self.particular(t))
+
+    def propagate(self, y0, n_steps, t0=0.0):
+        """Devolve os instantes t0 + n*dt (n = 0..n_steps) e os estados (n_steps+1, d)."""
+        t = t0 + self.dt * np.arange(n_steps + 1)
+        y_p = self.particular(t)
+        # A parte homogénea z = y - y_p evolui apenas com a matriz expm(A dt)
+        z = np.empty((n_steps + 1, self.A.shape[0]))
+        z[0] = np.asarray(y0, dtype=float) - y_p[0]
+        M = self.step_matrix
+        for n in range(n_steps):
+            z[n + 1] = M @ z[n]
+        return t, z + y_p
+
+
+def simulate_forced_damped_exact(x0, vx0, dt, t_total, k, m, b, F0, wf):
+    """Equivalente exato de simulate_oscillator_forced: devolve t, x, vx em instantes n*dt."""
+    propagator = LinearPropagator(forced_damped_matrix(k, m, b), dt, forcing=[0.0, F0 / m], wf=wf)
+    t, y = propagator.propagate([x0, vx0], int(round(t_total / dt)))
+    return t, y[:, 0], y[:, 1]
+
+
+def simulate_coupled_exact(x_A0, x_B0, v_Ax0, v_Bx0, dt, t_total, k, kp, m, x_Aeq, x_Beq):
+    """Equivalente exato de simulate_coupled_oscillators: devolve t, x_A, x_B (posições absolutas)."""
+    propagator = LinearPropagator(coupled_oscillators_matrix(k, kp, m), dt)
+    y0 = [x_A0 - x_Aeq, x_B0 - x_Beq, v_Ax0, v_Bx0]
+    t, y = propagator.propagate(y0, int(round(t_total / dt)))
+    return t, y[:, 0] + x_Aeq, y[:, 1] + x_Beq
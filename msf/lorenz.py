@@ -0,0 +1,336 @@
+import numpy as np
+
+from .lagrange import maxminv
+
+# --- Ensemble de trajetórias de Lorenz ---
+# (dx/dt, dy/dt, dz/dt) = (sigma*(y - x), r*x - y - x*z, x*y - b*z)
+# Em vez de uma trajetória com escalares Python, integram-se N trajetórias (10⁵-10⁶) de uma só vez:
+# o estado é um array (N, 3) e cada passo RK4 são umas dezenas de operações sobre arrays, feitas
+# em buffers pré-alocados (internamente o estado é guardado como (3, N), com cada coordenada contígua).
+# Nada é guardado por passo: observadores recebem o estado à medida que a integração avança e
+# acumulam o que interessa com memória fixa:
+#   - OccupancyHistogram: histograma 3D da ocupação do atrator (densidade invariante), com bincount;
+#   - EnsembleMoments: média e variância de x, y, z (no ensemble e no tempo) e a média do ensemble
+#     em cada amostra;
+#   - EnsembleAutocorrelation: autocorrelação C(τ) = corr(u(t0), u(t0 + τ)) calculada sobre o
+#     ensemble a partir de um instante de referência t0 (com o ensemble já no atrator, o regime é
+#     estacionário e isto é a autocorrelação temporal), guardando só u(t0);
+#   - ZMaxima: máximos sucessivos de z de cada trajetória, refinados pela parábola dos 3 pontos.
+# Como sigma, r e b podem ser arrays, um varrimento de parâmetros é um único ensemble
+# (lorenz_sweep): os máximos de z dão o mapa de Lorenz z_{n+1}(z_n) e o diagrama de bifurcação
+# em r, e o resultado pode ser guardado num ficheiro .npz comprimido para voltar a desenhar.
+
+
+class OccupancyHistogram:
+    """Contagem das amostras em bins x bins x bins caixas (memória: bins³ inteiros)."""
+
+    def __init__(self, bins=64, bounds=((-25.0, 25.0), (-30.0, 30.0), (0.0, 55.0))):
+        self.bins = bins
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.counts = np.zeros(bins ** 3, dtype=np.int64)
+        self.outside = 0  # amostras fora de bounds
+
+    @property
+    def edges(self):
+        return [np.linspace(lo, hi, self.bins + 1) for lo, hi in self.bounds]
+
+    def update(self, t, state):
+        index = np.zeros(len(state), dtype=np.int64)
+        inside = np.ones(len(state), dtype=bool)
+        for c, (lo, hi) in enumerate(self.bounds):
+            i = np.floor((state[:, c] - lo) * (self.bins / (hi - lo))).astype(np.int64)
+            inside &= (i >= 0) & (i < self.bins)
+            index = index * self.bins + i
+        self.counts += np.bincount(index[inside], minlength=self.bins ** 3)
+        self.outside += int(np.count_nonzero(~inside))
+
+    def density(self):
+        """Densidade de probabilidade em cada caixa, shape (bins, bins, bins)."""
+        volume = np.prod((self.bounds[:, 1] - self.bounds[:, 0]) / self.bins)
+        total = self.counts.sum() + self.outside
+        return self.counts.reshape((self.bins,) * 3) / (max(total, 1) * volume)
+
+    def projection(self, axis):
+        """Contagens somadas ao longo de um eixo (0 = x, 1 = y, 2 = z), ex.: axis=1 para o plano (x, z)."""
+        return self.counts.reshape((self.bins,) * 3).sum(axis=axis)
+
+
+class EnsembleMoments:
+    """Média e variância de cada coordenada, acumuladas sobre todas as trajetórias e amostras."""
+
+    def __init__(self):
+        self.n = 0
+        self.t = []             # instantes das amostras
+        self.mean_history = []  # média do ensemble em cada amostra, (x, y, z)
+        self._shift = None      # somas em relação à primeira média (evita cancelamento)
+        self._sum = np.zeros(3)
+        self._sum2 = np.zeros(3)
+
+    def update(self, t, state):
+        if self._shift is None:
+            self._shift = state.mean(axis=0)
+        u = state - self._shift
+        self.n += len(state)
+        self._sum += u.sum(axis=0)
+        self._sum2 += np.einsum("ij,ij->j", u, u)
+        self.t.append(t)
+        self.mean_history.append(state.mean(axis=0))
+
+    @property
+    def mean(self):
+        return self._shift + self._sum / self.n
+
+    @property
+    def variance(self):
+        m = self._sum / self.n
+        return self._sum2 / self.n - m ** 2
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class EnsembleAutocorrelation:
+    """C(τ) de uma coordenada (0 = x, 1 = y, 2 = z) para τ = 0, 1, ..., max_lag amostras."""
+
+    def __init__(self, component=0, max_lag=500):
+        self.component = component
+        self.max_lag = max_lag
+        self.lags = []  # τ (tempo desde a referência)
+        self.C = []     # autocorrelação normalizada, C(0) = 1
+        self._u0 = None
+        self._t0 = None
+
+    def update(self, t, state):
+        if len(self.C) > self.max_lag:
+            return
+        u = state[:, self.component]
+        if self._u0 is None:
+            self._t0 = t
+            self._u0 = (u - u.mean()) / u.std()
+        self.lags.append(t - self._t0)
+        self.C.append(np.mean(self._u0 * (u - u.mean())) / u.std())
+
+    def correlation_time(self):
+        """Primeiro τ em que C(τ) desce abaixo de 1/e (nan se ainda não desceu)."""
+        below = np.flatnonzero(np.asarray(self.C) < 1 / np.e)
+        return self.lags[below[0]] if below.size else np.nan
+
+
+class ZMaxima:
+    """
+    Máximos locais de uma coordenada (2 = z) de cada trajetória, detetados a cada amostra
+    (usar sample_every=1) e refinados com a parábola pelas 3 últimas amostras (maxminv).
+    Guarda só as 2 amostras anteriores e os máximos encontrados.
+    """
+
+    def __init__(self, component=2):
+        self.component = component
+        self._t_prev = []
+        self._u_prev = []
+        self._index = []
+        self._times = []
+        self._values = []
+
+    def update(self, t, state):
+        u = state[:, self.component].copy()
+        if len(self._u_prev) == 2:
+            (t1, t2), (u1, u2) = self._t_prev, self._u_prev
+            i = np.flatnonzero((u2 > u1) & (u2 >= u))
+            if i.size:
+                t_max, u_max = maxminv(t1, t2, t, u1[i], u2[i], u[i])
+                self._index.append(i)
+                self._times.append(np.broadcast_to(np.atleast_1d(t_max), i.shape))
+                self._values.append(np.atleast_1d(u_max))
+        self._t_prev = (self._t_prev + [t])[-2:]
+        self._u_prev = (self._u_prev + [u])[-2:]
+
+    @property
+    def index(self):
+        """Trajetória de cada máximo, pela ordem em que foram encontrados."""
+        return np.concatenate(self._index) if self._index else np.zeros(0, dtype=np.intp)
+
+    @property
+    def times(self):
+        return np.concatenate(self._times) if self._times else np.zeros(0)
+
+    @property
+    def values(self):
+        return np.concatenate(self._values) if self._values else np.zeros(0)
+
+
+class LorenzEnsemble:
+    """
+    N trajetórias de Lorenz integradas juntas (RK4 de passo fixo).
+    state: condições iniciais, shape (N, 3); sigma, r, b: escalares ou arrays de shape (N,).
+    """
+
+    def __init__(self, state, sigma=10.0, r=28.0, b=8.0 / 3.0):
+        self._y = np.ascontiguousarray(np.asarray(state, dtype=float).reshape(-1, 3).T)
+        self.sigma = sigma
+        self.r = r
+        self.b = b
+        self.t = 0.0
+        N = self._y.shape[1]
+        self._k = [np.empty((3, N)) for _ in range(4)]
+        self._tmp = np.empty((3, N))
+
+    @property
+    def state(self):
+        """Estado atual, shape (N, 3) (vista, não uma cópia)."""
+        return self._y.T
+
+    def __len__(self):
+        return self._y.shape[1]
+
+    def _derivatives(self, y, out):
+        x, yy, z = y
+        np.subtract(yy, x, out=out[0])
+        out[0] *= self.sigma
+        np.multiply(self.r, x, out=out[1])
+        out[1] -= yy
+        out[1] -= x * z
+        np.multiply(x, yy, out=out[2])
+        out[2] -= self.b * z
+
+    def step(self, dt):
+        """Um passo RK4 de todas as trajetórias."""
+        self._step(dt)
+        self.t += dt
+
+    def _step(self, dt):
+        y, tmp = self._y, self._tmp
+        k1, k2, k3, k4 = self._k
+        self._derivatives(y, k1)
+        np.multiply(k1, dt / 2, out=tmp)
+        tmp += y
+        self._derivatives(tmp, k2)
+        np.multiply(k2, dt / 2, out=tmp)
+        tmp += y
+        self._derivatives(tmp, k3)
+        np.multiply(k3, dt, out=tmp)
+        tmp += y
+        self._derivatives(tmp, k4)
+        k2 += k3
+        k2 *= 2
+        k1 += k2
+        k1 += k4
+        k1 *= dt / 6
+        y += k1
+
+    def run(self, dt, n_steps, observers=(), sample_every=1):
+        """
+        Avança n_steps passos; de sample_every em sample_every passos (e no início) chama
+        observer.update(t, estado) de cada observador. Devolve os observadores.
+        """
+        # O instante é sempre t_start + n*dt (sem acumular erro de arredondamento, como em TimeGrid)
+        t_start = self.t
+        for observer in observers:
+            observer.update(self.t, self.state)
+        for n in range(1, n_steps + 1):
+            self._step(dt)
+            self.t = t_start + n * dt
+            if observers and n % sample_every == 0:
+                for observer in observers:
+                    observer.update(self.t, self.state)
+        return observers
+
+
+class LorenzSweep:
+    def __init__(self, sigma, r, b, index, t, z_max, dt, t_transient, t_total, state0=None):
+        self.sigma = sigma              # parâmetros de cada trajetória, shape (N,)
+        self.r = r
+        self.b = b
+        self.state0 = state0            # condições iniciais, shape (N, 3)
+        self.index = index              # trajetória de cada máximo de z (ordenado por trajetória e tempo)
+        self.t = t                      # instante de cada máximo
+        self.z_max = z_max              # valor de cada máximo
+        self.dt = dt
+        self.t_transient = t_transient  # os máximos contam a partir daqui
+        self.t_total = t_total
+
+    def __len__(self):
+        return len(self.r)
+
+    def maxima(self, i):
+        """Máximos sucessivos de z da trajetória i."""
+        return self.z_max[self.index == i]
+
+    def return_map(self, i=None):
+        """
+        Pares (z_n, z_{n+1}) de máximos sucessivos (mapa de Lorenz), da trajetória i ou de todas.
+        """
+        same = self.index[1:] == self.index[:-1]
+        if i is not None:
+            same &= self.index[1:] == i
+        return self.z_max[:-1][same], self.z_max[1:][same]
+
+    def bifurcation(self, param="r"):
+        """Pontos (valor do parâmetro, máximo de z) do diagrama de bifurcação."""
+        return getattr(self, param)[self.index], self.z_max
+
+    def matches(self, r=28.0, sigma=10.0, b=8.0 / 3.0, state0=(0.0, 1.0, 0.0), dt=0.01, t_transient=50.0,
+                t_total=150.0):
+        """
+        True se o varrimento foi calculado com estes argumentos de lorenz_sweep (os mesmos valores por
+        omissão). Serve para validar um varrimento lido de um ficheiro antes de o reaproveitar.
+        """
+        if (self.dt, self.t_transient, self.t_total) != (float(dt), float(t_transient), float(t_total)):
+            return False
+        r, sigma, b = (np.atleast_1d(np.asarray(p, dtype=float)) for p in (r, sigma, b))
+        state0 = np.asarray(state0, dtype=float).reshape(-1, 3)
+        try:
+            N = np.broadcast_shapes(r.shape, sigma.shape, b.shape, state0[:, 0].shape)[0]
+        except ValueError:
+            return False
+        if N != len(self) or self.state0 is None:
+            return False
+        return (np.array_equal(np.broadcast_to(r, (N,)), self.r)
+                and np.array_equal(np.broadcast_to(sigma, (N,)), self.sigma)
+                and np.array_equal(np.broadcast_to(b, (N,)), self.b)
+                and np.array_equal(np.broadcast_to(state0, (N, 3)), self.state0))
+
+    def save(self, path):
+        """Guarda o varrimento num ficheiro .npz comprimido (ler com load_lorenz_sweep)."""
+        extra = {} if self.state0 is None else {"state0": self.state0}
+        np.savez_compressed(path, sigma=self.sigma, r=self.r, b=self.b, index=self.index, t=self.t,
+                            z_max=self.z_max, dt=self.dt, t_transient=self.t_transient, t_total=self.t_total,
+                            **extra)
+
+
+def load_lorenz_sweep(path):
+    with np.load(path, allow_pickle=False) as data:
+        # Ficheiros antigos não guardam state0: matches() devolve False e o varrimento é recalculado
+        state0 = data["state0"] if "state0" in data.files else None
+        return LorenzSweep(data["sigma"], data["r"], data["b"], data["index"], data["t"], data["z_max"],
+                           float(data["dt"]), float(data["t_transient"]), float(data["t_total"]), state0)
+
+
+def lorenz_sweep(r=28.0, sigma=10.0, b=8.0 / 3.0, state0=(0.0, 1.0, 0.0), dt=0.01, t_transient=50.0,
+                 t_total=150.0):
+    """
+    Varrimento de parâmetros num só ensemble: r, sigma, b e state0 (shape (3,) ou (N, 3)) são
+    combinados por broadcasting, uma trajetória por combinação. Os máximos de z entre t_transient
+    e t_total são detetados durante a integração.
+    Devolve um LorenzSweep.
+    """
+    r, sigma, b = (np.atleast_1d(np.asarray(p, dtype=float)) for p in (r, sigma, b))
+    state0 = np.asarray(state0, dtype=float).reshape(-1, 3)
+    N = np.broadcast_shapes(r.shape, sigma.shape, b.shape, state0[:, 0].shape)[0]
+    r, sigma, b = (np.broadcast_to(p, (N,)).copy() for p in (r, sigma, b))
+    state0 = np.broadcast_to(state0, (N, 3)).copy()
+    ensemble = LorenzEnsemble(state0, sigma, r, b)
+
+    ensemble.run(dt, int(round(t_transient / dt)))
+    maxima = ZMaxima()
+    ensemble.run(dt, int(round((t_total - t_transient) / dt)), (maxima,))
+    index = maxima.index
+    order = np.argsort(index, kind="stable")  # por trajetória, mantendo a ordem temporal
+    return LorenzSweep(sigma, r, b, index[order], maxima.times[order], maxima.values[order],
+                       float(dt), float(t_transient), float(t_total), state0)
+
+
+def random_initial_states(N, center=(0.0, 1.0, 0.0), spread=1.0, seed=None):
+    """N condições iniciais espalhadas (distribuição normal) em volta de center, shape (N, 3)."""
+    rng = np.random.default_rng(seed)
+    return np.asarray(center, dtype=float) + spread * rng.standard_normal((N, 3))
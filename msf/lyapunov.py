@@ -0,0 +1,187 @@
+import os
+
+import numpy as np
+
+from .parallel import make_executor
+
+# --- Expoentes de Lyapunov (método de Benettin) ---
+# Sobrepor duas trajetórias com x0 = 1.0 e x0 = 1.0001 mostra que há caos, mas não o mede.
+# O expoente de Lyapunov máximo λ1 é a taxa média de crescimento exponencial de uma perturbação
+# infinitesimal: |δy(t)| ~ |δy(0)| exp(λ1 t). Integra-se, junto com o estado, um conjunto de k
+# vetores tangentes V pela equação linearizada
+#     V' = J(t, y) V,    J = ∂f/∂y
+# (J V por diferenças finitas de derivadas, ou pela matriz jacobiana se for dada).
+# Para os vetores não crescerem sem limite nem colapsarem todos na direção mais instável, de
+# renorm_every em renorm_every passos faz-se a decomposição QR, V = Q R: V passa a Q e soma-se
+# log|R_ii|. Os expoentes λ1 >= λ2 >= ... >= λk são essas somas a dividir pelo tempo.
+# Tudo é vetorizado sobre N trajetórias (estado de shape (d, N), como em frequency_sweep), que
+# podem ter condições iniciais ou parâmetros diferentes (args com arrays de shape (N,)).
+# A convergência é estimada em simultâneo: a média é dividida em blocos (pontos de controlo) e o
+# erro padrão da média dos blocos indica quanto o valor ainda pode mudar.
+
+
+class LyapunovResult:
+    def __init__(self, exponents, t, checkpoints, log_sums):
+        self.exponents = exponents      # λ1 >= ... >= λk, shape (k,) ou (k, N)
+        self.t = t                      # tempo de média (depois do transiente)
+        self.checkpoints = checkpoints  # instantes dos pontos de controlo, shape (n,)
+        self.log_sums = log_sums        # soma de log|R_ii| em cada ponto de controlo, shape (n, k) ou (n, k, N)
+
+    @property
+    def max_exponent(self):
+        return self.exponents[0]
+
+    @property
+    def history(self):
+        """Estimativa dos expoentes em cada ponto de controlo (convergência)."""
+        t = self.checkpoints.reshape((-1,) + (1,) * (self.log_sums.ndim - 1))
+        return self.log_sums / t
+
+    @property
+    def stderr(self):
+        """Erro padrão dos expoentes, a partir das estimativas em blocos entre pontos de controlo."""
+        t = np.concatenate(([0.0], self.checkpoints))
+        sums = np.concatenate((np.zeros_like(self.log_sums[:1]), self.log_sums))
+        blocks = np.diff(sums, axis=0) / np.diff(t).reshape((-1,) + (1,) * (sums.ndim - 1))
+        n = len(blocks)
+        return np.std(blocks, axis=0, ddof=1) / np.sqrt(n) if n > 1 else np.full_like(self.exponents, np.inf)
+
+    def converged(self, atol=1e-2):
+        return self.stderr <= atol
+
+    @property
+    def kaplan_yorke_dimension(self):
+        """Dimensão de Kaplan-Yorke j + (λ1 + ... + λj) / |λ(j+1)| (precisa do espetro completo)."""
+        lam = self.exponents.reshape(len(self.exponents), -1)
+        cumulative = np.cumsum(lam, axis=0)
+        j = np.sum(cumulative >= 0, axis=0)
+        dimension = np.empty(lam.shape[1])
+        for n, jn in enumerate(j):
+            if jn == 0:
+                dimension[n] = 0.0
+            elif jn == len(lam):
+                dimension[n] = float(len(lam))
+            else:
+                dimension[n] = jn + cumulative[jn - 1, n] / abs(lam[jn, n])
+        return dimension.reshape(self.exponents.shape[1:]) if self.exponents.ndim > 1 else dimension[0]
+
+
+def _tangent(derivadas, jacobian, t, y, f, V, args):
+    # J V para cada vetor tangente V[:, i] (shape (d, k, N)); f = derivadas(t, y).
+    # Diferenças finitas para a frente (reaproveitam f, uma chamada a derivadas por vetor): o erro
+    # relativo ~1e-8 é desprezável ao lado do erro estatístico dos expoentes
+    if jacobian is not None:
+        return np.einsum("abn,bkn->akn", jacobian(t, y, *args), V)
+    out = np.empty_like(V)
+    y_norm = 1 + np.sqrt(np.sum(y ** 2, axis=0))
+    for i in range(V.shape[1]):
+        v = V[:, i]
+        h = 1.5e-8 * y_norm / np.maximum(np.sqrt(np.sum(v ** 2, axis=0)), 1e-300)
+        out[:, i] = (derivadas(t, y + h * v, *args) - f) / h
+    return out
+
+
+def _rk4_step(f, t, Y, dt):
+    k1 = f(t, Y)
+    k2 = f(t + dt / 2, [a + k * dt / 2 for a, k in zip(Y, k1)])
+    k3 = f(t + dt / 2, [a + k * dt / 2 for a, k in zip(Y, k2)])
+    k4 = f(t + dt, [a + k * dt for a, k in zip(Y, k3)])
+    return [a + (b1 + 2 * b2 + 2 * b3 + b4) * dt / 6 for a, b1, b2, b3, b4 in zip(Y, k1, k2, k3, k4)]
+
+
+def iter_lyapunov(derivadas, y0, dt, t_transient=0.0, n_exponents=1, renorm_every=10, jacobian=None, args=()):
+    """
+    Gera (tau, log_sums) a cada renormalização, sem fim: tau é o tempo desde o fim do transiente
+    e log_sums (shape (k, N)) as somas de log|R_ii|, ou seja λ_i ≈ log_sums[i] / tau.
+    derivadas(t, y, *args) recebe y de shape (d, N); y0 tem shape (d, N).
+    jacobian(t, y, *args), opcional, devolve ∂f/∂y com shape (d, d, N).
+    """
+    y = np.array(y0, dtype=float)
+    d, N = y.shape
+
+    def f_state(t, Y):
+        return [derivadas(t, Y[0], *args)]
+
+    def f_full(t, Y):
+        f = derivadas(t, Y[0], *args)
+        return [f, _tangent(derivadas, jacobian, t, Y[0], f, Y[1], args)]
+
+    n_transient = int(round(t_transient / dt))
+    Y = [y]
+    for n in range(n_transient):
+        Y = _rk4_step(f_state, n * dt, Y, dt)
+
+    # Vetores tangentes iniciais: os primeiros k vetores da base canónica
+    V = np.repeat(np.eye(d)[:, :n_exponents, None], N, axis=2)
+    Y = [Y[0], V]
+    log_sums = np.zeros((n_exponents, N))
+    n = n_transient
+    while True:
+        for _ in range(renorm_every):
+            Y = _rk4_step(f_full, n * dt, Y, dt)
+            n += 1
+        # QR de cada uma das N matrizes d x k (numpy faz as N de uma vez)
+        Q, R = np.linalg.qr(np.moveaxis(Y[1], 2, 0))
+        log_sums += np.log(np.abs(np.diagonal(R, axis1=1, axis2=2))).T
+        Y[1] = np.moveaxis(Q, 0, 2)
+        yield (n - n_transient) * dt, log_sums
+
+
+def _split_args(args, index, N):
+    # Arrays de shape (..., N) são divididos pelos blocos; o resto passa tal como está
+    return tuple(a[..., index] if np.ndim(a) and np.shape(a)[-1] == N else a for a in args)
+
+
+def _lyapunov_block(derivadas, y0, dt, t_transient, n_renorm, n_exponents, renorm_every, jacobian, args,
+                    n_checkpoints):
+    at = set(np.linspace(n_renorm / n_checkpoints, n_renorm, n_checkpoints).round().astype(int))
+    checkpoints = []
+    sums = []
+    with np.errstate(all="ignore"):
+        # Trajetórias que divergem ficam com nan
+        estimates = iter_lyapunov(derivadas, y0, dt, t_transient, n_exponents, renorm_every, jacobian, args)
+        for i, (tau, log_sums) in enumerate(estimates, start=1):
+            if i in at:
+                checkpoints.append(tau)
+                sums.append(log_sums.copy())
+            if i == n_renorm:
+                break
+    return np.array(checkpoints), np.array(sums)
+
+
+def lyapunov_exponents(derivadas, y0, dt, t_total, t_transient=0.0, n_exponents=1, renorm_every=10,
+                       jacobian=None, args=(), n_checkpoints=20, max_workers=None, min_block=256):
+    """
+    Expoentes de Lyapunov λ1 >= ... >= λk (k = n_exponents; 1 para o máximo, d para o espetro
+    completo) de derivadas(t, y, *args), com média entre t_transient e t_total.
+    y0: shape (d,) para uma trajetória ou (d, N) para N trajetórias em simultâneo; os args que
+    forem arrays de shape (N,) dão um valor do parâmetro a cada trajetória.
+    Com mais de min_block trajetórias, divide-as em blocos por até max_workers processos.
+    Devolve um LyapunovResult.
+    """
+    y0 = np.asarray(y0, dtype=float)
+    single = y0.ndim == 1
+    y0 = y0.reshape(len(y0), -1)
+    N = y0.shape[1]
+    n_renorm = max(1, int(round((t_total - t_transient) / (dt * renorm_every))))
+    n_checkpoints = max(1, min(n_checkpoints, n_renorm))
+    options = (n_exponents, renorm_every, jacobian)
+
+    workers = max_workers or os.cpu_count() or 1
+    n_blocks = int(min(workers, max(1, N // min_block)))
+    if n_blocks == 1:
+        checkpoints, log_sums = _lyapunov_block(derivadas, y0, dt, t_transient, n_renorm, *options, args,
+                                                n_checkpoints)
+    else:
+        blocks = np.array_split(np.arange(N), n_blocks)
+        with make_executor(n_blocks, derivadas) as executor:
+            futures = [executor.submit(_lyapunov_block, derivadas, y0[:, b], dt, t_transient, n_renorm, *options,
+                                       _split_args(args, b, N), n_checkpoints) for b in blocks]
+            parts = [f.result() for f in futures]
+        checkpoints = parts[0][0]
+        log_sums = np.concatenate([p[1] for p in parts], axis=2)
+
+    exponents = log_sums[-1] / checkpoints[-1]
+    if single:
+        exponents, log_sums = exponents[:, 0], log_sums[:, :, 0]
+    return LyapunovResult(exponents, checkpoints[-1], checkpoints, log_sums)
@@ -0,0 +1,156 @@
+import numpy as np
+
+from .extrema import find_extrema
+from .lagrange import maxminv
+
+# --- Observador online de período, amplitude e fase ---
+# Em vez de guardar a trajetória inteira e procurar picos no fim (measure_period_and_omega,
+# medir_periodo), o observador recebe as amostras à medida que o integrador avança e mantém
+# apenas estado de tamanho fixo: as 2 últimas amostras, o último máximo e somas acumuladas.
+# Cada extremo é refinado logo que aparece com a parábola dos 3 pontos (maxminv), e as médias
+# e incertezas são atualizadas com o algoritmo de Welford.
+# Pode ser usado de duas maneiras:
+#   - observer.step(t, x) dentro do ciclo de integração, uma amostra de cada vez;
+#   - observer.update(t, estados) com blocos (t, estados), como os consumidores de msf.streaming.
+
+
+class RunningStats:
+    """Média e variância acumuladas (Welford), com memória O(1)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / (self.n - 1)) if self.n >= 2 else np.nan
+
+    @property
+    def sem(self):
+        """Incerteza da média (desvio padrão / sqrt(n))."""
+        return self.std / np.sqrt(self.n) if self.n >= 2 else np.nan
+
+
+class OscillationObserver:
+    """
+    Período, limites do movimento e fase em relação à força cos(wf*t), estimados em linha.
+    Só são contados os extremos com t >= t_start (para ignorar o regime transitório).
+    """
+
+    def __init__(self, wf=None, t_start=0.0):
+        self.wf = wf
+        self.t_start = t_start
+        self.periods = RunningStats()
+        self.maxima = RunningStats()
+        self.minima = RunningStats()
+        self._t_prev = []
+        self._x_prev = []
+        self._t_last_max = None
+        # Fase: média circular de wf*t_max (mod 2π), através das somas de cos e sin
+        self._cos_sum = 0.0
+        self._sin_sum = 0.0
+
+    def step(self, t, x):
+        """Junta uma amostra (t, x)."""
+        if len(self._t_prev) < 2:
+            self._t_prev.append(t)
+            self._x_prev.append(x)
+            return
+        t1, t2 = self._t_prev
+        x1, x2 = self._x_prev
+        if x2 > x1 and x2 > x:
+            self._add_extremum(*maxminv(t1, t2, t, x1, x2, x), is_max=True)
+        elif x2 < x1 and x2 < x:
+            self._add_extremum(*maxminv(t1, t2, t, x1, x2, x), is_max=False)
+        self._t_prev = [t2, t]
+        self._x_prev = [x2, x]
+
+    def update(self, t, states):
+        """Junta um bloco (t, estados) com estados[:, 0] = x (protocolo de msf.streaming.consume)."""
+        x = states[:, 0] if np.ndim(states) == 2 else states
+        t_all = np.concatenate((self._t_prev, t))
+        x_all = np.concatenate((self._x_prev, x))
+        self._t_prev = list(t_all[-2:])
+        self._x_prev = list(x_all[-2:])
+        t_max, x_max, _ = find_extrema(t_all, x_all, kind="max")
+        for t_e, x_e in zip(t_max, x_max):
+            self._add_extremum(t_e, x_e, is_max=True)
+        t_min, x_min, _ = find_extrema(t_all, x_all, kind="min")
+        for t_e, x_e in zip(t_min, x_min):
+            self._add_extremum(t_e, x_e, is_max=False)
+
+    def _add_extremum(self, t_e, x_e, is_max):
+        if t_e < self.t_start:
+            return
+        if not is_max:
+            self.minima.add(x_e)
+            return
+        self.maxima.add(x_e)
+        if self._t_last_max is not None:
+            self.periods.add(t_e - self._t_last_max)
+        self._t_last_max = t_e
+        if self.wf is not None:
+            self._cos_sum += np.cos(self.wf * t_e)
+            self._sin_sum += np.sin(self.wf * t_e)
+
+    # --- Resultados ---
+
+    @property
+    def n_cycles(self):
+        return self.periods.n
+
+    @property
+    def period(self):
+        return self.periods.mean if self.periods.n else np.nan
+
+    @property
+    def period_err(self):
+        return self.periods.sem
+
+    @property
+    def omega(self):
+        return 2 * np.pi / self.period
+
+    @property
+    def omega_err(self):
+        return self.omega * self.period_err / self.period
+
+    @property
+    def x_max(self):
+        return self.maxima.mean if self.maxima.n else np.nan
+
+    @property
+    def x_min(self):
+        return self.minima.mean if self.minima.n else np.nan
+
+    @property
+    def amplitude(self):
+        """Meia amplitude pico-a-pico, (x_max - x_min) / 2."""
+        return (self.x_max - self.x_min) / 2
+
+    @property
+    def amplitude_err(self):
+        return 0.5 * np.hypot(self.maxima.sem, self.minima.sem)
+
+    @property
+    def phase(self):
+        """Atraso de fase phi em x ≈ A cos(wf*t - phi), em (-π, π]."""
+        if self.wf is None or self.maxima.n == 0:
+            return np.nan
+        return np.arctan2(self._sin_sum, self._cos_sum)
+
+    @property
+    def phase_err(self):
+        # Desvio padrão circular a partir do comprimento médio R do vetor de fases
+        n = self.maxima.n
+        if self.wf is None or n < 2:
+            return np.nan
+        R = min(np.hypot(self._cos_sum, self._sin_sum) / n, 1.0)
+        return np.sqrt(-2 * np.log(R)) / np.sqrt(n)
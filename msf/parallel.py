@@ -0,0 +1,21 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# --- Execução concorrente ---
+# Os scripts dos capítulos não têm "if __name__ == '__main__':", por isso os processos auxiliares
+# são criados com "fork" (herdam as funções já definidas no script sem o voltar a executar).
+# Onde "fork" não existe (Windows, macOS recente), ou se a tarefa não puder ser enviada para
+# outro processo (ex.: uma lambda), usa-se um conjunto de threads.
+
+
+def make_executor(max_workers=None, task=None):
+    if "fork" in multiprocessing.get_all_start_methods():
+        try:
+            if task is not None:
+                pickle.dumps(task)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            pass
+        else:
+            return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+    return ThreadPoolExecutor(max_workers=max_workers)
@@ -0,0 +1,179 @@
+import os
+
+import numpy as np
+
+from .parallel import make_executor
+from .streaming import rk4_step
+
+# --- Secção de Poincaré estroboscópica e diagramas de bifurcação ---
+# Para ver a estrutura de um oscilador forçado caótico não é preciso guardar todos os passos:
+# basta o estado uma vez por período da força, em t = n*2π/wf (ou na fase wf*t = phase + 2πn).
+# Cada período é integrado com RK4 num número inteiro de passos h = T/n_steps, por isso a
+# integração aterra exatamente na secção (sem interpolação nem deriva de fase). Como a força só
+# depende de t através de cos(wf*t), o tempo dentro de cada período é contado a partir da secção
+# (t = phase/wf + n*h): em 10⁵ períodos o argumento do cosseno não perde precisão.
+# O diagrama de bifurcação integra todos os valores do parâmetro (F0, b, ...) de uma só vez
+# (arrays de shape (N,)) e, em vez de guardar os pontos da secção, soma-os num histograma
+# (parâmetro x bins de x): a memória é a do histograma, independente do número de períodos.
+
+
+class BifurcationDiagram:
+    def __init__(self, params, edges, counts, outside, n_periods, component):
+        self.params = params        # valores do parâmetro, shape (N,)
+        self.edges = edges          # limites dos bins da variável na secção, shape (n_bins + 1,)
+        self.counts = counts        # pontos da secção em cada bin, shape (N, n_bins)
+        self.outside = outside      # pontos fora de [edges[0], edges[-1]], shape (N,)
+        self.n_periods = n_periods  # períodos somados ao histograma (por valor do parâmetro)
+        self.component = component  # 0 = x, 1 = vx
+
+    @property
+    def centers(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @property
+    def extent(self):
+        """(p_min, p_max, y_min, y_max) para plt.imshow(diagram.density().T, extent=..., origin='lower')."""
+        return (self.params[0], self.params[-1], self.edges[0], self.edges[-1])
+
+    def density(self):
+        """Fração dos pontos da secção em cada bin, por valor do parâmetro."""
+        return self.counts / np.maximum(self.counts.sum(axis=1, keepdims=True), 1)
+
+    def n_occupied(self, min_fraction=1e-3):
+        """
+        Número de bins ocupados por valor do parâmetro: ~n num regime de período nT (ou ~2n
+        se os pontos caírem na fronteira de dois bins), muitos num regime caótico.
+        """
+        return np.count_nonzero(self.density() >= min_fraction, axis=1)
+
+
+def iter_poincare(accel_func, wf, x0, vx0, dt=0.01, phase=0.0):
+    """
+    Gera (x, vx) na secção wf*t = phase + 2πn, n = 0, 1, 2, ... (sem fim), para x'' = accel_func(x, vx, t).
+    O estado (x0, vx0) é o de t = 0; x0 e vx0 podem ser arrays (accel_func vetorizada).
+    """
+    T = 2 * np.pi / wf
+    n_steps = max(1, int(round(T / dt)))
+    h = T / n_steps
+    x, vx = x0, vx0
+    # Da condição inicial até à primeira passagem pela secção
+    t_s = (phase % (2 * np.pi)) / wf
+    if t_s > 0:
+        m = max(1, int(round(t_s / dt)))
+        for n in range(m):
+            x, vx = rk4_step(x, vx, n * t_s / m, t_s / m, accel_func)
+    while True:
+        yield x, vx
+        for n in range(n_steps):
+            x, vx = rk4_step(x, vx, t_s + n * h, h, accel_func)
+
+
+def poincare_section(accel_func, wf, x0, vx0, n_periods, dt=0.01, n_transient=0, phase=0.0):
+    """
+    Pontos da secção de Poincaré estroboscópica: os n_periods estados na secção depois de
+    n_transient períodos. Devolve (x, vx), cada um de shape (n_periods,) + shape de x0 e vx0.
+    """
+    x0, vx0 = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(vx0, dtype=float))
+    x = np.empty((n_periods,) + x0.shape)
+    vx = np.empty((n_periods,) + x0.shape)
+    section = iter_poincare(accel_func, wf, x0, vx0, dt, phase)
+    for n, (xn, vxn) in enumerate(section):
+        if n >= n_transient:
+            x[n - n_transient] = xn
+            vx[n - n_transient] = vxn
+        if n + 1 == n_transient + n_periods:
+            break
+    return x, vx
+
+
+def _histogram(y, edges):
+    # Bin de cada valor de y (um por valor do parâmetro); -1 fora de [edges[0], edges[-1]]
+    n_bins = len(edges) - 1
+    i = np.searchsorted(edges, y, side="right") - 1
+    i[y == edges[-1]] = n_bins - 1
+    return np.where((i >= 0) & (i < n_bins), i, -1)
+
+
+def _section_block(accel_func, params, wf, x, vx, dt, phase, n_skip, n_keep, component, edges):
+    # Avança n_skip períodos e depois n_keep períodos: com edges=None guarda os n_keep pontos da
+    # secção (para estimar os limites do histograma), senão soma-os ao histograma.
+    # Devolve também o estado no ponto seguinte da secção, para continuar a partir dele
+    def accel(x, vx, t):
+        return accel_func(x, vx, t, params)
+
+    N = len(params)
+    if edges is None:
+        kept = np.empty((n_keep, N))
+    else:
+        n_bins = len(edges) - 1
+        counts = np.zeros(N * n_bins, dtype=np.int64)
+        rows = np.arange(N) * n_bins
+    for n, state in enumerate(iter_poincare(accel, wf, x, vx, dt, phase)):
+        if n == n_skip + n_keep:
+            x, vx = state
+            break
+        if n >= n_skip:
+            if edges is None:
+                kept[n - n_skip] = state[component]
+            else:
+                i = _histogram(state[component], edges)
+                counts += np.bincount(rows[i >= 0] + i[i >= 0], minlength=N * n_bins)
+    if edges is None:
+        return x, vx, kept
+    return x, vx, counts.reshape(N, n_bins)
+
+
+def bifurcation_diagram(accel_func, param_values, wf, x0, vx0, n_periods, n_transient=100, dt=0.01,
+                        phase=0.0, component=0, bins=200, value_range=None, n_probe=50,
+                        max_workers=None, min_block=16):
+    """
+    Diagrama de bifurcação de x'' = accel_func(x, vx, t, p) no parâmetro p (F0, b, ...), com todos os
+    valores de param_values integrados em simultâneo (accel_func recebe p como array de shape (N,)).
+    Para cada p, descarta n_transient períodos e soma ao histograma a componente component (0 = x,
+    1 = vx) dos n_periods pontos seguintes da secção. x0 e vx0: escalares ou arrays de shape (N,).
+    value_range: limites do histograma; None para os estimar dos primeiros n_probe desses pontos.
+    Com mais de min_block valores, divide-os em blocos por até max_workers processos.
+    Devolve um BifurcationDiagram.
+    """
+    params = np.asarray(param_values, dtype=float)
+    N = len(params)
+    x = np.array(np.broadcast_to(np.asarray(x0, dtype=float), (N,)))
+    vx = np.array(np.broadcast_to(np.asarray(vx0, dtype=float), (N,)))
+
+    workers = max_workers or os.cpu_count() or 1
+    n_blocks = int(min(workers, max(1, N // min_block)))
+    blocks = np.array_split(np.arange(N), n_blocks)
+
+    def run(executor, x, vx, n_skip, n_keep, edges):
+        args = (dt, phase, n_skip, n_keep, component, edges)
+        if executor is None:
+            parts = [_section_block(accel_func, params, wf, x, vx, *args)]
+        else:
+            futures = [executor.submit(_section_block, accel_func, params[b], wf, x[b], vx[b], *args)
+                       for b in blocks]
+            parts = [f.result() for f in futures]
+        return [np.concatenate(p, axis=-1 if p[0].ndim == 2 and edges is None else 0) for p in zip(*parts)]
+
+    executor = make_executor(n_blocks, accel_func) if n_blocks > 1 else None
+    try:
+        if value_range is None:
+            # Limites do histograma a partir dos primeiros pontos da secção (que também são contados)
+            n_probe = min(n_probe, n_periods)
+            x, vx, probe = run(executor, x, vx, n_transient, n_probe, None)
+            finite = probe[np.isfinite(probe)]
+            lo, hi = (finite.min(), finite.max()) if finite.size else (-1.0, 1.0)
+            margin = 0.05 * (hi - lo) if hi > lo else 0.5
+            edges = np.linspace(lo - margin, hi + margin, bins + 1)
+            x, vx, counts = run(executor, x, vx, 0, n_periods - n_probe, edges)
+            for row, y in enumerate(probe.T):
+                i = _histogram(y, edges)
+                counts[row] += np.bincount(i[i >= 0], minlength=bins)
+        else:
+            edges = np.linspace(value_range[0], value_range[1], bins + 1)
+            x, vx, counts = run(executor, x, vx, n_transient, n_periods, edges)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    outside = n_periods - counts.sum(axis=1)
+    return BifurcationDiagram(params, edges, counts, outside, n_periods, component)
@@ -0,0 +1,80 @@
+import numpy as np
+
+# --- Registo de trajetórias em arrays pré-alocados ---
+# Substitui as listas (t_values.append(...), x_values.append(...), ...) dos ciclos simulate_*.
+# Cada amostra oferecida ao registo é guardada num array float64 pré-alocado, e há dois modos
+# para limitar a memória ao que se quer guardar (e não ao número de passos do integrador):
+#   - keep_every=k: guarda apenas uma amostra em cada k (dizimação);
+#   - reservoir_size=M: guarda uma amostra uniforme de tamanho fixo M (amostragem "reservoir").
+
+
+class TrajectoryRecorder:
+    def __init__(self, n_vars, capacity=1024, keep_every=1, reservoir_size=None, seed=None):
+        """
+        n_vars: número de grandezas por amostra (ex.: 4 para t, x, vx, energia).
+        capacity: número de amostras a guardar previsto (os arrays crescem se for ultrapassado).
+        keep_every: guardar uma amostra em cada keep_every (modo dizimação).
+        reservoir_size: se for dado, guarda no máximo este número de amostras, escolhidas ao acaso.
+        """
+        if keep_every < 1:
+            raise ValueError("keep_every tem de ser >= 1")
+        self.n_vars = n_vars
+        self.keep_every = int(keep_every)
+        self.reservoir_size = reservoir_size
+        self.n_offered = 0  # número de amostras oferecidas pelo integrador
+        self.n_kept = 0     # número de amostras guardadas
+
+        if reservoir_size is not None:
+            capacity = int(reservoir_size)
+            self._rng = np.random.default_rng(seed)
+            self._order = np.empty(capacity, dtype=np.int64)  # índice original de cada amostra
+            self._w = np.exp(np.log(self._rng.random()) / capacity)
+            self._next = capacity - 1 + self._skip()  # próxima amostra a entrar no reservatório
+        self._data = np.empty((n_vars, max(int(capacity), 1)), dtype=np.float64)
+
+    def record(self, *values):
+        """Oferece uma amostra (um valor por grandeza) ao registo."""
+        i = self.n_offered
+        self.n_offered += 1
+        self._last = values
+
+        if self.reservoir_size is not None:
+            if self.n_kept < self.reservoir_size:
+                slot = self.n_kept
+                self.n_kept += 1
+            elif i == self._next:
+                # Algoritmo L: salta diretamente para a próxima amostra a guardar,
+                # evitando gerar um número aleatório por passo
+                slot = self._rng.integers(0, self.reservoir_size)
+                self._w *= np.exp(np.log(self._rng.random()) / self.reservoir_size)
+                self._next += self._skip()
+            else:
+                return
+            self._data[:, slot] = values
+            self._order[slot] = i
+            return
+
+        if i % self.keep_every != 0:
+            return
+        if self.n_kept == self._data.shape[1]:
+            self._grow()
+        self._data[:, self.n_kept] = values
+        self.n_kept += 1
+
+    def _skip(self):
+        return int(np.floor(np.log(self._rng.random()) / np.log1p(-self._w))) + 1
+
+    def _grow(self):
+        new_data = np.empty((self.n_vars, 2 * self._data.shape[1]), dtype=np.float64)
+        new_data[:, :self.n_kept] = self._data[:, :self.n_kept]
+        self._data = new_data
+
+    def arrays(self):
+        """Devolve um array NumPy por grandeza, com as amostras guardadas pela ordem temporal."""
+        data = self._data[:, :self.n_kept]
+        if self.reservoir_size is not None:
+            data = data[:, np.argsort(self._order[:self.n_kept], kind="stable")]
+        elif self.n_offered > 0 and (self.n_offered - 1) % self.keep_every != 0:
+            # No modo dizimação a última amostra oferecida (estado final) é sempre incluída
+            data = np.column_stack((data, self._last))
+        return tuple(data[j] for j in range(self.n_vars))
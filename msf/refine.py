@@ -0,0 +1,135 @@
+import numpy as np
+from scipy.signal import find_peaks
+
+from .lagrange import maxminv
+
+# --- Refinamento adaptativo de curvas de ressonância ---
+# Uma grelha uniforme (np.linspace(0.2, 2.0, 50)) gasta quase todos os pontos nas zonas planas e
+# mesmo assim resolve mal os picos. Aqui começa-se com uma grelha grosseira e, em cada ronda,
+# avaliam-se de uma só vez (num único varrimento) os pontos novos:
+#   - o meio dos intervalos em que a amplitude muda muito (|Δy| > rtol * max y) ou a curvatura é
+#     grande (|Δ²y| > rtol * max y), até 10*xtol;
+#   - junto a cada pico (máximo local) cujos intervalos vizinhos ainda são mais largos que xtol,
+#     o vértice da parábola pelos 3 pontos e dois pontos a ±1/4 do intervalo;
+#   - dois pontos a ±xtol/2 de cada passagem pelo nível de meia potência (y_pico / √2), estimada
+#     por interpolação linear, enquanto o intervalo que a contém for mais largo que xtol.
+# Pára quando não há pontos novos (ou ao fim de max_evals).
+# Cada pico é localizado pela parábola dos 3 pontos (maxminv) e a largura é a da banda de meia
+# potência Δω, com fator de qualidade Q = ω_pico / Δω.
+
+
+class ResonancePeak:
+    def __init__(self, wf, height, half_width, component=0):
+        self.wf = wf                  # frequência do pico
+        self.height = height          # amplitude no pico
+        self.half_width = half_width  # meia largura da banda de meia potência, Δω / 2
+        self.component = component    # linha da resposta onde está o pico
+
+    @property
+    def width(self):
+        return 2 * self.half_width
+
+    @property
+    def Q(self):
+        return self.wf / self.width
+
+
+class AdaptiveScan:
+    def __init__(self, wf, amplitude, peaks, n_evaluations, n_rounds):
+        self.wf = wf                        # frequências avaliadas (ordenadas)
+        self.amplitude = amplitude          # resposta nessas frequências, shape (N,) ou (c, N)
+        self.peaks = peaks                  # lista de ResonancePeak
+        self.n_evaluations = n_evaluations  # número de simulações
+        self.n_rounds = n_rounds            # número de varrimentos (chamadas a response)
+
+
+def _find_peaks(wf, y, prominence):
+    # Picos interiores com proeminência suficiente, refinados pela parábola dos 3 pontos
+    idx, _ = find_peaks(y, prominence=prominence * np.max(y))
+    w_peak, y_peak = maxminv(wf[idx - 1], wf[idx], wf[idx + 1], y[idx - 1], y[idx], y[idx + 1])
+    return idx, np.atleast_1d(w_peak), np.atleast_1d(y_peak)
+
+
+def _half_power(wf, y, i, level, step):
+    # Primeira passagem pelo nível de meia potência a partir do pico i (step = -1 à esquerda, +1 à direita);
+    # devolve o índice do intervalo [j, j+1] e a frequência por interpolação linear
+    j = i
+    while 0 <= j + step < len(y) and y[j + step] > level:
+        j += step
+    if not 0 <= j + step < len(y):
+        return None, np.nan
+    j0, j1 = sorted((j, j + step))
+    return j0, wf[j0] + (level - y[j0]) * (wf[j1] - wf[j0]) / (y[j1] - y[j0])
+
+
+def _new_points(wf, Y, xtol, rtol, prominence):
+    split = np.zeros(len(wf) - 1, dtype=bool)
+    extra = []
+    for y in Y:
+        scale = np.max(np.abs(y))
+        if scale == 0:
+            continue
+        # Variação e curvatura grandes
+        split |= np.abs(np.diff(y)) > rtol * scale
+        curvature = np.abs(np.diff(y, 2)) > rtol * scale
+        split[:-1] |= curvature
+        split[1:] |= curvature
+        idx, w_peak, y_peak = _find_peaks(wf, y, prominence)
+        for i, w, h in zip(idx, w_peak, y_peak):
+            # Pico ainda mal resolvido: em vez de dividir ao meio, junta o vértice da parábola e dois
+            # pontos a ±1/4 do intervalo mais estreito (o intervalo em volta do pico encolhe 4x por ronda)
+            spacing = min(wf[i] - wf[i - 1], wf[i + 1] - wf[i])
+            if max(wf[i] - wf[i - 1], wf[i + 1] - wf[i]) > xtol:
+                delta = max(spacing / 4, xtol / 2)
+                extra.extend(np.clip([w - delta, w, w + delta], wf[i - 1], wf[i + 1]))
+            # Passagens pela meia potência (para medir a largura): dois pontos a ±xtol/2 da estimativa linear
+            for step in (-1, 1):
+                j, w_half = _half_power(wf, y, i, h / np.sqrt(2), step)
+                if j is not None and wf[j + 1] - wf[j] > xtol:
+                    extra.extend(np.clip([w_half - xtol / 2, w_half + xtol / 2], wf[j], wf[j + 1]))
+    # A variação e a curvatura só servem para encontrar picos: não se divide abaixo de 10*xtol
+    split &= np.diff(wf) > 10 * xtol
+    new = np.concatenate((((wf[:-1] + wf[1:]) / 2)[split], extra))
+    # Descarta pontos demasiado perto dos que já foram avaliados ou uns dos outros
+    # (ex.: o mesmo pico visto em duas componentes)
+    kept = []
+    for w in np.sort(new):
+        if np.min(np.abs(wf - w)) > xtol / 4 and (not kept or w - kept[-1] > xtol / 4):
+            kept.append(w)
+    return np.array(kept)
+
+
+def adaptive_resonance_scan(response, wf_min, wf_max, n_initial=12, xtol=1e-3, rtol=0.25,
+                            prominence=0.05, max_evals=200):
+    """
+    Curva de ressonância adaptativa. response(wf) recebe um array de frequências e devolve as
+    amplitudes, shape (N,) ou (c, N) para várias componentes (ex.: um frequency_sweep).
+    xtol: tolerância na localização dos picos (e largura mínima dos intervalos).
+    prominence: proeminência mínima de um pico, em fração da amplitude máxima.
+    Devolve um AdaptiveScan com os pontos avaliados e os picos (frequência, altura, meia largura, Q).
+    """
+    wf = np.linspace(wf_min, wf_max, n_initial)
+    Y = np.asarray(response(wf), dtype=float)
+    single = Y.ndim == 1
+    Y = np.atleast_2d(Y)
+    n_rounds = 1
+    while len(wf) < max_evals:
+        new = _new_points(wf, Y, xtol, rtol, prominence)[:max_evals - len(wf)]
+        if len(new) == 0:
+            break
+        Y_new = np.atleast_2d(response(new))
+        n_rounds += 1
+        wf = np.concatenate((wf, new))
+        Y = np.concatenate((Y, Y_new), axis=1)
+        order = np.argsort(wf)
+        wf, Y = wf[order], Y[:, order]
+
+    peaks = []
+    for c, y in enumerate(Y):
+        idx, w_peak, y_peak = _find_peaks(wf, y, prominence)
+        for i, w, h in zip(idx, w_peak, y_peak):
+            _, w_lo = _half_power(wf, y, i, h / np.sqrt(2), -1)
+            _, w_hi = _half_power(wf, y, i, h / np.sqrt(2), +1)
+            peaks.append(ResonancePeak(float(w), float(h), (w_hi - w_lo) / 2, component=c))
+
+    return AdaptiveScan(wf, Y[0] if single else Y, peaks, len(wf), n_rounds)
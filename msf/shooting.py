@@ -0,0 +1,164 @@
+import numpy as np
+
+# --- Método do tiro para órbitas periódicas, com estabilidade de Floquet ---
+# Uma órbita de período T = n*2π/wf é um ponto fixo do mapa s -> φ_T(s), que leva o estado
+# s = (x, vx) em t = 0 ao estado em t = T. Resolve-se φ_T(s) - s = 0 pelo método de Newton;
+# a matriz jacobiana é M - I, onde a matriz de monodromia M = ∂φ_T/∂s é integrada junto com o
+# estado pelas equações variacionais
+#     Φ' = [[0, 1], [a_x, a_v]] Φ,   Φ(0) = I,   M = Φ(T)
+# (a_x, a_v: derivadas parciais da aceleração, por diferenças finitas centradas).
+# Os valores próprios de M são os multiplicadores de Floquet: a órbita é estável se todos
+# tiverem módulo < 1.
+# Tudo é vetorizado sobre N estimativas iniciais (arrays de shape (N,)), por isso muitas
+# estimativas são resolvidas de uma só vez e podem enumerar-se os atratores que coexistem.
+
+
+class ShootingResult:
+    def __init__(self, wf, subharmonic, states, converged, iterations, multipliers, strobe, x_max, x_min):
+        self.wf = wf
+        self.subharmonic = subharmonic  # período procurado, em múltiplos do período da força
+        self.states = states            # estado (x, vx) em t = 0 de cada órbita, shape (N, 2)
+        self.converged = converged
+        self.iterations = iterations
+        self.multipliers = multipliers  # multiplicadores de Floquet, shape (N, 2)
+        self.strobe = strobe            # estados em t = 0, T_força, 2 T_força, ..., shape (N, n, 2)
+        self.x_max = x_max              # limites do movimento ao longo da órbita
+        self.x_min = x_min
+
+    @property
+    def stable(self):
+        return self.converged & np.all(np.abs(self.multipliers) < 1, axis=1)
+
+    @property
+    def minimal_subharmonic(self):
+        """Período mínimo de cada órbita em múltiplos do período da força (0 se não convergiu)."""
+        n = self.subharmonic
+        scale = 1 + np.abs(self.strobe).max(axis=(1, 2))
+        result = np.where(self.converged, n, 0)
+        # Divisores de n por ordem decrescente: o menor que repete o estado fica no fim
+        for m in range(n - 1, 0, -1):
+            if n % m == 0:
+                same = np.max(np.abs(self.strobe[:, m] - self.strobe[:, 0]), axis=1) <= 1e-6 * scale
+                result[self.converged & same] = m
+        return result
+
+    def unique_orbits(self, stable_only=True, tol=1e-6):
+        """
+        Índices de órbitas distintas (uma por atrator): duas soluções são a mesma órbita se o
+        estado inicial de uma coincidir com um dos estados estroboscópicos da outra.
+        """
+        mask = self.stable if stable_only else self.converged
+        found = []
+        for i in np.flatnonzero(mask):
+            scale = tol * (1 + np.abs(self.strobe[i]).max())
+            if not any(np.min(np.max(np.abs(self.strobe[j] - self.states[i]), axis=1)) <= scale for j in found):
+                found.append(i)
+        return found
+
+
+def _partials(accel_func, x, v, t):
+    hx = 1e-6 * (1 + np.abs(x))
+    hv = 1e-6 * (1 + np.abs(v))
+    a_x = (accel_func(x + hx, v, t) - accel_func(x - hx, v, t)) / (2 * hx)
+    a_v = (accel_func(x, v + hv, t) - accel_func(x, v - hv, t)) / (2 * hv)
+    return a_x, a_v
+
+
+def _derivadas_variacionais(accel_func, t, Y):
+    # Y = [x, v, Φ00, Φ01, Φ10, Φ11], cada um de shape (N,)
+    x, v, p00, p01, p10, p11 = Y
+    a_x, a_v = _partials(accel_func, x, v, t)
+    return np.array([v, accel_func(x, v, t), p10, p11, a_x * p00 + a_v * p10, a_x * p01 + a_v * p11])
+
+
+def _flow(accel_func, states, wf, n_periods, dt, variational):
+    # Integra (RK4) n_periods períodos da força a partir de t = 0; devolve o estado final, a matriz
+    # de monodromia (se variational), os estados estroboscópicos e os limites de x
+    T = 2 * np.pi / wf
+    n_steps = max(1, int(round(T / dt)))
+    h = T / n_steps
+    N = len(states)
+    if variational:
+        Y = np.vstack([states.T, np.ones(N), np.zeros(N), np.zeros(N), np.ones(N)])
+        f = lambda t, Y: _derivadas_variacionais(accel_func, t, Y)
+    else:
+        Y = states.T.copy()
+        f = lambda t, Y: np.array([Y[1], accel_func(Y[0], Y[1], t)])
+    strobe = np.empty((N, n_periods, 2))
+    x_max = Y[0].copy()
+    x_min = Y[0].copy()
+    for p in range(n_periods):
+        strobe[:, p] = Y[:2].T
+        for n in range(n_steps):
+            t = p * T + n * h
+            k1 = f(t, Y)
+            k2 = f(t + h / 2, Y + k1 * h / 2)
+            k3 = f(t + h / 2, Y + k2 * h / 2)
+            k4 = f(t + h, Y + k3 * h)
+            Y = Y + (k1 + 2 * k2 + 2 * k3 + k4) * h / 6
+            np.maximum(x_max, Y[0], out=x_max)
+            np.minimum(x_min, Y[0], out=x_min)
+    monodromy = Y[2:].T.reshape(N, 2, 2) if variational else None
+    return Y[:2].T, monodromy, strobe, x_max, x_min
+
+
+def shoot_periodic_orbits(accel_func, wf, states0, subharmonic=1, dt=0.01, n_transient=0, tol=1e-9, max_iter=30):
+    """
+    Órbitas periódicas de período subharmonic*2π/wf de x'' = accel_func(x, vx, t) (vetorizada),
+    a partir das estimativas states0, shape (N, 2) com linhas (x0, vx0).
+    n_transient: períodos da força integrados antes do método de Newton (aproxima as estimativas dos atratores).
+    Devolve um ShootingResult.
+    """
+    with np.errstate(all="ignore"):
+        # Estimativas que divergem dão overflow; são descartadas pelo caminho
+        return _shoot(accel_func, wf, states0, subharmonic, dt, n_transient, tol, max_iter)
+
+
+def _shoot(accel_func, wf, states0, subharmonic, dt, n_transient, tol, max_iter):
+    states = np.array(states0, dtype=float).reshape(-1, 2)
+    N = len(states)
+    if n_transient:
+        states = _flow(accel_func, states, wf, n_transient, dt, variational=False)[0]
+
+    converged = np.zeros(N, dtype=bool)
+    iterations = np.zeros(N, dtype=int)
+    monodromy = np.tile(np.eye(2), (N, 1, 1))
+    active = np.ones(N, dtype=bool)
+    for it in range(max_iter):
+        if not active.any():
+            break
+        end, M, _, _, _ = _flow(accel_func, states[active], wf, subharmonic, dt, variational=True)
+        F = end - states[active]
+        monodromy[active] = M
+        iterations[active] = it
+        ok = np.max(np.abs(F), axis=1) <= tol * (1 + np.max(np.abs(states[active]), axis=1))
+        idx = np.flatnonzero(active)
+        converged[idx[ok]] = True
+        # Passo de Newton (M - I) ds = -F nas que ainda não convergiram (inversa 2x2 explícita);
+        # as que divergem (ou com M - I singular) são abandonadas
+        a, b, c, d = M[:, 0, 0] - 1, M[:, 0, 1], M[:, 1, 0], M[:, 1, 1] - 1
+        det = a * d - b * c
+        step = np.column_stack((-(d * F[:, 0] - b * F[:, 1]), -(a * F[:, 1] - c * F[:, 0]))) / det[:, None]
+        states[active] = np.where(ok[:, None], states[active], states[active] + step)
+        bad = ~np.all(np.isfinite(states), axis=1) | (np.abs(states).max(axis=1) > 1e6)
+        active = ~converged & ~bad
+
+    # Confirma com dt/2: longe da solução (estados enormes) o RK4 é instável e pode ter pontos fixos
+    # que são só artefactos numéricos
+    if converged.any():
+        end = _flow(accel_func, states[converged], wf, subharmonic, dt / 2, variational=False)[0]
+        scale = 1 + np.max(np.abs(states[converged]), axis=1)
+        idx = np.flatnonzero(converged)
+        converged[idx[~(np.max(np.abs(end - states[converged]), axis=1) <= 1e-6 * scale)]] = False
+    states[~converged] = np.nan
+
+    strobe = np.full((N, subharmonic, 2), np.nan)
+    x_max = np.full(N, np.nan)
+    x_min = np.full(N, np.nan)
+    if converged.any():
+        _, M, s, hi, lo = _flow(accel_func, states[converged], wf, subharmonic, dt, variational=True)
+        monodromy[converged] = M
+        strobe[converged], x_max[converged], x_min[converged] = s, hi, lo
+    multipliers = np.full((N, 2), np.nan, dtype=complex)
+    multipliers[converged] = np.linalg.eigvals(monodromy[converged])
+    return ShootingResult(wf, subharmonic, states, converged, iterations, multipliers, strobe, x_max, x_min)
@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+# --- Deteção automática do regime estacionário ---
+# Em vez de cortar o transiente num tempo fixo (60 s, 150 s, últimos 30% ...), o detetor compara
+# períodos sucessivos da força T = 2π/wf:
+#   - a amostra estroboscópica do estado em t = n*T (interpolada entre as duas amostras vizinhas);
+#   - a amplitude de cada ciclo, (máximo - mínimo)/2, para cada componente do estado.
+# O regime é estacionário quando n_confirm ciclos seguidos mudam menos que atol + rtol*amplitude.
+# update(t, estados) devolve True a partir desse momento, e run_until_steady usa isso para
+# parar a integração (os geradores de msf.streaming só calculam o bloco seguinte se forem pedidos).
+
+
+class SteadyStateDetector:
+    """
+    Detetor de regime estacionário para forçamento de frequência wf.
+    Os estados podem ter várias componentes (ex.: [x, vx] ou [xA, xB, vA, vB]);
+    todas têm de estabilizar.
+    """
+
+    def __init__(self, wf, rtol=1e-3, atol=1e-9, n_confirm=3, t_min=0.0):
+        self.wf = wf
+        self.period = 2 * np.pi / wf
+        self.rtol = rtol
+        self.atol = atol
+        self.n_confirm = n_confirm
+        self.t_min = t_min
+        self.settled = False
+        self.t_settle = np.nan
+        self.n_cycles = 0          # ciclos completos analisados
+        self.amplitude = None      # amplitude do último ciclo completo, por componente
+        self.y_max = None
+        self.y_min = None
+        self.strobe = None         # estado em t = n*T no fim do último ciclo
+        self.t_end = np.nan        # último instante processado
+        self._cycle = None
+        self._first_cycle = True
+        self._max = None
+        self._min = None
+        self._t_last = None
+        self._y_last = None
+        self._passes = 0
+        self._t_candidate = np.nan
+        self._buf_t = []
+        self._buf_y = []
+        self._t_flush = -np.inf
+
+    def step(self, t, *values):
+        """Junta uma amostra: step(t, x, vx, ...). Devolve True se o regime já é estacionário."""
+        # Para ser chamada a cada passo dentro do ciclo de integração: as amostras ficam numa lista
+        # e são processadas por update() de uma só vez quando t passa para o período seguinte
+        if self.settled:
+            return True
+        self._buf_t.append(t)
+        self._buf_y.append(values)
+        self.t_end = t
+        if t >= self._t_flush:
+            self.update(self._buf_t, self._buf_y)
+            self._buf_t = []
+            self._buf_y = []
+            self._t_flush = (math.floor(t / self.period + 1e-9) + 1) * self.period
+        return self.settled
+
+    def update(self, t, states):
+        """Junta um bloco (t, estados) com estados de shape (n, d). Devolve True se o regime já é estacionário."""
+        if self.settled:
+            return True
+        t = np.asarray(t, dtype=float)
+        states = np.asarray(states, dtype=float).reshape(len(t), -1)
+        cycle = np.floor(t / self.period + 1e-9).astype(np.int64)
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(cycle)) + 1, [len(t)]))
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            seg = states[a:b]
+            if self._cycle is not None and cycle[a] != self._cycle:
+                # Estado em t = n*T por interpolação linear entre a última amostra e seg[0]
+                t_n = cycle[a] * self.period
+                w = (t_n - self._t_last) / (t[a] - self._t_last)
+                self._close_cycle(t_n, self._y_last + w * (seg[0] - self._y_last))
+                if self.settled:
+                    self.t_end = t[a]
+                    return True
+            if self._cycle != cycle[a]:
+                self._cycle = cycle[a]
+                self._max = seg.max(axis=0)
+                self._min = seg.min(axis=0)
+            else:
+                self._max = np.maximum(self._max, seg.max(axis=0))
+                self._min = np.minimum(self._min, seg.min(axis=0))
+            self._t_last = t[b - 1]
+            self._y_last = seg[-1]
+        self.t_end = t[-1]
+        return self.settled
+
+    def _close_cycle(self, t_n, strobe):
+        if self._first_cycle:
+            # O primeiro ciclo pode estar incompleto (a integração pode começar a meio de um período)
+            self._first_cycle = False
+            self.strobe = strobe
+            return
+        y_max = self._max
+        y_min = self._min
+        amplitude = (y_max - y_min) / 2
+        if self.amplitude is not None and t_n - self.period >= self.t_min:
+            tol = self.atol + self.rtol * amplitude
+            same = (np.all(np.abs(amplitude - self.amplitude) <= tol)
+                    and np.all(np.abs(strobe - self.strobe) <= tol))
+            if same:
+                if self._passes == 0:
+                    self._t_candidate = t_n - 2 * self.period
+                self._passes += 1
+            else:
+                self._passes = 0
+            if self._passes >= self.n_confirm:
+                self.settled = True
+                self.t_settle = self._t_candidate
+        self.n_cycles += 1
+        self.amplitude = amplitude
+        self.y_max = y_max
+        self.y_min = y_min
+        self.strobe = strobe
+
+
+def run_until_steady(chunks, detector):
+    """Consome blocos (t, estados) até o detetor indicar regime estacionário (ou os blocos acabarem)."""
+    for t, states in chunks:
+        if detector.update(t, states):
+            break
+    return detector
@@ -0,0 +1,173 @@
+import numpy as np
+
+from .adaptive import accel_to_derivadas, dopri54_steps
+from .extrema import find_extrema
+
+# --- Integração por blocos (geradores) ---
+# Em vez de devolver o histórico completo no fim (como simulate_oscillator_forced), os geradores
+# stream_* produzem blocos de tamanho fixo (t, estados) à medida que a integração avança.
+# Quem consome os blocos (amplitude estacionária, picos, energia, ...) processa-os e descarta-os,
+# por isso a memória máxima é O(chunk_size) seja qual for a duração da simulação.
+# Cada bloco é um par (t, estados) com t de shape (n,) e estados de shape (n, 2) = [x, vx].
+
+
+def euler_cromer_step(x, vx, t, dt, accel_func):
+    vx = vx + accel_func(x, vx, t) * dt
+    x = x + vx * dt
+    return x, vx
+
+
+def rk4_step(x, vx, t, dt, accel_func):
+    k1_vx = accel_func(x, vx, t)
+    k1_x = vx
+    k2_x = vx + k1_vx * dt / 2
+    k2_vx = accel_func(x + k1_x * dt / 2, k2_x, t + dt / 2)
+    k3_x = vx + k2_vx * dt / 2
+    k3_vx = accel_func(x + k2_x * dt / 2, k3_x, t + dt / 2)
+    k4_x = vx + k3_vx * dt
+    k4_vx = accel_func(x + k3_x * dt, k4_x, t + dt)
+    x_new = x + (k1_x + 2 * k2_x + 2 * k3_x + k4_x) * dt / 6
+    vx_new = vx + (k1_vx + 2 * k2_vx + 2 * k3_vx + k4_vx) * dt / 6
+    return x_new, vx_new
+
+
+def stream_fixed_step(step_func, accel_func, x0, vx0, dt, t_total, chunk_size=100_000):
+    """Gera blocos (t, estados) de um integrador de passo fixo step_func(x, vx, t, dt, accel_func)."""
+    n_steps = int(round(t_total / dt))
+    x, vx = x0, vx0
+    for start in range(0, n_steps + 1, chunk_size):
+        n = min(chunk_size, n_steps + 1 - start)
+        t_chunk = dt * np.arange(start, start + n)
+        states = np.empty((n, 2))
+        for i in range(n):
+            if start + i > 0:
+                x, vx = step_func(x, vx, t_chunk[i] - dt, dt, accel_func)
+            states[i, 0] = x
+            states[i, 1] = vx
+        yield t_chunk, states
+
+
+def stream_euler_cromer(accel_func, x0, vx0, dt, t_total, chunk_size=100_000):
+    return stream_fixed_step(euler_cromer_step, accel_func, x0, vx0, dt, t_total, chunk_size)
+
+
+def stream_rk4(accel_func, x0, vx0, dt, t_total, chunk_size=100_000):
+    return stream_fixed_step(rk4_step, accel_func, x0, vx0, dt, t_total, chunk_size)
+
+
+def stream_dopri54(accel_func, x0, vx0, dt_out, t_total, chunk_size=100_000, rtol=1e-6, atol=1e-9):
+    """
+    Versão adaptativa: o integrador escolhe o seu passo, e os blocos contêm a saída densa
+    amostrada na grelha uniforme n*dt_out (n = 0..round(t_total/dt_out)).
+    """
+    n_out = int(round(t_total / dt_out)) + 1
+    t_buffer = np.empty(chunk_size)
+    y_buffer = np.empty((chunk_size, 2))
+    filled = 0
+    n = 0
+    powers = np.arange(1, 5)
+    steps = dopri54_steps(accel_to_derivadas(accel_func), [x0, vx0], 0.0, (n_out - 1) * dt_out, rtol, atol)
+    for t_old, y_old, h, q, t, y in steps:
+        if n == 0:
+            t_buffer[0] = 0.0
+            y_buffer[0] = y_old
+            filled = 1
+            n = 1
+        # Amostras de saída que caem dentro deste passo
+        n_end = min(n_out, int(np.floor(t / dt_out + 1e-9)) + 1)
+        while n < n_end:
+            m = min(n_end - n, chunk_size - filled)
+            t_samples = dt_out * np.arange(n, n + m)
+            theta = (t_samples - t_old) / h
+            t_buffer[filled:filled + m] = t_samples
+            y_buffer[filled:filled + m] = y_old + h * (theta[:, None] ** powers) @ q.T
+            filled += m
+            n += m
+            if filled == chunk_size:
+                yield t_buffer.copy(), y_buffer.copy()
+                filled = 0
+    if filled:
+        yield t_buffer[:filled].copy(), y_buffer[:filled].copy()
+
+
+# --- Consumidores de blocos ---
+# Cada consumidor tem update(t, estados) e guarda apenas um resumo de tamanho fixo.
+
+class SteadyStateAmplitude:
+    """Amplitude max|x| (e limites min/max) a partir de t_start (fim do transiente)."""
+
+    def __init__(self, t_start):
+        self.t_start = t_start
+        self.x_max = -np.inf
+        self.x_min = np.inf
+
+    def update(self, t, states):
+        x = states[t >= self.t_start, 0]
+        if x.size:
+            self.x_max = max(self.x_max, x.max())
+            self.x_min = min(self.x_min, x.min())
+
+    @property
+    def amplitude(self):
+        return max(abs(self.x_max), abs(self.x_min))
+
+
+class PeakTimes:
+    """Instantes dos máximos locais de x a partir de t_start, incluindo os que caem entre blocos."""
+
+    def __init__(self, t_start=0.0):
+        self.t_start = t_start
+        self.times = []
+        self._t_prev = np.empty(0)
+        self._x_prev = np.empty(0)
+
+    def update(self, t, states):
+        # Junta as duas últimas amostras do bloco anterior para não perder picos na fronteira
+        t_all = np.concatenate((self._t_prev, t))
+        x_all = np.concatenate((self._x_prev, states[:, 0]))
+        self._t_prev = t_all[-2:]
+        self._x_prev = x_all[-2:]
+        peaks, _, _ = find_extrema(t_all, x_all)
+        self.times.extend(peaks[peaks >= self.t_start])
+
+    @property
+    def period(self):
+        return np.mean(np.diff(self.times)) if len(self.times) >= 2 else np.nan
+
+
+class EnergyTracker:
+    """Energia mecânica: mínimo, máximo, média e uma amostra decimada (uma em cada keep_every)."""
+
+    def __init__(self, energy_func, keep_every=1000):
+        self.energy_func = energy_func  # energy_func(x, vx) vetorizada
+        self.keep_every = keep_every
+        self.e_min = np.inf
+        self.e_max = -np.inf
+        self._sum = 0.0
+        self._count = 0
+        self.t_samples = []
+        self.e_samples = []
+
+    def update(self, t, states):
+        energy = self.energy_func(states[:, 0], states[:, 1])
+        self.e_min = min(self.e_min, energy.min())
+        self.e_max = max(self.e_max, energy.max())
+        offset = (-self._count) % self.keep_every
+        self.t_samples.extend(t[offset::self.keep_every])
+        self.e_samples.extend(energy[offset::self.keep_every])
+        self._sum += energy.sum()
+        self._count += energy.size
+
+    @property
+    def mean(self):
+        return self._sum / self._count
+
+
+def consume(chunks, *consumers):
+    """Passa cada bloco (t, estados) a todos os consumidores e devolve o último instante integrado."""
+    t_last = None
+    for t, states in chunks:
+        for consumer in consumers:
+            consumer.update(t, states)
+        t_last = t[-1]
+    return t_last
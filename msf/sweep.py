@@ -0,0 +1,142 @@
+import os
+
+import numpy as np
+
+from .parallel import make_executor
+from .timegrid import TimeGrid
+
+# --- Varrimento de frequências vetorizado (curvas de ressonância) ---
+# Em vez de um ciclo "for wf in wf_values:" com uma simulação completa por frequência, todas as
+# frequências são integradas juntas: o estado tem shape (d, N), uma coluna por frequência, e
+# derivadas(t, y, wf) recebe wf como array de tamanho N (as funções dos scripts já usam np.cos).
+# Durante a integração (RK4, passo fixo) acumula-se, para cada frequência, a deteção síncrona
+# ("lock-in") das componentes pedidas num número inteiro de períodos no fim da simulação:
+#     C = ∫ x cos(wf t) dt,   S = ∫ x sin(wf t) dt,   A = 2 sqrt(C² + S²) / L,   phi = atan2(S, C)
+# o que dá x ≈ A cos(wf t - phi) sem guardar trajetórias. A janela é dividida em duas metades;
+# a diferença relativa entre as amplitudes das duas (drift) indica se o transiente já acabou.
+# Varrimentos grandes são divididos em blocos e corridos em paralelo (msf.parallel).
+
+
+class SweepResult:
+    def __init__(self, wf, amplitude, phase, peak, y_max, y_min, drift):
+        self.wf = wf                # frequências da força
+        self.amplitude = amplitude  # amplitude do 1º harmónico (lock-in)
+        self.phase = phase          # atraso de fase phi em x ≈ A cos(wf t - phi)
+        self.peak = peak            # meia amplitude pico-a-pico, (y_max - y_min) / 2
+        self.y_max = y_max
+        self.y_min = y_min
+        self.drift = drift          # |A_2ª metade - A_1ª metade| / A
+
+    def settled(self, rtol=1e-2):
+        return self.drift <= rtol
+
+
+class _AccelDerivadas:
+    # accel_func(x, vx, t, wf) -> derivadas(t, y, wf) com y = [x, vx]; uma classe (e não uma
+    # função interna) para poder ser enviada para outros processos
+    def __init__(self, accel_func):
+        self.accel_func = accel_func
+
+    def __call__(self, t, y, wf):
+        return np.array([y[1], self.accel_func(y[0], y[1], t, wf)])
+
+
+def _rk4_step(derivadas, t, y, dt, wf):
+    k1 = derivadas(t, y, wf)
+    k2 = derivadas(t + dt / 2, y + k1 * dt / 2, wf)
+    k3 = derivadas(t + dt / 2, y + k2 * dt / 2, wf)
+    k4 = derivadas(t + dt, y + k3 * dt, wf)
+    return y + (k1 + 2 * k2 + 2 * k3 + k4) * dt / 6
+
+
+def _sweep_block(derivadas, y0, wf, dt, t_total, t_transient, components):
+    N = len(wf)
+    y = np.array(np.broadcast_to(np.asarray(y0, dtype=float).reshape(-1, 1), (len(y0), N)))
+    grid = TimeGrid(t_total, dt)
+    t_end = grid.t_final
+
+    # Janela de medição: o maior número inteiro de períodos que cabe em [t_transient, t_end],
+    # com pelo menos um período (cortado em t = 0 se a simulação for mais curta que o período);
+    # com wf = 0 não há período e usa-se [t_transient, t_end]. As duas metades servem para o drift
+    period = 2 * np.pi / np.where(wf > 0, wf, 1.0)
+    n_periods = np.maximum(np.floor((t_end - t_transient) / period), 1)
+    length = np.where(wf > 0, np.minimum(n_periods * period, t_end), t_end - t_transient)
+    t_a = t_end - length
+    t_mid = t_end - length / 2
+
+    n_comp = len(components)
+    z1 = np.zeros((n_comp, N), dtype=complex)
+    z2 = np.zeros((n_comp, N), dtype=complex)
+    y_max = np.full((n_comp, N), -np.inf)
+    y_min = np.full((n_comp, N), np.inf)
+
+    def accumulate(t, y, weight):
+        inside = t >= t_a
+        if not inside.any():
+            return
+        x = y[components]
+        w = np.where(inside, weight, 0.0) * np.exp(-1j * wf * t)
+        second = t >= t_mid
+        z1[:] += np.where(second, 0.0, w) * x
+        z2[:] += np.where(second, w, 0.0) * x
+        y_max[:] = np.where(inside, np.maximum(y_max, x), y_max)
+        y_min[:] = np.where(inside, np.minimum(y_min, x), y_min)
+
+    # Regra dos trapézios na grelha t_n = n*dt (peso dt/2 nas pontas)
+    accumulate(0.0, y, dt / 2)
+    for n in range(grid.n_steps):
+        y = _rk4_step(derivadas, grid.time(n), y, grid.time(n + 1) - grid.time(n), wf)
+        t = grid.time(n + 1)
+        accumulate(t, y, dt / 2 if n + 1 == grid.n_steps else dt)
+
+    # Com wf = 0 o "1º harmónico" é a média: A = |∫ x dt| / L
+    factor = np.where(wf > 0, 2.0, 1.0)
+    z = z1 + z2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amplitude = factor * np.abs(z) / length
+        a1 = factor * np.abs(z1) / (length / 2)
+        a2 = factor * np.abs(z2) / (length / 2)
+        drift = np.abs(a2 - a1) / amplitude
+    phase = -np.angle(z)
+    return amplitude, phase, (y_max - y_min) / 2, y_max, y_min, drift
+
+
+def frequency_sweep(derivadas, y0, wf_values, dt, t_total, t_transient=None, components=0,
+                    max_workers=None, min_block=32):
+    """
+    Resposta em frequência de derivadas(t, y, wf) (y de shape (d, N), wf de shape (N,)),
+    com todas as frequências integradas em simultâneo a partir do estado inicial y0 (shape (d,)).
+    A medição usa um número inteiro de períodos entre t_transient (por omissão t_total/2) e t_total.
+    components: índice (ou tuplo de índices) das componentes de y a medir.
+    Com mais de min_block frequências, o varrimento é dividido em blocos por até max_workers processos.
+    """
+    wf = np.asarray(wf_values, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+    if t_transient is None:
+        t_transient = t_total / 2
+    scalar = np.ndim(components) == 0
+    components = np.atleast_1d(components)
+
+    workers = max_workers or os.cpu_count() or 1
+    n_blocks = int(min(workers, max(1, len(wf) // min_block)))
+    args = (dt, t_total, t_transient, components)
+    if n_blocks == 1:
+        parts = [_sweep_block(derivadas, y0, wf, *args)]
+    else:
+        with make_executor(n_blocks, derivadas) as executor:
+            futures = [executor.submit(_sweep_block, derivadas, y0, block, *args)
+                       for block in np.array_split(wf, n_blocks)]
+            parts = [f.result() for f in futures]
+
+    amplitude, phase, peak, y_max, y_min, drift = (np.concatenate(p, axis=1) for p in zip(*parts))
+    if scalar:
+        amplitude, phase, peak, y_max, y_min, drift = (a[0] for a in (amplitude, phase, peak, y_max, y_min, drift))
+    return SweepResult(wf, amplitude, phase, peak, y_max, y_min, drift)
+
+
+def forced_oscillator_sweep(accel_func, x0, vx0, wf_values, dt, t_total, t_transient=None,
+                            max_workers=None, min_block=32):
+    """frequency_sweep para um oscilador accel_func(x, vx, t, wf); mede a posição x."""
+    return frequency_sweep(_AccelDerivadas(accel_func), [x0, vx0], wf_values, dt, t_total,
+                           t_transient=t_transient, components=0,
+                           max_workers=max_workers, min_block=min_block)
@@ -0,0 +1,75 @@
+import numpy as np
+
+# --- Integradores simpléticos (Verlet e composições de Yoshida) ---
+# Para sistemas conservativos com aceleração que só depende da posição, a(x) (órbita Terra-Sol,
+# pêndulo), os métodos simpléticos não acumulam deriva de energia: o erro de energia fica
+# limitado e oscilante. O Euler-Cromer é simplético mas de 1ª ordem; aqui o passo base é o
+# Verlet de velocidade (2ª ordem) e as composições de Yoshida dão 4ª e 6ª ordem, o que permite
+# usar passos 10 a 100 vezes maiores para a mesma precisão.
+# accel_func(x) recebe a posição (escalar ou vetor, ex.: r = [x, y]) e devolve a aceleração.
+
+_CBRT2 = 2 ** (1 / 3)
+_Y4_W1 = 1 / (2 - _CBRT2)
+_Y4_W0 = -_CBRT2 / (2 - _CBRT2)
+
+# Solução "A" de Yoshida (1990) para a 6ª ordem
+_Y6_W1 = -1.17767998417887
+_Y6_W2 = 0.235573213359357
+_Y6_W3 = 0.784513610477560
+_Y6_W0 = 1 - 2 * (_Y6_W1 + _Y6_W2 + _Y6_W3)
+
+# Frações de dt de cada sub-passo de Verlet
+SCHEMES = {
+    "verlet": (1.0,),
+    "yoshida4": (_Y4_W1, _Y4_W0, _Y4_W1),
+    "yoshida6": (_Y6_W3, _Y6_W2, _Y6_W1, _Y6_W0, _Y6_W1, _Y6_W2, _Y6_W3),
+}
+
+
+def symplectic_step(x, v, a, dt, accel_func, scheme="yoshida4"):
+    """
+    Avança (x, v) um passo dt. a é a aceleração em x (reaproveitada do passo anterior);
+    devolve x, v e a aceleração na nova posição.
+    """
+    for w in SCHEMES[scheme]:
+        h = w * dt
+        v = v + a * (h / 2)   # meio "kick"
+        x = x + v * h         # "drift"
+        a = accel_func(x)
+        v = v + a * (h / 2)   # meio "kick"
+    return x, v, a
+
+
+def integrate_symplectic(accel_func, x0, v0, dt, t_total, scheme="yoshida4", energy_func=None, keep_every=1):
+    """
+    Integra de t=0 a t_total com o esquema escolhido ("verlet", "yoshida4" ou "yoshida6").
+    Devolve t, x, v (uma amostra em cada keep_every passos) e o erro de energia E - E0 em
+    cada passo (array vazio se energy_func(x, v) não for dado).
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"Esquema desconhecido: {scheme!r} (disponíveis: {', '.join(SCHEMES)})")
+
+    x = np.array(x0, dtype=float)
+    v = np.array(v0, dtype=float)
+    a = accel_func(x)
+    n_steps = int(round(t_total / dt))
+    n_keep = n_steps // keep_every + 1
+
+    t_values = dt * keep_every * np.arange(n_keep)
+    x_values = np.empty((n_keep,) + x.shape)
+    v_values = np.empty((n_keep,) + v.shape)
+    x_values[0] = x
+    v_values[0] = v
+
+    energy_error = np.empty(n_steps if energy_func is not None else 0)
+    e0 = energy_func(x, v) if energy_func is not None else 0.0
+
+    for n in range(1, n_steps + 1):
+        x, v, a = symplectic_step(x, v, a, dt, accel_func, scheme)
+        if energy_func is not None:
+            energy_error[n - 1] = energy_func(x, v) - e0
+        if n % keep_every == 0:
+            x_values[n // keep_every] = x
+            v_values[n // keep_every] = v
+
+    return t_values, x_values, v_values, energy_error
@@ -0,0 +1,45 @@
+import numpy as np
+
+# --- Grelha temporal com contagem inteira de passos ---
+# Os ciclos "while t <= t_total: ... t = t + dt" acumulam erro de arredondamento em t: com
+# dt=1e-5 o número final de passos (e o comprimento dos arrays) pode variar de uma execução
+# para outra, e a fase de cos(wf*t) vai derivando ao longo de 3e7 passos.
+# Aqui o número de passos é fixado à partida e o instante do passo n é sempre t0 + n*dt,
+# calculado a partir do inteiro n (o erro não se acumula).
+
+
+class TimeGrid:
+    def __init__(self, t_total, dt, t0=0.0):
+        """Grelha t_n = t0 + n*dt, n = 0..n_steps, com n_steps*dt ≈ t_total - t0."""
+        if dt <= 0:
+            raise ValueError("dt tem de ser positivo")
+        self.dt = dt
+        self.t0 = t0
+        # round() quando (t_total - t0)/dt é (quase) inteiro, senão mais um passo para cobrir t_total
+        ratio = (t_total - t0) / dt
+        self.n_steps = int(round(ratio)) if abs(ratio - round(ratio)) < 1e-9 * max(1.0, ratio) else int(np.ceil(ratio))
+
+    def __len__(self):
+        # número de instantes (inclui t0)
+        return self.n_steps + 1
+
+    def time(self, n):
+        """Instante do passo n (exato a menos de um arredondamento, sem acumular)."""
+        return self.t0 + n * self.dt
+
+    @property
+    def t(self):
+        """Todos os instantes da grelha, shape (n_steps + 1,)."""
+        return self.t0 + self.dt * np.arange(self.n_steps + 1)
+
+    @property
+    def t_final(self):
+        return self.time(self.n_steps)
+
+    def index(self, t):
+        """Índice do primeiro instante da grelha >= t (ex.: início do regime estacionário)."""
+        return min(self.n_steps, max(0, int(np.ceil((t - self.t0) / self.dt - 1e-9))))
+
+    def cos_forcing(self, F0, wf, shift=0.0):
+        """F0*cos(wf*t) em todos os instantes da grelha (ou em t + shift, ex.: shift=dt/2 para RK4)."""
+        return F0 * np.cos(wf * (self.t + shift))